@@ -38,6 +38,176 @@ class Settings(BaseSettings):
         description="SAF 資料 API Port"
     )
     
+    # ========== SAF 連線池設定 ==========
+    saf_pool_enabled: bool = Field(
+        default=True,
+        description="是否啟用共用連線池 (由 lifespan 建立與關閉)"
+    )
+    saf_pool_max_connections: int = Field(
+        default=20,
+        ge=1,
+        description="每個 SAF 主機的最大連線數"
+    )
+    saf_pool_max_keepalive_connections: int = Field(
+        default=10,
+        ge=0,
+        description="每個 SAF 主機保持 Keep-Alive 的最大閒置連線數"
+    )
+    saf_pool_keepalive_expiry: float = Field(
+        default=30.0,
+        ge=0,
+        description="閒置連線保留秒數"
+    )
+    saf_http2_enabled: bool = Field(
+        default=False,
+        description="是否啟用 HTTP/2 多工傳輸 (需安裝 h2，伺服器未協商 h2 時自動退回 HTTP/1.1)"
+    )
+    saf_http2_prior_knowledge: bool = Field(
+        default=False,
+        description="明文 (http://) 連線是否直接使用 HTTP/2 (h2c)，伺服器須支援"
+    )
+    saf_http2_max_concurrent_streams: int = Field(
+        default=100,
+        ge=1,
+        description="HTTP/2 模式下每個 SAF 主機同時進行的最大請求 (stream) 數"
+    )
+    
+    saf_singleflight_enabled: bool = Field(
+        default=True,
+        description="是否合併相同參數的並行 SAF 讀取呼叫 (single-flight)"
+    )
+    
+    # ========== SAF 回應快取設定 ==========
+    saf_cache_enabled: bool = Field(
+        default=True,
+        description="是否啟用 SAF 讀取呼叫的回應快取"
+    )
+    saf_cache_max_entries: int = Field(
+        default=1024,
+        ge=1,
+        description="記憶體 LRU 快取的最大項目數"
+    )
+    saf_cache_ttl_projects: float = Field(
+        default=300.0,
+        ge=0,
+        description="專案列表 (get_all_projects) 快取秒數，0 表示不快取"
+    )
+    saf_cache_ttl_firmwares: float = Field(
+        default=300.0,
+        ge=0,
+        description="Firmware 列表 (get_fws_by_project_id) 快取秒數，0 表示不快取"
+    )
+    saf_cache_ttl_test_summary: float = Field(
+        default=60.0,
+        ge=0,
+        description="專案測試摘要 (get_project_test_summary) 快取秒數，0 表示不快取"
+    )
+    saf_cache_ttl_dashboard: float = Field(
+        default=60.0,
+        ge=0,
+        description="專案儀表板 (get_project_dashboard) 快取秒數，0 表示不快取"
+    )
+    saf_cache_ttl_known_issues: float = Field(
+        default=120.0,
+        ge=0,
+        description="Known Issues (list_known_issues) 快取秒數，0 表示不快取"
+    )
+    saf_cache_ttl_test_jobs: float = Field(
+        default=60.0,
+        ge=0,
+        description="測試工作列表 (list_all_test_jobs) 快取秒數，0 表示不快取"
+    )
+    saf_cache_hard_ttl_test_summary: float = Field(
+        default=600.0,
+        ge=0,
+        description="專案測試摘要 hard TTL 秒數：超過快取秒數但未超過此值時返回過時資料並於背景更新，0 表示停用"
+    )
+    saf_cache_hard_ttl_test_jobs: float = Field(
+        default=600.0,
+        ge=0,
+        description="測試工作列表 hard TTL 秒數：超過快取秒數但未超過此值時返回過時資料並於背景更新，0 表示停用"
+    )
+    
+    # ========== 快取預熱設定 ==========
+    saf_warmer_enabled: bool = Field(
+        default=True,
+        description="是否啟用背景快取預熱 (需設定 SAF 帳密並啟用回應快取)"
+    )
+    saf_warmer_interval: float = Field(
+        default=600.0,
+        gt=0,
+        description="快取預熱週期秒數"
+    )
+    saf_warmer_initial_delay: float = Field(
+        default=10.0,
+        ge=0,
+        description="啟動後第一次預熱前等待的秒數"
+    )
+    saf_warmer_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="快取預熱同時向 SAF 查詢的最大數量"
+    )
+    saf_warmer_max_targets: int = Field(
+        default=200,
+        ge=1,
+        description="每次預熱最多預熱的項目數 (依近期請求頻率排序)"
+    )
+    saf_warmer_busy_threshold: int = Field(
+        default=20,
+        ge=1,
+        description="進行中的互動請求達到此數量時，預熱暫停並退避"
+    )
+    saf_warmer_backoff_max: float = Field(
+        default=60.0,
+        gt=0,
+        description="預熱退避的最長等待秒數"
+    )
+    
+    # ========== 本地快照設定 ==========
+    saf_snapshot_enabled: bool = Field(
+        default=False,
+        description="是否啟用 SQLite 本地快照 (路由可使用 source=snapshot)"
+    )
+    saf_snapshot_path: str = Field(
+        default="data/snapshot.db",
+        description="快照 SQLite 檔案路徑"
+    )
+    saf_snapshot_sync_interval: float = Field(
+        default=900.0,
+        gt=0,
+        description="快照同步週期秒數"
+    )
+    saf_snapshot_sync_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="快照同步時同時向 SAF 查詢的最大專案數"
+    )
+    saf_snapshot_test_status: bool = Field(
+        default=True,
+        description="快照是否同步測試狀態並建立倒排索引 (/test-status/search?source=snapshot)"
+    )
+    
+    # ========== SAF 自動分頁設定 ==========
+    saf_pagination_page_size: int = Field(
+        default=200,
+        ge=1,
+        le=1000,
+        description="自動分頁時每頁向 SAF 查詢的筆數"
+    )
+    saf_pagination_concurrency: int = Field(
+        default=5,
+        ge=1,
+        description="自動分頁時同時查詢的最大頁數"
+    )
+    
+    # ========== 批次查詢設定 ==========
+    saf_batch_concurrency: int = Field(
+        default=10,
+        ge=1,
+        description="批次端點同時向 SAF 查詢的最大數量"
+    )
+    
     # ========== SAF 認證資訊 ==========
     saf_username: Optional[str] = Field(
         default=None,
@@ -4,6 +4,7 @@ FastAPI 應用程式入口
 Internal API Server - 用於取得 SAF (Silicon Motion) 網站資訊
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
@@ -14,9 +15,31 @@ from app import __version__
 from app.config import get_settings
 from app.middlewares.error_handler import ErrorHandlerMiddleware
 from app.models.schemas import APIResponse, HealthResponse
+from app.responses import FastJSONResponse, api_response
 from app.routers import auth, projects
+from app.services.cache_warmer import (
+    close_cache_warmer,
+    get_cache_warmer,
+    init_cache_warmer,
+)
+from app.services.connection_pool import (
+    close_connection_pool,
+    get_connection_pool,
+    init_connection_pool,
+)
+from app.services.response_cache import (
+    close_response_cache,
+    get_response_cache,
+    init_response_cache,
+)
+from app.services.snapshot_store import (
+    close_snapshot_store,
+    get_snapshot_store,
+    get_snapshot_syncer,
+    init_snapshot_store,
+)
+from app.services.test_status_index import get_test_status_index
 from lib.logger import setup_logging, get_logger
-from lib.utils import format_response
 
 # 取得設定
 settings = get_settings()
@@ -34,10 +57,20 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"SAF URL: {settings.saf_base_url}")
     
+    # 建立 SAF 共用連線池與回應快取，並啟動背景快取預熱
+    await init_connection_pool(settings)
+    init_response_cache(settings)
+    init_cache_warmer(settings)
+    await init_snapshot_store(settings)
+    
     yield
     
     # 關閉時
     logger.info("Shutting down Internal API Server")
+    await close_snapshot_store()
+    await close_cache_warmer()
+    await close_connection_pool()
+    close_response_cache()
 
 
 # 建立 FastAPI 應用
@@ -48,6 +81,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan,
 )
 
@@ -87,12 +121,37 @@ async def health_check():
     """
     健康檢查端點
     
-    用於 Docker 健康檢查和負載平衡器探測
+    用於 Docker 健康檢查和負載平衡器探測，
+    並附上 SAF 上游監控資訊 (upstream)：連線池的連線與協定統計、回應快取命中統計、快取預熱與本地快照狀態
     """
+    upstream = {}
+    
+    pool = get_connection_pool()
+    if pool is not None:
+        upstream["pool"] = pool.stats()
+    
+    cache = get_response_cache()
+    if cache is not None:
+        upstream["cache"] = cache.stats()
+    
+    warmer = get_cache_warmer()
+    if warmer is not None:
+        upstream["warmer"] = warmer.stats()
+    
+    store = get_snapshot_store()
+    if store is not None:
+        syncer = get_snapshot_syncer()
+        upstream["snapshot"] = {
+            "datasets": await asyncio.to_thread(store.stats),
+            "sync": syncer.stats() if syncer is not None else None,
+            "test_status_index": get_test_status_index().stats(),
+        }
+    
     return HealthResponse(
         status="healthy",
         version=__version__,
-        timestamp=datetime.now(timezone.utc)
+        timestamp=datetime.now(timezone.utc),
+        upstream=upstream or None
     )
 
 
@@ -101,7 +160,7 @@ async def get_config():
     """
     取得目前的設定資訊 (不包含敏感資訊)
     """
-    return format_response(
+    return api_response(
         success=True,
         data={
             "saf_base_url": settings.saf_base_url,
@@ -2,9 +2,9 @@
 全域錯誤處理中介軟體
 """
 
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from lib.exceptions import InternalAPIException
 from lib.logger import get_logger
@@ -13,21 +13,41 @@ from lib.utils import format_response
 logger = get_logger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """
     全域錯誤處理中介軟體
-    
+
     捕捉所有未處理的例外，返回統一的錯誤格式
+
+    以純 ASGI 實作：直接轉送 receive/send，不像 BaseHTTPMiddleware 為每個請求建立
+    背景 task 與記憶體 stream，串流回應逐段送出 (不緩衝) 並保留 backpressure。
+    回應開始送出後才發生的例外無法再改為錯誤回應，記錄後交由伺服器中斷連線
     """
-    
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
+
         except InternalAPIException as e:
             logger.error(f"Internal API Exception: {e.code} - {e.message}")
-            return JSONResponse(
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content=format_response(
                     success=False,
@@ -35,10 +55,13 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     error_code=e.code
                 )
             )
-            
+            await response(scope, receive, send)
+
         except Exception as e:
             logger.exception(f"Unhandled exception: {e}")
-            return JSONResponse(
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content=format_response(
                     success=False,
@@ -46,3 +69,4 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     error_code="INTERNAL_ERROR"
                 )
             )
+            await response(scope, receive, send)
@@ -5,7 +5,7 @@ Pydantic 資料模型 (Schemas)
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -70,6 +70,14 @@ class ProjectListResponse(BaseModel):
 
 # ========== 通用回應 ==========
 
+class CacheInfo(BaseModel):
+    """回應快取狀態"""
+    hit: bool = Field(..., description="是否命中快取")
+    age: float = Field(0.0, description="資料已存在的秒數")
+    stale: bool = Field(False, description="是否為過時資料 (背景更新中)")
+    source: Optional[str] = Field(None, description="資料來源 (snapshot 表示來自本地快照，age 為距上次同步的秒數)")
+
+
 class APIResponse(BaseModel):
     """通用 API 回應"""
     success: bool = Field(..., description="是否成功")
@@ -77,6 +85,7 @@ class APIResponse(BaseModel):
     message: Optional[str] = Field(None, description="訊息")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="時間戳記")
     error_code: Optional[str] = Field(None, description="錯誤代碼")
+    cache: Optional[CacheInfo] = Field(None, description="快取狀態 (資料來自 SAF 回應快取時提供)")
 
 
 class HealthResponse(BaseModel):
@@ -84,6 +93,7 @@ class HealthResponse(BaseModel):
     status: str = Field("healthy", description="服務狀態")
     version: str = Field(..., description="API 版本")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="時間戳記")
+    upstream: Optional[Dict[str, Any]] = Field(None, description="SAF 上游連線監控資訊")
 
 
 # ========== 專案測試摘要相關 ==========
@@ -388,6 +398,22 @@ class KnownIssueListResponse(BaseModel):
     total: int = Field(0, description="總筆數")
 
 
+# ========== 批次測試摘要相關 ==========
+
+# 可由同一份 listOneProjectSummary 資料產生的檢視
+ProjectSummaryView = Literal["summary", "firmware", "full", "details"]
+
+
+class TestSummaryBatchRequest(BaseModel):
+    """批次取得測試摘要請求"""
+    project_uids: List[str] = Field(..., min_length=1, max_length=500, description="專案 UID 列表")
+    views: List[ProjectSummaryView] = Field(
+        default_factory=lambda: ["summary"],
+        min_length=1,
+        description="要產生的檢視: summary / firmware / full / details"
+    )
+
+
 # ========== Test Status 搜尋相關 ==========
 
 class TestStatusSearchRequest(BaseModel):
@@ -398,6 +424,12 @@ class TestStatusSearchRequest(BaseModel):
     sort: Optional[Dict[str, Any]] = Field(default_factory=dict, description="排序條件")
 
 
+class TestStatusExportRequest(BaseModel):
+    """測試狀態串流匯出請求 (自動取得所有頁面)"""
+    query: str = Field(..., description="查詢條件，格式: 欄位名 = \"值\"")
+    sort: Optional[Dict[str, Any]] = Field(default_factory=dict, description="排序條件")
+
+
 class TestStatusItem(BaseModel):
     """測試狀態項目"""
     test_job_id: str = Field(..., description="測試工作 ID")
@@ -0,0 +1,95 @@
+"""
+快速 JSON 回應
+
+FastJSONResponse 以 orjson 序列化 (未安裝時退回標準函式庫 json)，為應用程式的預設回應類別。
+
+api_response 產生與 APIResponse 相同格式的回應物件：路由直接回傳 Response 時，
+FastAPI 不會再以 response_model 驗證並逐層轉換 data (data 是 Any，
+由我們自己的轉換函式產生)，大型回應 (測試明細、測試工作) 的 CPU 主要就花在這一步
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import orjson  # 可選依賴 (pip install orjson)，未安裝時使用標準函式庫 json
+except ImportError:  # pragma: no cover - 依安裝環境而定
+    orjson = None
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_jsonable_python
+
+from app.models.schemas import APIResponse, CacheInfo
+from lib.utils import format_response
+
+# 與 pydantic 的 JSON 輸出一致：UTC 時間以 Z 結尾、非字串 key 轉為字串
+_ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+# CacheInfo 各欄位的預設值 (依 schema 順序)
+_CACHE_DEFAULTS = {field: info.default for field, info in CacheInfo.model_fields.items()}
+
+
+def _default(value: Any) -> Any:
+    """orjson / json 不支援的型別 (set、Decimal、BaseModel 等) 依 pydantic 的規則轉換"""
+    return to_jsonable_python(value)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    序列化為 JSON bytes
+
+    orjson 無法處理的值 (例如超過 64 bits 的整數) 退回標準函式庫 json
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """以 orjson 序列化的 JSON 回應"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def api_response(
+    success: bool,
+    data: Any = None,
+    message: Optional[str] = None,
+    error_code: Optional[str] = None,
+    cache: Optional[Dict[str, Any]] = None,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """
+    建立 APIResponse 格式的回應 (略過 response_model 驗證)
+
+    參數與 format_response 相同；輸出的欄位、順序與 APIResponse 經 FastAPI 序列化後一致
+    (缺少的欄位補 null，cache 補齊 CacheInfo 的預設值)
+
+    Args:
+        success: 請求是否成功
+        data: 回應資料
+        message: 訊息
+        error_code: 錯誤代碼
+        cache: 快取狀態
+        status_code: HTTP 狀態碼
+
+    Returns:
+        FastJSONResponse
+    """
+    response = format_response(success, data, message, error_code, cache)
+    content = {field: response.get(field) for field in APIResponse.model_fields}
+    # isoformat 的 UTC 時間以 Z 表示 (與 pydantic 輸出一致)
+    content["timestamp"] = content["timestamp"].replace("+00:00", "Z")
+    if cache:
+        content["cache"] = {field: cache.get(field, default) for field, default in _CACHE_DEFAULTS.items()}
+    return FastJSONResponse(content, status_code=status_code)
@@ -8,6 +8,9 @@ from fastapi import APIRouter, Depends, Header, HTTPException, status
 
 from app.config import Settings, get_settings
 from app.models.schemas import APIResponse, AuthInfo, LoginRequest, LoginResponse
+from app.responses import api_response
+from app.services.connection_pool import get_connection_pool
+from app.services.response_cache import get_response_cache
 from app.services.saf_client import SAFClient
 from lib.exceptions import SAFAuthenticationError, SAFConnectionError
 from lib.logger import get_logger
@@ -18,8 +21,8 @@ logger = get_logger(__name__)
 
 
 def get_saf_client(settings: Settings = Depends(get_settings)) -> SAFClient:
-    """取得 SAF Client 依賴"""
-    return SAFClient(settings)
+    """取得 SAF Client 依賴 (使用 lifespan 建立的共用連線池與回應快取)"""
+    return SAFClient(settings, pool=get_connection_pool(), cache=get_response_cache())
 
 
 @router.post("/login", response_model=APIResponse, summary="登入 SAF 系統")
@@ -37,7 +40,7 @@ async def login(
     """
     try:
         result = await client.login(request.username, request.password)
-        return format_response(
+        return api_response(
             success=True,
             data=LoginResponse(**result).model_dump()
         )
@@ -74,7 +77,7 @@ async def login_with_config(
     """
     try:
         result = await client.login_with_config()
-        return format_response(
+        return api_response(
             success=True,
             data=LoginResponse(**result).model_dump()
         )
@@ -2,31 +2,132 @@
 專案相關路由
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.config import Settings, get_settings
-from app.models.schemas import APIResponse, AuthInfo, ProjectListResponse, TestStatusSearchRequest, TestJobsRequest
+from app.models.schemas import (
+    APIResponse,
+    AuthInfo,
+    ProjectListResponse,
+    TestJobsRequest,
+    TestStatusExportRequest,
+    TestStatusSearchRequest,
+    TestSummaryBatchRequest,
+)
+from app.responses import FastJSONResponse, api_response
 from app.routers.auth import get_auth_info
+from app.services.activity import get_request_activity
+from app.services.connection_pool import get_connection_pool
+from app.services.job_table import JobTable
+from app.services.response_cache import get_response_cache
 from app.services.saf_client import SAFClient
-from lib.exceptions import SAFAPIError, SAFConnectionError
+from app.services.snapshot_store import (
+    ALL_SCOPE,
+    FIRMWARES,
+    KNOWN_ISSUES,
+    PROJECTS,
+    TEST_JOBS,
+    get_snapshot_store,
+)
+from app.services.test_status_index import get_test_status_index
+from app.services.test_status_query import QueryPlan, compile_query
+from lib.cache import get_cache_status
+from lib.exceptions import SAFAPIError, SAFConnectionError, ValidationError
 from lib.logger import get_logger
 from lib.utils import format_response
 
-router = APIRouter(prefix="/projects", tags=["Projects"])
+async def track_request_activity(request: Request) -> AsyncIterator[None]:
+    """記錄互動請求與其專案 (供背景快取預熱判斷負載與排序優先順序)"""
+    activity = get_request_activity()
+    activity.begin(
+        str(value) for name, value in request.path_params.items()
+        if name in ("project_uid", "project_id")
+    )
+    try:
+        yield
+    finally:
+        activity.end()
+
+
+router = APIRouter(
+    prefix="/projects",
+    tags=["Projects"],
+    dependencies=[Depends(track_request_activity)]
+)
 logger = get_logger(__name__)
 
 
 def get_saf_client(settings: Settings = Depends(get_settings)) -> SAFClient:
-    """取得 SAF Client 依賴"""
-    return SAFClient(settings)
+    """取得 SAF Client 依賴 (使用 lifespan 建立的共用連線池與回應快取)"""
+    return SAFClient(settings, pool=get_connection_pool(), cache=get_response_cache())
+
+
+# 資料來源: live 即時查詢 SAF，snapshot 使用本地快照
+DataSource = Literal["live", "snapshot"]
+SOURCE_DESCRIPTION = "資料來源: live (即時查詢 SAF) 或 snapshot (本地 SQLite 快照)"
+
+
+async def _read_snapshot(
+    dataset: str,
+    scopes: Sequence[str],
+    method: str,
+    *args: Any,
+    **kwargs: Any
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    從本地快照讀取資料
+    
+    Args:
+        dataset: 資料集名稱
+        scopes: 需要的同步範圍
+        method: SnapshotStore 的查詢方法名稱
+        *args, **kwargs: 傳給查詢方法的參數
+        
+    Returns:
+        (資料, 快照狀態)，快照狀態放在回應的 cache 欄位
+        
+    Raises:
+        HTTPException: 未啟用快照 (503) 或資料尚未同步 (404)
+    """
+    store = get_snapshot_store()
+    if store is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=format_response(
+                success=False,
+                message="Snapshot store is not enabled",
+                error_code="SNAPSHOT_UNAVAILABLE"
+            )
+        )
+    
+    synced_at = await asyncio.to_thread(store.oldest_sync, dataset, scopes)
+    data = await asyncio.to_thread(getattr(store, method), *args, **kwargs)
+    if synced_at is None or data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=format_response(
+                success=False,
+                message=f"Snapshot has not been synced yet: {dataset}",
+                error_code="SNAPSHOT_NOT_FOUND"
+            )
+        )
+    
+    snapshot = {"hit": True, "age": round(time.time() - synced_at, 3), "stale": False, "source": "snapshot"}
+    return data, snapshot
 
 
 @router.get("", response_model=APIResponse, summary="取得所有專案列表")
 async def get_all_projects(
     page: int = Query(1, ge=1, description="頁碼"),
     size: int = Query(50, ge=1, le=100, description="每頁筆數"),
+    fetch_all: bool = Query(False, alias="all", description="是否自動分頁取得全部專案 (忽略 page/size)"),
+    source: DataSource = Query("live", description=SOURCE_DESCRIPTION),
     auth: AuthInfo = Depends(get_auth_info),
     client: SAFClient = Depends(get_saf_client)
 ):
@@ -40,18 +141,47 @@ async def get_all_projects(
     支援分頁：
     - **page**: 頁碼 (預設 1)
     - **size**: 每頁筆數 (預設 50，最大 100)
+    - **all**: 設為 true 時並行查詢所有頁面並一次返回全部專案
+    
+    `source=snapshot` 時直接以本地快照回應 (需啟用 SAF_SNAPSHOT_ENABLED)
     """
-    try:
-        result = await client.get_all_projects(
-            user_id=auth.user_id,
-            username=auth.username,
-            page=page,
-            size=size
+    if source == "snapshot":
+        result, snapshot = await _read_snapshot(
+            PROJECTS, [ALL_SCOPE], "list_projects",
+            page=1 if fetch_all else page,
+            size=None if fetch_all else size
         )
+        return api_response(success=True, data=result, cache=snapshot)
+    
+    try:
+        if fetch_all:
+            projects = []
+            total = 0
+            async for page_result in client.iter_all_projects(
+                user_id=auth.user_id,
+                username=auth.username
+            ):
+                total = page_result.get("total", total)
+                projects.extend(page_result.get("data", []))
+            
+            result = {
+                "page": 1,
+                "size": len(projects),
+                "total": total,
+                "data": projects,
+            }
+        else:
+            result = await client.get_all_projects(
+                user_id=auth.user_id,
+                username=auth.username,
+                page=page,
+                size=size
+            )
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -90,16 +220,8 @@ async def get_projects_summary(
     - 各控制器的專案數量
     """
     try:
-        result = await client.get_all_projects(
-            user_id=auth.user_id,
-            username=auth.username,
-            page=1,
-            size=1000  # 取得所有專案以計算統計
-        )
-        
-        projects = result.get("items", [])
-        
         # 計算統計
+        total = 0
         customers = {}
         controllers = {}
         
@@ -116,17 +238,24 @@ async def get_projects_summary(
                 if children:
                     count_projects(children)
         
-        count_projects(projects)
+        # 自動分頁取得所有專案，邊收邊統計
+        async for page_result in client.iter_all_projects(
+            user_id=auth.user_id,
+            username=auth.username
+        ):
+            total = page_result.get("total", total)
+            count_projects(page_result.get("data", []))
         
         summary = {
-            "total": result.get("total", 0),
+            "total": total,
             "by_customer": dict(sorted(customers.items(), key=lambda x: x[1], reverse=True)),
             "by_controller": dict(sorted(controllers.items(), key=lambda x: x[1], reverse=True)),
         }
         
-        return format_response(
+        return api_response(
             success=True,
-            data=summary
+            data=summary,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -158,6 +287,7 @@ async def get_projects_summary(
 )
 async def get_project_firmwares(
     project_id: str,
+    source: DataSource = Query("live", description=SOURCE_DESCRIPTION),
     auth: AuthInfo = Depends(get_auth_info),
     client: SAFClient = Depends(get_saf_client)
 ):
@@ -169,10 +299,16 @@ async def get_project_firmwares(
     - **subVersion**: 子版本 (如 AA)
     - **projectUid**: 對應的 Project UID
     
+    `source=snapshot` 時直接以本地快照回應 (需啟用 SAF_SNAPSHOT_ENABLED)
+    
     需要在 Header 中提供認證資訊：
     - **Authorization**: 使用者 ID (從登入 API 取得)
     - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
     """
+    if source == "snapshot":
+        result, snapshot = await _read_snapshot(FIRMWARES, [project_id], "get_firmwares", project_id)
+        return api_response(success=True, data=result, cache=snapshot)
+    
     try:
         result = await client.get_fws_by_project_id(
             user_id=auth.user_id,
@@ -180,9 +316,10 @@ async def get_project_firmwares(
             project_id=project_id
         )
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -433,9 +570,10 @@ async def get_firmware_summary(
         # 轉換為 Firmware 詳細摘要格式
         result = _transform_firmware_summary(raw_data)
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -706,9 +844,10 @@ async def get_project_test_summary(
         # 轉換為友善格式
         result = _transform_test_summary(raw_data)
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -914,9 +1053,10 @@ async def get_full_project_summary(
         # 轉換為完整專案摘要格式
         result = _transform_full_summary(raw_data)
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -1170,9 +1310,247 @@ async def get_project_test_details(
         # 轉換為測試項目詳細資料格式
         result = _transform_test_details(raw_data)
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
+        )
+        
+    except SAFAPIError as e:
+        if hasattr(e, 'error_code') and e.error_code == "PROJECT_NOT_FOUND":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=format_response(
+                    success=False,
+                    message=f"Project not found: {project_uid}",
+                    error_code="PROJECT_NOT_FOUND"
+                )
+            )
+        logger.error(f"SAF API error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=format_response(
+                success=False,
+                message=str(e),
+                error_code="SAF_API_ERROR"
+            )
+        )
+    except SAFConnectionError as e:
+        logger.error(f"SAF connection error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=format_response(
+                success=False,
+                message="Unable to connect to SAF server",
+                error_code="CONNECTION_ERROR"
+            )
+        )
+
+
+# 由同一份 listOneProjectSummary 資料產生各檢視的轉換函數
+_VIEW_TRANSFORMS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "summary": _transform_test_summary,
+    "firmware": _transform_firmware_summary,
+    "full": _transform_full_summary,
+    "details": _transform_test_details,
+}
+
+
+def _build_views(raw_data: Dict[str, Any], views: List[str]) -> Dict[str, Any]:
+    """
+    對同一份原始資料執行指定的檢視轉換
+    
+    Args:
+        raw_data: SAF listOneProjectSummary 回傳的原始資料
+        views: 檢視名稱列表 (_VIEW_TRANSFORMS 的 key)
+        
+    Returns:
+        以檢視名稱為 key 的轉換結果
+    """
+    return {view: _VIEW_TRANSFORMS[view](raw_data) for view in views}
+
+
+def _batch_error(error_code: str, message: str) -> Dict[str, Any]:
+    """批次結果中單一項目的錯誤"""
+    return {"success": False, "error_code": error_code, "message": message}
+
+
+@router.post(
+    "/test-summaries:batch",
+    response_model=APIResponse,
+    summary="批次取得多個專案的測試摘要"
+)
+async def batch_test_summaries(
+    request: TestSummaryBatchRequest,
+    auth: AuthInfo = Depends(get_auth_info),
+    client: SAFClient = Depends(get_saf_client),
+    settings: Settings = Depends(get_settings)
+):
+    """
+    批次取得多個專案的測試摘要
+    
+    以有上限的並行數 (SAF_BATCH_CONCURRENCY) 查詢每個專案，
+    單一專案失敗不影響其他專案，結果與錯誤都以專案 UID 為 key 一次返回。
+    
+    **Request Body:**
+    - **project_uids**: 專案 UID 列表 (必填，重複的 UID 只查詢一次)
+    - **views**: 要產生的檢視 (預設 ["summary"])
+      - `summary`: 同 `/{project_uid}/test-summary`
+      - `firmware`: 同 `/{project_uid}/firmware-summary`
+      - `full`: 同 `/{project_uid}/full-summary`
+      - `details`: 同 `/{project_uid}/test-details`
+    
+    **回應：**
+    - **results**: `{uid: {"success": true, "data": {view: ...}}}`，
+      失敗時為 `{"success": false, "error_code": ..., "message": ...}`
+    - **succeeded** / **failed**: 成功與失敗的專案數
+    
+    需要在 Header 中提供認證資訊：
+    - **Authorization**: 使用者 ID (從登入 API 取得)
+    - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
+    """
+    project_uids = list(dict.fromkeys(request.project_uids))
+    views = list(dict.fromkeys(request.views))
+    semaphore = asyncio.Semaphore(settings.saf_batch_concurrency)
+    
+    async def fetch_one(project_uid: str) -> Dict[str, Any]:
+        try:
+            async with semaphore:
+                raw_data = await client.get_project_test_summary(
+                    user_id=auth.user_id,
+                    username=auth.username,
+                    project_uid=project_uid
+                )
+            return {"success": True, "data": _build_views(raw_data, views)}
+        
+        except SAFAPIError as e:
+            if hasattr(e, 'error_code') and e.error_code == "PROJECT_NOT_FOUND":
+                return _batch_error("PROJECT_NOT_FOUND", f"Project not found: {project_uid}")
+            logger.error(f"SAF API error for {project_uid}: {e}")
+            return _batch_error("SAF_API_ERROR", str(e))
+        except SAFConnectionError as e:
+            logger.error(f"SAF connection error for {project_uid}: {e}")
+            return _batch_error("CONNECTION_ERROR", "Unable to connect to SAF server")
+    
+    outcomes = await asyncio.gather(*(fetch_one(uid) for uid in project_uids))
+    results = dict(zip(project_uids, outcomes))
+    succeeded = sum(1 for outcome in outcomes if outcome["success"])
+    
+    return api_response(
+        success=True,
+        data={
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(outcomes) - succeeded,
+        }
+    )
+
+
+def _parse_csv(value: Optional[str]) -> List[str]:
+    """解析逗號分隔的參數 (去除空白與重複項目，保留順序)"""
+    if not value:
+        return []
+    return list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+
+
+def _build_projection(fields: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    將 `view.field.subfield` 格式的欄位列表轉為各檢視的投影樹
+    
+    Example:
+        >>> _build_projection(["summary.summary.overall_total", "summary.project_uid"])
+        {'summary': {'summary': {'overall_total': {}}, 'project_uid': {}}}
+    """
+    projections: Dict[str, Dict[str, Any]] = {}
+    for field in fields:
+        view, *path = field.split(".")
+        node = projections.setdefault(view, {})
+        for key in path:
+            node = node.setdefault(key, {})
+    return projections
+
+
+def _project(data: Any, tree: Dict[str, Any]) -> Any:
+    """
+    依投影樹只保留指定欄位
+    
+    空的投影樹代表保留整個值；列表中的每個元素各自套用投影；
+    不存在的欄位直接略過
+    """
+    if not tree:
+        return data
+    if isinstance(data, list):
+        return [_project(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: _project(data[key], subtree) for key, subtree in tree.items() if key in data}
+    return data
+
+
+@router.get(
+    "/{project_uid}/views",
+    response_model=APIResponse,
+    summary="一次取得專案的多個檢視"
+)
+async def get_project_views(
+    project_uid: str,
+    include: str = Query(
+        "summary",
+        description="要產生的檢視 (逗號分隔): summary, firmware, full, details"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="各檢視只返回的欄位 (逗號分隔，格式 view.field[.subfield])"
+    ),
+    auth: AuthInfo = Depends(get_auth_info),
+    client: SAFClient = Depends(get_saf_client)
+):
+    """
+    以單次上游查詢取得專案的多個檢視
+    
+    `summary`、`firmware`、`full`、`details` 與各自的端點
+    (`test-summary`、`firmware-summary`、`full-summary`、`test-details`) 內容相同，
+    但只查詢一次 SAF，且只執行 `include` 指定的轉換。
+    
+    **欄位投影：**
+    - `fields=summary.summary.overall_pass_rate,firmware.overview` 只返回指定欄位
+    - 未出現在 `fields` 的檢視返回完整內容；列表中的每個元素各自套用投影
+    
+    需要在 Header 中提供認證資訊：
+    - **Authorization**: 使用者 ID (從登入 API 取得)
+    - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
+    """
+    views = _parse_csv(include)
+    projections = _build_projection(_parse_csv(fields))
+    
+    unknown = [view for view in [*views, *projections] if view not in _VIEW_TRANSFORMS]
+    if not views or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=format_response(
+                success=False,
+                message=(
+                    f"Unknown views: {', '.join(unknown)}" if unknown else "No views requested"
+                ) + f" (available: {', '.join(_VIEW_TRANSFORMS)})",
+                error_code="INVALID_VIEW"
+            )
+        )
+    
+    try:
+        raw_data = await client.get_project_test_summary(
+            user_id=auth.user_id,
+            username=auth.username,
+            project_uid=project_uid
+        )
+        
+        result = {
+            view: _project(data, projections.get(view, {}))
+            for view, data in _build_views(raw_data, views).items()
+        }
+        
+        return api_response(
+            success=True,
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -1323,9 +1701,10 @@ async def get_project_dashboard(
         # 轉換為儀表板格式
         result = _transform_dashboard(raw_data)
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=get_cache_status()
         )
         
     except SAFAPIError as e:
@@ -1405,6 +1784,7 @@ async def get_known_issues(
         default=True,
         description="是否顯示停用的 Issues"
     ),
+    source: DataSource = Query("live", description=SOURCE_DESCRIPTION),
     auth: AuthInfo = Depends(get_auth_info),
     client: SAFClient = Depends(get_saf_client)
 ):
@@ -1432,19 +1812,30 @@ async def get_known_issues(
     - **is_enable**: 是否啟用
     - **jira_link**: JIRA 連結
     
+    `source=snapshot` 時直接以本地快照回應 (需啟用 SAF_SNAPSHOT_ENABLED)
+    
     需要在 Header 中提供認證資訊：
     - **Authorization**: 使用者 ID (從登入 API 取得)
     - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
     """
     try:
-        # 呼叫 SAF API
-        raw_data = await client.list_known_issues(
-            user_id=auth.user_id,
-            username=auth.username,
-            project_id=project_id or [],
-            root_id=root_id or [],
-            show_disable=show_disable
-        )
+        if source == "snapshot":
+            raw_data, cache = await _read_snapshot(
+                KNOWN_ISSUES, [ALL_SCOPE], "list_known_issues",
+                project_id=project_id or [],
+                root_id=root_id or [],
+                show_disable=show_disable
+            )
+        else:
+            # 呼叫 SAF API
+            raw_data = await client.list_known_issues(
+                user_id=auth.user_id,
+                username=auth.username,
+                project_id=project_id or [],
+                root_id=root_id or [],
+                show_disable=show_disable
+            )
+            cache = get_cache_status()
         
         # 轉換資料格式
         items = raw_data.get("items", [])
@@ -1455,9 +1846,10 @@ async def get_known_issues(
             "total": len(transformed_items)
         }
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=cache
         )
         
     except SAFAPIError as e:
@@ -1537,6 +1929,7 @@ def _transform_test_status_item(item: Dict[str, Any]) -> Dict[str, Any]:
 )
 async def search_test_status(
     request: TestStatusSearchRequest,
+    source: DataSource = Query("live", description=SOURCE_DESCRIPTION),
     auth: AuthInfo = Depends(get_auth_info),
     client: SAFClient = Depends(get_saf_client)
 ):
@@ -1567,20 +1960,32 @@ async def search_test_status(
     - **log_path**: 測試日誌路徑
     - **os_name**: 作業系統名稱
     
+    查詢會先在本地編譯並驗證欄位 (錯誤時返回 400 INVALID_QUERY，不呼叫 SAF)。
+    以 AND 連接的條件中，SAF 已知支援的一個條件會下推給 SAF，其餘條件在本地過濾 SAF 的結果。
+    
+    `source=snapshot` 時以本地倒排索引回答整個查詢 (不支援 sort)，涵蓋範圍為快照同步的啟用中專案
+    
     需要在 Header 中提供認證資訊：
     - **Authorization**: 使用者 ID (從登入 API 取得)
     - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
     """
+    plan = _compile_test_status_query(request.query)
+    if source == "snapshot":
+        return _search_test_status_snapshot(request, plan)
+    
     try:
-        # 呼叫 SAF API
-        raw_data = await client.search_test_status(
-            user_id=auth.user_id,
-            username=auth.username,
-            query=request.query,
-            page=request.page,
-            size=request.size,
-            sort=request.sort
-        )
+        if plan.residual is None:
+            # 整個查詢由 SAF 評估
+            raw_data = await client.search_test_status(
+                user_id=auth.user_id,
+                username=auth.username,
+                query=plan.remote,
+                page=request.page,
+                size=request.size,
+                sort=request.sort
+            )
+        else:
+            raw_data = await _search_with_residual(client, auth, request, plan)
         
         # 轉換資料格式
         items = raw_data.get("items", [])
@@ -1593,7 +1998,7 @@ async def search_test_status(
             "size": request.size
         }
         
-        return format_response(
+        return api_response(
             success=True,
             data=result
         )
@@ -1620,29 +2025,206 @@ async def search_test_status(
         )
 
 
-def _transform_test_job_item(item: Dict[str, Any]) -> Dict[str, Any]:
+def _invalid_query(message: str) -> HTTPException:
+    """查詢不合法的 400 錯誤"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=format_response(
+            success=False,
+            message=message,
+            error_code="INVALID_QUERY"
+        )
+    )
+
+
+def _compile_test_status_query(query: str) -> QueryPlan:
     """
-    將 SAF 原始測試工作資料轉換為 snake_case 格式
+    編譯測試狀態查詢
+    
+    Raises:
+        HTTPException: 語法錯誤或欄位不可查詢 (400)
+    """
+    try:
+        return compile_query(query)
+    except ValidationError as e:
+        raise _invalid_query(e.message)
+
+
+async def _search_with_residual(
+    client: SAFClient,
+    auth: AuthInfo,
+    request: TestStatusSearchRequest,
+    plan: QueryPlan
+) -> Dict[str, Any]:
+    """
+    以下推條件逐頁查詢 SAF，並在本地以其餘條件過濾後分頁
     
-    Args:
-        item: SAF API 回傳的單一測試工作資料
-        
     Returns:
-        轉換後的測試工作字典
+        與 search_test_status 相同格式的結果 (total 為過濾後的筆數)
     """
-    return {
-        "test_job_id": item.get("testJobId", ""),
-        "fw": item.get("fw", ""),
-        "test_plan_name": item.get("testPlanName", ""),
-        "test_category_name": item.get("testCategoryName", ""),
-        "root_id": item.get("rootId", ""),
-        "test_item_name": item.get("testItemName", ""),
-        "test_status": item.get("testStatus", ""),
-        "sample_id": item.get("sampleId", ""),
-        "capacity": item.get("capacity", ""),
-        "platform": item.get("platform", ""),
-        "test_tool_key_list": item.get("testToolKeyList", []),
-    }
+    start = (request.page - 1) * request.size
+    matched: List[Dict[str, Any]] = []
+    total = 0
+    
+    pages = client.iter_test_status(
+        user_id=auth.user_id,
+        username=auth.username,
+        query=plan.remote,
+        sort=request.sort
+    )
+    try:
+        async for page in pages:
+            for item in page.get("items", []):
+                if not plan.residual.matches(item):
+                    continue
+                if start <= total < start + request.size:
+                    matched.append(item)
+                total += 1
+    finally:
+        await pages.aclose()
+    
+    return {"items": matched, "total": total, "page": request.page, "size": request.size}
+
+
+def _search_test_status_snapshot(request: TestStatusSearchRequest, plan: QueryPlan) -> FastJSONResponse:
+    """
+    以本地倒排索引搜尋測試狀態
+    
+    Raises:
+        HTTPException: 未啟用快照 (503)、索引尚未建立 (404) 或不支援 sort (400)
+    """
+    if get_snapshot_store() is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=format_response(
+                success=False,
+                message="Snapshot store is not enabled",
+                error_code="SNAPSHOT_UNAVAILABLE"
+            )
+        )
+    
+    index = get_test_status_index()
+    if index.built_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=format_response(
+                success=False,
+                message="Snapshot has not been synced yet: test_status",
+                error_code="SNAPSHOT_NOT_FOUND"
+            )
+        )
+    
+    if request.sort:
+        raise _invalid_query("sort is not supported for source=snapshot")
+    raw_data = index.search(plan.text, page=request.page, size=request.size)
+    
+    raw_data["items"] = [_transform_test_status_item(item) for item in raw_data["items"]]
+    snapshot = {"hit": True, "age": round(time.time() - index.built_at, 3), "stale": False, "source": "snapshot"}
+    return api_response(success=True, data=raw_data, cache=snapshot)
+
+
+def _ndjson_lines(items: List[Dict[str, Any]]) -> str:
+    """將多筆資料序列化為 NDJSON (每行一筆)"""
+    return "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items)
+
+
+@router.post(
+    "/test-status/search/stream",
+    summary="串流匯出所有測試狀態 (NDJSON)",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+async def stream_test_status(
+    request: TestStatusExportRequest,
+    auth: AuthInfo = Depends(get_auth_info),
+    client: SAFClient = Depends(get_saf_client)
+):
+    """
+    串流匯出所有符合條件的測試狀態
+    
+    自動取得所有頁面 (處理目前頁面時預先查詢下一頁)，
+    以 NDJSON (每行一筆 JSON) 逐頁輸出，伺服器記憶體用量與結果筆數無關。
+    每行格式與 `/test-status/search` 的 items 相同；總筆數放在 `X-Total-Count` Header。
+    
+    串流開始後若 SAF 發生錯誤，最後一行為 `success: false` 的錯誤回應。
+    
+    查詢的編譯與下推方式與 `/test-status/search` 相同；有條件在本地過濾時
+    無法事先得知總筆數，不會提供 `X-Total-Count`。
+    
+    需要在 Header 中提供認證資訊：
+    - **Authorization**: 使用者 ID (從登入 API 取得)
+    - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
+    """
+    plan = _compile_test_status_query(request.query)
+    residual = plan.residual
+    
+    def transform(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            _transform_test_status_item(item) for item in items
+            if residual is None or residual.matches(item)
+        ]
+    
+    pages = client.iter_test_status(
+        user_id=auth.user_id,
+        username=auth.username,
+        query=plan.remote,
+        sort=request.sort
+    )
+    
+    # 先取得第 1 頁，讓查詢錯誤仍能以 HTTP 狀態碼回應
+    try:
+        first_page = await pages.__anext__()
+    except StopAsyncIteration:
+        first_page = {}
+    except SAFAPIError as e:
+        logger.error(f"SAF API error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=format_response(
+                success=False,
+                message=str(e),
+                error_code="SAF_API_ERROR"
+            )
+        )
+    except SAFConnectionError as e:
+        logger.error(f"SAF connection error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=format_response(
+                success=False,
+                message="Unable to connect to SAF server",
+                error_code="CONNECTION_ERROR"
+            )
+        )
+    
+    async def body() -> AsyncIterator[str]:
+        try:
+            yield _ndjson_lines(transform(first_page.get("items", [])))
+            async for page in pages:
+                yield _ndjson_lines(transform(page.get("items", [])))
+        except SAFAPIError as e:
+            logger.error(f"SAF API error during export: {e}")
+            yield _ndjson_lines([
+                format_response(success=False, message=str(e), error_code="SAF_API_ERROR")
+            ])
+        except SAFConnectionError as e:
+            logger.error(f"SAF connection error during export: {e}")
+            yield _ndjson_lines([
+                format_response(
+                    success=False,
+                    message="Unable to connect to SAF server",
+                    error_code="CONNECTION_ERROR"
+                )
+            ])
+        finally:
+            await pages.aclose()
+    
+    headers = {"X-Total-Count": str(first_page.get("total", 0))} if residual is None else {}
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
 
 
 @router.post(
@@ -1652,6 +2234,7 @@ def _transform_test_job_item(item: Dict[str, Any]) -> Dict[str, Any]:
 )
 async def list_test_jobs(
     request: TestJobsRequest,
+    source: DataSource = Query("live", description=SOURCE_DESCRIPTION),
     auth: AuthInfo = Depends(get_auth_info),
     client: SAFClient = Depends(get_saf_client)
 ):
@@ -1676,32 +2259,44 @@ async def list_test_jobs(
     - **capacity**: 容量
     - **platform**: 測試平台
     - **test_tool_key_list**: 測試工具 Key 列表
+    - **status_counts**: 各測試狀態的筆數
+    
+    測試工作以字典編碼的欄式表快取 (見 app.services.job_table)，大型專案也只佔用少量記憶體。
+    
+    `source=snapshot` 時直接以本地快照回應 (需啟用 SAF_SNAPSHOT_ENABLED)
     
     需要在 Header 中提供認證資訊：
     - **Authorization**: 使用者 ID (從登入 API 取得)
     - **Authorization-Name**: 使用者名稱 (從登入 API 取得)
     """
     try:
-        # 呼叫 SAF API
-        raw_data = await client.list_all_test_jobs(
-            user_id=auth.user_id,
-            username=auth.username,
-            project_ids=request.project_ids,
-            test_tool_key=request.test_tool_key
-        )
-        
-        # 轉換資料格式
-        test_jobs = raw_data.get("testJobs", [])
-        transformed_jobs = [_transform_test_job_item(job) for job in test_jobs]
+        if source == "snapshot":
+            raw_data, cache = await _read_snapshot(
+                TEST_JOBS, request.project_ids, "list_test_jobs",
+                project_ids=request.project_ids,
+                test_tool_key=request.test_tool_key
+            )
+            table = await asyncio.to_thread(JobTable.from_jobs, raw_data.get("testJobs", []))
+        else:
+            # 呼叫 SAF API
+            table = await client.get_test_job_table(
+                user_id=auth.user_id,
+                username=auth.username,
+                project_ids=request.project_ids,
+                test_tool_key=request.test_tool_key
+            )
+            cache = get_cache_status()
         
         result = {
-            "test_jobs": transformed_jobs,
-            "total": len(transformed_jobs)
+            "test_jobs": table.rows(),
+            "total": len(table),
+            "status_counts": table.count_by("test_status")
         }
         
-        return format_response(
+        return api_response(
             success=True,
-            data=result
+            data=result,
+            cache=cache
         )
         
     except SAFAPIError as e:
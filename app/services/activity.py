@@ -0,0 +1,98 @@
+"""
+互動請求活動追蹤
+
+記錄目前進行中的互動請求數，以及各專案近期被請求的頻率 (指數衰減)，
+供背景工作 (如快取預熱) 判斷負載與排序優先順序
+"""
+
+import math
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class RequestActivity:
+    """
+    互動請求活動追蹤
+
+    - in_flight: 目前進行中的互動請求數
+    - frequency(key): 該 key 近期被請求的次數，每經過 half_life 秒衰減一半
+
+    Example:
+        >>> activity = RequestActivity()
+        >>> activity.begin(["project-uid"])
+        >>> activity.end()
+        >>> activity.frequency("project-uid")
+        1.0
+    """
+
+    def __init__(self, half_life: float = 3600.0, max_keys: int = 10000):
+        """
+        初始化活動追蹤
+
+        Args:
+            half_life: 請求頻率衰減一半所需的秒數
+            max_keys: 最多追蹤的 key 數，超過時移除頻率最低的一半
+        """
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self.in_flight = 0
+        self._scores: Dict[str, Tuple[float, float]] = {}
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        """計算衰減後的頻率"""
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def begin(self, keys: Iterable[str] = (), now: Optional[float] = None) -> None:
+        """
+        記錄一個互動請求開始
+
+        Args:
+            keys: 此請求涉及的 key (例如 project_uid / project_id)
+            now: 目前時間 (預設 time.monotonic)
+        """
+        now = time.monotonic() if now is None else now
+        self.in_flight += 1
+
+        for key in keys:
+            score, updated_at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated_at, now) + 1.0, now)
+
+        if len(self._scores) > self.max_keys:
+            self._prune(now)
+
+    def end(self) -> None:
+        """記錄一個互動請求結束"""
+        self.in_flight = max(self.in_flight - 1, 0)
+
+    def frequency(self, key: str, now: Optional[float] = None) -> float:
+        """
+        取得 key 近期被請求的頻率
+
+        Args:
+            key: 追蹤的 key
+            now: 目前時間 (預設 time.monotonic)
+        """
+        if key not in self._scores:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        score, updated_at = self._scores[key]
+        return self._decayed(score, updated_at, now)
+
+    def _prune(self, now: float) -> None:
+        """移除頻率最低的一半 key"""
+        ranked = sorted(self._scores, key=lambda key: self.frequency(key, now), reverse=True)
+        for key in ranked[self.max_keys // 2:]:
+            del self._scores[key]
+
+    def stats(self) -> Dict[str, int]:
+        """取得活動統計資訊"""
+        return {"in_flight": self.in_flight, "tracked_keys": len(self._scores)}
+
+
+# 應用程式層級的活動追蹤
+_activity = RequestActivity()
+
+
+def get_request_activity() -> RequestActivity:
+    """取得應用程式層級的活動追蹤"""
+    return _activity
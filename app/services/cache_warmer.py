@@ -0,0 +1,245 @@
+"""
+SAF 回應快取預熱
+
+由 lifespan 啟動的背景工作：使用設定檔中的服務帳號走訪專案列表，
+預先查詢啟用中專案的儀表板與測試摘要，讓部署後的第一次請求也能命中快取
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import Settings
+from app.services.activity import RequestActivity, get_request_activity
+from app.services.connection_pool import get_connection_pool
+from app.services.response_cache import get_response_cache
+from app.services.saf_client import SAFClient
+from lib.exceptions import SAFAPIError, SAFConnectionError
+from lib.logger import LoggerMixin, get_logger
+
+logger = get_logger(__name__)
+
+# 預熱項目種類
+DASHBOARD_TARGET = "dashboard"
+TEST_SUMMARY_TARGET = "test_summary"
+
+# 退避的起始等待秒數
+BACKOFF_INITIAL = 1.0
+
+
+def is_active_project(project: Dict[str, Any]) -> bool:
+    """專案是否啟用中 (visible 且 status 為 0)"""
+    return bool(project.get("visible", True)) and project.get("status", 0) == 0
+
+
+class CacheWarmer(LoggerMixin):
+    """
+    SAF 回應快取預熱
+
+    每個週期：
+    1. 以服務帳號 (login_with_config) 登入並自動分頁取得所有專案
+    2. 收集啟用中專案 (含 children) 的儀表板 (projectId) 與測試摘要 (projectUid)
+    3. 依近期請求頻率排序，最多預熱 saf_warmer_max_targets 項
+    4. 以 saf_warmer_concurrency 的並行數查詢；互動請求過多時指數退避
+
+    快取 key 包含呼叫者身分，預熱結果由使用同一服務帳號的請求命中。
+
+    Example:
+        >>> warmer = CacheWarmer(settings, client)
+        >>> warmer.start()
+        >>> await warmer.stop()
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        client: SAFClient,
+        activity: Optional[RequestActivity] = None
+    ):
+        """
+        初始化快取預熱
+
+        Args:
+            settings: 設定物件
+            client: 使用共用快取的 SAF Client
+            activity: 互動請求活動追蹤，預設使用應用程式層級的追蹤
+        """
+        self.settings = settings
+        self.client = client
+        self.activity = activity or get_request_activity()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stats: Dict[str, Any] = {
+            "cycles": 0,
+            "warmed": 0,
+            "failed": 0,
+            "backoffs": 0,
+            "last_cycle_at": None,
+            "last_cycle_seconds": None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """背景工作是否執行中"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """啟動背景預熱工作"""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        self.logger.info(
+            f"Cache warmer started (interval={self.settings.saf_warmer_interval}s, "
+            f"concurrency={self.settings.saf_warmer_concurrency})"
+        )
+
+    async def stop(self) -> None:
+        """停止背景預熱工作"""
+        if self._task is None:
+            return
+
+        task, self._task = self._task, None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self.logger.info("Cache warmer stopped")
+
+    async def _run(self) -> None:
+        """依排程重複執行預熱"""
+        await asyncio.sleep(self.settings.saf_warmer_initial_delay)
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Cache warm cycle failed: {e}")
+            await asyncio.sleep(self.settings.saf_warmer_interval)
+
+    def _collect_targets(
+        self,
+        projects: List[Dict[str, Any]],
+        targets: Dict[Tuple[str, str], None]
+    ) -> None:
+        """遞迴收集啟用中專案的預熱項目 (以 dict 保留順序並去除重複)"""
+        for project in projects:
+            if not is_active_project(project):
+                continue
+            if project.get("projectId"):
+                targets[(DASHBOARD_TARGET, project["projectId"])] = None
+            if project.get("projectUid"):
+                targets[(TEST_SUMMARY_TARGET, project["projectUid"])] = None
+            self._collect_targets(project.get("children") or [], targets)
+
+    async def _wait_until_quiet(self) -> None:
+        """互動請求過多時指數退避，直到負載降低"""
+        delay = BACKOFF_INITIAL
+        while self.activity.in_flight >= self.settings.saf_warmer_busy_threshold:
+            self._stats["backoffs"] += 1
+            self.logger.debug(
+                f"Cache warmer backing off for {delay:.1f}s "
+                f"(in_flight={self.activity.in_flight})"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.settings.saf_warmer_backoff_max)
+
+    async def _warm(self, user_id: int, username: str, kind: str, key: str) -> None:
+        """預熱單一項目 (失敗只記錄，不中斷週期)"""
+        await self._wait_until_quiet()
+        try:
+            if kind == DASHBOARD_TARGET:
+                await self.client.get_project_dashboard(user_id, username, project_id=key)
+            else:
+                await self.client.get_project_test_summary(user_id, username, project_uid=key)
+            self._stats["warmed"] += 1
+        except (SAFAPIError, SAFConnectionError) as e:
+            self._stats["failed"] += 1
+            self.logger.debug(f"Failed to warm {kind} {key}: {e}")
+
+    async def run_once(self) -> int:
+        """
+        執行一次預熱週期
+
+        Returns:
+            本週期預熱的項目數
+        """
+        started = time.monotonic()
+        auth = await self.client.login_with_config()
+        user_id, username = auth["id"], auth["name"]
+
+        targets: Dict[Tuple[str, str], None] = {}
+        async for page in self.client.iter_all_projects(user_id, username):
+            self._collect_targets(page.get("data", []), targets)
+
+        # 依近期請求頻率排序 (sorted 為穩定排序，同頻率保持專案列表順序)
+        ordered = sorted(targets, key=lambda target: self.activity.frequency(target[1]), reverse=True)
+        ordered = ordered[:self.settings.saf_warmer_max_targets]
+
+        semaphore = asyncio.Semaphore(self.settings.saf_warmer_concurrency)
+
+        async def warm_one(kind: str, key: str) -> None:
+            async with semaphore:
+                await self._warm(user_id, username, kind, key)
+
+        await asyncio.gather(*(warm_one(kind, key) for kind, key in ordered))
+
+        elapsed = time.monotonic() - started
+        self._stats["cycles"] += 1
+        self._stats["last_cycle_at"] = datetime.now(timezone.utc).isoformat()
+        self._stats["last_cycle_seconds"] = round(elapsed, 3)
+        self.logger.info(f"Cache warm cycle finished: {len(ordered)} targets in {elapsed:.1f}s")
+        return len(ordered)
+
+    def stats(self) -> Dict[str, Any]:
+        """取得預熱統計資訊"""
+        return {"running": self.is_running, **self._stats}
+
+
+# 應用程式層級的快取預熱 (由 lifespan 管理)
+_warmer: Optional[CacheWarmer] = None
+
+
+def init_cache_warmer(settings: Settings) -> Optional[CacheWarmer]:
+    """
+    建立並啟動快取預熱
+
+    需在 init_connection_pool / init_response_cache 之後呼叫
+
+    Args:
+        settings: 設定物件
+
+    Returns:
+        已啟動的快取預熱；停用、未啟用回應快取或未設定 SAF 帳密時返回 None
+    """
+    global _warmer
+
+    if not settings.saf_warmer_enabled:
+        return None
+
+    cache = get_response_cache()
+    if cache is None:
+        logger.info("Cache warmer disabled: response cache is not enabled")
+        return None
+    if not settings.has_credentials:
+        logger.warning("Cache warmer disabled: SAF_USERNAME / SAF_PASSWORD are not configured")
+        return None
+
+    if _warmer is None:
+        client = SAFClient(settings, pool=get_connection_pool(), cache=cache)
+        _warmer = CacheWarmer(settings, client)
+        _warmer.start()
+
+    return _warmer
+
+
+def get_cache_warmer() -> Optional[CacheWarmer]:
+    """取得快取預熱 (未啟動時返回 None)"""
+    return _warmer
+
+
+async def close_cache_warmer() -> None:
+    """停止並移除快取預熱"""
+    global _warmer
+
+    if _warmer is not None:
+        warmer, _warmer = _warmer, None
+        await warmer.stop()
@@ -0,0 +1,268 @@
+"""
+SAF 共用連線池
+
+在應用程式生命週期內，為每個 SAF 上游主機 (登入 Port 與資料 API Port)
+維持一個長期存在的 httpx.AsyncClient，避免每次 API 呼叫都重新進行 TCP + TLS 交握
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  # HTTP/2 為可選依賴 (pip install httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - 依安裝環境而定
+    HTTP2_AVAILABLE = False
+
+from app.config import Settings
+from lib.logger import LoggerMixin
+
+# 上游目標名稱
+LOGIN_TARGET = "login"
+API_TARGET = "api"
+
+# httpx 客戶端基本設定 - 繞過 proxy
+BASE_CLIENT_KWARGS = {
+    "trust_env": False,  # 不使用系統 proxy
+    "timeout": 30.0,
+    "verify": True,  # SSL 驗證
+}
+
+
+class SAFConnectionPool(LoggerMixin):
+    """
+    SAF 共用連線池
+
+    每個上游主機各有一個共用的 httpx.AsyncClient，由 lifespan 建立與關閉
+
+    Example:
+        >>> pool = SAFConnectionPool(settings)
+        >>> await pool.start()
+        >>> async with pool.borrow("api") as client:
+        ...     response = await client.post(url, json={})
+        >>> await pool.close()
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        初始化連線池
+
+        Args:
+            settings: 設定物件
+        """
+        self.settings = settings
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stream_limits: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {
+            target: {"requests_by_protocol": {}, "in_flight": 0, "peak_in_flight": 0}
+            for target in (LOGIN_TARGET, API_TARGET)
+        }
+        self.http2 = self._resolve_http2()
+
+    @property
+    def is_started(self) -> bool:
+        """連線池是否已啟動"""
+        return bool(self._clients)
+
+    def _resolve_http2(self) -> bool:
+        """判斷是否能使用 HTTP/2 (未安裝 h2 時退回 HTTP/1.1)"""
+        if not self.settings.saf_http2_enabled:
+            return False
+        if not HTTP2_AVAILABLE:
+            self.logger.warning(
+                "SAF_HTTP2_ENABLED is set but the 'h2' package is not installed; "
+                "falling back to HTTP/1.1"
+            )
+            return False
+        return True
+
+    def _build_limits(self) -> httpx.Limits:
+        """依設定建立連線數限制"""
+        return httpx.Limits(
+            max_connections=self.settings.saf_pool_max_connections,
+            max_keepalive_connections=self.settings.saf_pool_max_keepalive_connections,
+            keepalive_expiry=self.settings.saf_pool_keepalive_expiry,
+        )
+
+    def _build_client(self, target: str) -> httpx.AsyncClient:
+        """建立單一主機使用的共用客戶端"""
+        kwargs: Dict[str, Any] = dict(BASE_CLIENT_KWARGS)
+
+        if self.http2:
+            # ALPN 協商 h2；伺服器不支援時 httpx 自動使用 HTTP/1.1
+            kwargs["http2"] = True
+            if self.settings.saf_http2_prior_knowledge:
+                # h2c: 明文連線直接使用 HTTP/2，無法退回
+                kwargs["http1"] = False
+
+        async def record_response(response: httpx.Response) -> None:
+            versions = self._stats[target]["requests_by_protocol"]
+            versions[response.http_version] = versions.get(response.http_version, 0) + 1
+
+        return httpx.AsyncClient(
+            limits=self._build_limits(),
+            event_hooks={"response": [record_response]},
+            **kwargs,
+        )
+
+    async def start(self) -> None:
+        """建立所有上游主機的共用客戶端"""
+        if self.is_started:
+            return
+
+        for target in (LOGIN_TARGET, API_TARGET):
+            if self.http2:
+                self._stream_limits[target] = asyncio.Semaphore(
+                    self.settings.saf_http2_max_concurrent_streams
+                )
+            self._clients[target] = self._build_client(target)
+
+        self.logger.info(
+            f"SAF connection pool started "
+            f"(http2={self.http2}, "
+            f"max_connections={self.settings.saf_pool_max_connections}, "
+            f"max_keepalive={self.settings.saf_pool_max_keepalive_connections})"
+        )
+
+    async def close(self) -> None:
+        """關閉所有共用客戶端"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+
+        for client in clients:
+            await client.aclose()
+
+        if clients:
+            self.logger.info("SAF connection pool closed")
+
+    def get(self, target: str) -> httpx.AsyncClient:
+        """
+        取得指定上游主機的共用客戶端
+
+        Args:
+            target: 上游目標 ("login" 或 "api")
+
+        Raises:
+            RuntimeError: 連線池尚未啟動
+            KeyError: 未知的上游目標
+        """
+        if not self.is_started:
+            raise RuntimeError("SAF connection pool is not started")
+        return self._clients[target]
+
+    @asynccontextmanager
+    async def borrow(self, target: str) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        借用共用客戶端
+
+        與 `async with httpx.AsyncClient()` 用法相同，但離開時不會關閉客戶端。
+        HTTP/2 模式下同時借用數受 saf_http2_max_concurrent_streams 限制
+
+        Args:
+            target: 上游目標 ("login" 或 "api")
+        """
+        client = self.get(target)
+        stream_limit = self._stream_limits.get(target)
+
+        if stream_limit is not None:
+            await stream_limit.acquire()
+
+        stats = self._stats[target]
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            yield client
+        finally:
+            stats["in_flight"] -= 1
+            if stream_limit is not None:
+                stream_limit.release()
+
+    @staticmethod
+    def _count_connections(client: httpx.AsyncClient) -> Dict[str, int]:
+        """
+        依協定統計目前的連線數
+
+        httpcore 連線的 info() 格式如 "'https://host:3004', HTTP/2, ACTIVE, Request Count: 3"
+        """
+        counts: Dict[str, int] = {}
+        transport_pool = getattr(getattr(client, "_transport", None), "_pool", None)
+
+        for connection in getattr(transport_pool, "connections", []):
+            info = connection.info()
+            if "HTTP/2" in info:
+                protocol = "HTTP/2"
+            elif "HTTP/1.1" in info:
+                protocol = "HTTP/1.1"
+            else:
+                protocol = "CONNECTING"
+            counts[protocol] = counts.get(protocol, 0) + 1
+
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        取得連線池監控資訊
+
+        Returns:
+            各上游主機的連線數、進行中請求數與依協定分類的請求數
+        """
+        targets = {}
+        for target, client in self._clients.items():
+            target_stats = self._stats[target]
+            targets[target] = {
+                "connections": self._count_connections(client),
+                "in_flight": target_stats["in_flight"],
+                "peak_in_flight": target_stats["peak_in_flight"],
+                "requests_by_protocol": dict(target_stats["requests_by_protocol"]),
+            }
+
+        return {
+            "http2": self.http2,
+            "max_concurrent_streams": (
+                self.settings.saf_http2_max_concurrent_streams if self.http2 else None
+            ),
+            "targets": targets,
+        }
+
+
+# 應用程式層級的共用連線池 (由 lifespan 管理)
+_pool: Optional[SAFConnectionPool] = None
+
+
+async def init_connection_pool(settings: Settings) -> Optional[SAFConnectionPool]:
+    """
+    建立並啟動共用連線池
+
+    Args:
+        settings: 設定物件
+
+    Returns:
+        已啟動的連線池；若設定停用連線池則返回 None
+    """
+    global _pool
+
+    if not settings.saf_pool_enabled:
+        return None
+
+    if _pool is None:
+        _pool = SAFConnectionPool(settings)
+        await _pool.start()
+
+    return _pool
+
+
+def get_connection_pool() -> Optional[SAFConnectionPool]:
+    """取得共用連線池 (未啟動時返回 None)"""
+    return _pool
+
+
+async def close_connection_pool() -> None:
+    """關閉並移除共用連線池"""
+    global _pool
+
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
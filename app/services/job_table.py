@@ -0,0 +1,244 @@
+"""
+測試工作欄式表
+
+大量測試工作 (ListAllTestJobs) 以欄式儲存：每個欄位一個 array，
+重複出現的字串 (平台、容量、狀態、計畫名稱等) 以字典編碼，每列只存 1~4 bytes 的代碼；
+testToolKeyList 以 offsets + 代碼 array 儲存，testJobId 串接為單一字串 + offsets。
+快取的是欄式表而非每列一個 dict，記憶體用量約為原本的十分之一，篩選與計數也只需走訪整數 array
+"""
+
+from array import array
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence
+
+# 代碼 array 的型別：依不重複值的數量由 1 byte 逐步加寬
+_CODE_TYPES = (("B", 1 << 8), ("H", 1 << 16), ("I", 1 << 32))
+
+# 字典編碼欄位: {輸出欄位: SAF 原始欄位} (順序即輸出順序)
+DICTIONARY_COLUMNS: Dict[str, str] = {
+    "fw": "fw",
+    "test_plan_name": "testPlanName",
+    "test_category_name": "testCategoryName",
+    "root_id": "rootId",
+    "test_item_name": "testItemName",
+    "test_status": "testStatus",
+    "sample_id": "sampleId",
+    "capacity": "capacity",
+    "platform": "platform",
+}
+
+
+class DictionaryColumn:
+    """
+    字典編碼欄位
+
+    values 保存不重複的值，codes 保存每列對應的 values 索引；
+    不重複值少於 256 個時每列只佔 1 byte，超過時自動加寬 array
+    """
+
+    __slots__ = ("codes", "values", "_lookup")
+
+    def __init__(self):
+        self.codes = array("B")
+        self.values: List[Hashable] = []
+        self._lookup: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _widen(self) -> None:
+        """改用可容納目前不重複值數量的 array 型別"""
+        for typecode, limit in _CODE_TYPES:
+            if len(self.values) <= limit:
+                if typecode != self.codes.typecode:
+                    self.codes = array(typecode, self.codes)
+                return
+        raise OverflowError("Too many distinct values")
+
+    def encode(self, value: Hashable) -> int:
+        """取得值的代碼 (不存在時新增)"""
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+            if code == 1 << (8 * self.codes.itemsize):
+                self._widen()
+        return code
+
+    def append(self, value: Hashable) -> None:
+        """新增一列"""
+        code = self.encode(value)  # 可能加寬 array，需先取得代碼
+        self.codes.append(code)
+
+    def code_of(self, value: Hashable) -> Optional[int]:
+        """取得值的代碼 (不存在時返回 None)"""
+        return self._lookup.get(value)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def rows_equal(self, code: int) -> List[int]:
+        """取得代碼等於 code 的列索引"""
+        if self.codes.typecode == "B":
+            # 1 byte 代碼直接以 bytes.find 搜尋 (C 迴圈)
+            data, needle = self.codes.tobytes(), bytes((code,))
+            rows = []
+            position = data.find(needle)
+            while position != -1:
+                rows.append(position)
+                position = data.find(needle, position + 1)
+            return rows
+        return [row for row, row_code in enumerate(self.codes) if row_code == code]
+
+    def count(self) -> Dict[Any, int]:
+        """各值的列數"""
+        if self.codes.typecode == "B":
+            data = self.codes.tobytes()
+            counts = ((value, data.count(bytes((code,)))) for code, value in enumerate(self.values))
+            return {value: total for value, total in counts if total}
+        return {self.values[code]: total for code, total in Counter(self.codes).items()}
+
+    def nbytes(self) -> int:
+        """代碼 array 的大小 (bytes)"""
+        return self.codes.itemsize * len(self.codes)
+
+
+class JobTable:
+    """
+    測試工作欄式表
+
+    建立後不可修改 (會被回應快取共用)。
+    rows() 產生的格式與 `/projects/test-jobs` 回應的 test_jobs 相同。
+
+    Example:
+        >>> table = JobTable.from_jobs(data["testJobs"])
+        >>> table.count_by("test_status")
+        {'Pass': 180000, 'Fail': 20000}
+        >>> table.rows(table.where("platform", "NB-SSD-0736"))
+    """
+
+    def __init__(self):
+        self._job_ids = ""
+        self._job_id_offsets = array("I", [0])
+        self.columns: Dict[str, DictionaryColumn] = {name: DictionaryColumn() for name in DICTIONARY_COLUMNS}
+        self.tool_keys = DictionaryColumn()
+        self.tool_key_offsets = array("I", [0])
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Dict[str, Any]]) -> "JobTable":
+        """
+        由 SAF 原始測試工作建立欄式表
+
+        Args:
+            jobs: ListAllTestJobs 回傳的 testJobs
+        """
+        table = cls()
+        columns = [(table.columns[name], raw) for name, raw in DICTIONARY_COLUMNS.items()]
+        tool_keys = table.tool_keys
+        job_ids: List[str] = []
+        id_offsets = table._job_id_offsets
+        id_length = 0
+
+        for job in jobs:
+            job_id = job.get("testJobId") or ""
+            job_ids.append(job_id)
+            id_length += len(job_id)
+            id_offsets.append(id_length)
+            for column, raw in columns:
+                column.append(job.get(raw, ""))
+            for key in job.get("testToolKeyList") or ():
+                tool_keys.append(key)
+            table.tool_key_offsets.append(len(tool_keys))
+
+        # testJobId 幾乎不重複，串接為單一字串以省去每個 str 物件的額外開銷
+        table._job_ids = "".join(job_ids)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._job_id_offsets) - 1
+
+    def test_job_id(self, row: int) -> str:
+        """取得一列的 testJobId"""
+        return self._job_ids[self._job_id_offsets[row]:self._job_id_offsets[row + 1]]
+
+    def tool_key_list(self, row: int) -> List[str]:
+        """取得一列的 testToolKeyList"""
+        values = self.tool_keys.values
+        start, stop = self.tool_key_offsets[row], self.tool_key_offsets[row + 1]
+        return [values[code] for code in self.tool_keys.codes[start:stop]]
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """取得一列 (snake_case 格式)"""
+        result: Dict[str, Any] = {"test_job_id": self.test_job_id(row)}
+        for name, column in self.columns.items():
+            result[name] = column[row]
+        result["test_tool_key_list"] = self.tool_key_list(row)
+        return result
+
+    def rows(self, indices: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        取得多列 (snake_case 格式)
+
+        Args:
+            indices: 列索引，None 表示全部
+        """
+        if indices is None:
+            indices = range(len(self))
+
+        decoded = [
+            (name, column.values, column.codes) for name, column in self.columns.items()
+        ]
+        job_ids, id_offsets = self._job_ids, self._job_id_offsets
+        result = []
+        for row in indices:
+            item: Dict[str, Any] = {"test_job_id": job_ids[id_offsets[row]:id_offsets[row + 1]]}
+            for name, values, codes in decoded:
+                item[name] = values[codes[row]]
+            item["test_tool_key_list"] = self.tool_key_list(row)
+            result.append(item)
+        return result
+
+    def where(self, column: str, value: Any) -> List[int]:
+        """
+        取得欄位等於 value 的列索引 (只比對整數代碼)
+
+        Args:
+            column: 字典編碼欄位名稱 (DICTIONARY_COLUMNS 的 key)
+            value: 比對的值
+        """
+        dictionary = self.columns[column]
+        code = dictionary.code_of(value)
+        if code is None:
+            return []
+        return dictionary.rows_equal(code)
+
+    def with_tool_key(self, key: str) -> List[int]:
+        """取得 testToolKeyList 包含 key 的列索引"""
+        code = self.tool_keys.code_of(key)
+        if code is None:
+            return []
+        codes, offsets = self.tool_keys.codes, self.tool_key_offsets
+        return [
+            row for row in range(len(self))
+            if code in codes[offsets[row]:offsets[row + 1]]
+        ]
+
+    def count_by(self, column: str) -> Dict[Any, int]:
+        """
+        依欄位計數
+
+        Args:
+            column: 字典編碼欄位名稱 (DICTIONARY_COLUMNS 的 key)
+        """
+        return self.columns[column].count()
+
+    def stats(self) -> Dict[str, Any]:
+        """取得表的大小資訊 (列數、各欄位不重複值數與 array bytes)"""
+        return {
+            "rows": len(self),
+            "distinct": {name: len(column.values) for name, column in self.columns.items()},
+            "array_bytes": sum(column.nbytes() for column in self.columns.values())
+            + self.tool_keys.nbytes()
+            + self.tool_key_offsets.itemsize * len(self.tool_key_offsets)
+            + self._job_id_offsets.itemsize * len(self._job_id_offsets),
+        }
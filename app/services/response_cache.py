@@ -0,0 +1,52 @@
+"""
+SAF 回應快取
+
+應用程式層級共用的 TTL 快取，由 lifespan 建立並注入 SAFClient
+"""
+
+from typing import Optional
+
+from app.config import Settings
+from lib.cache import MemoryLRUBackend, TTLCache
+from lib.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 應用程式層級的共用快取 (由 lifespan 管理)
+_cache: Optional[TTLCache] = None
+
+
+def init_response_cache(settings: Settings) -> Optional[TTLCache]:
+    """
+    建立共用回應快取
+
+    Args:
+        settings: 設定物件
+
+    Returns:
+        共用快取；若設定停用快取則返回 None
+    """
+    global _cache
+
+    if not settings.saf_cache_enabled:
+        return None
+
+    if _cache is None:
+        _cache = TTLCache(MemoryLRUBackend(max_entries=settings.saf_cache_max_entries))
+        logger.info(f"SAF response cache enabled (max_entries={settings.saf_cache_max_entries})")
+
+    return _cache
+
+
+def get_response_cache() -> Optional[TTLCache]:
+    """取得共用回應快取 (未建立時返回 None)"""
+    return _cache
+
+
+def close_response_cache() -> None:
+    """清除並移除共用回應快取"""
+    global _cache
+
+    if _cache is not None:
+        _cache.clear()
+        _cache = None
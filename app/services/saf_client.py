@@ -4,14 +4,105 @@ SAF API Client
 封裝對 SAF 網站的所有 API 呼叫
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import inspect
+import math
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
 
 import httpx
 
 from app.config import Settings, get_settings
+from app.services.connection_pool import (
+    API_TARGET,
+    BASE_CLIENT_KWARGS,
+    LOGIN_TARGET,
+    SAFConnectionPool,
+)
+from app.services.job_table import JobTable
+from lib.cache import TTLCache, make_cache_key, set_cache_status
 from lib.decorators import log_execution, retry
 from lib.exceptions import SAFAPIError, SAFAuthenticationError, SAFConnectionError
 from lib.logger import LoggerMixin
+from lib.singleflight import SingleFlight
+
+
+# 所有 SAFClient 實例共用的進行中呼叫群組
+_inflight_calls = SingleFlight()
+
+# 進行中的背景更新 (保留參考避免 Task 被回收)
+_background_refreshes: Set["asyncio.Task[Any]"] = set()
+
+
+def _read_through(ttl_setting: str, hard_ttl_setting: Optional[str] = None) -> Callable:
+    """
+    SAF 讀取呼叫的快取與請求合併裝飾器
+    
+    - 快取：key 由方法名稱與所有參數組成，參數包含呼叫者身分
+      (user_id/username，即 Authorization/Authorization_name)，因此不同使用者不會共用結果
+    - Single-flight：相同 key 的並行呼叫共用同一個進行中的上游請求，
+      錯誤與取消會正確傳遞給每個等待者 (與快取是否啟用無關)
+    - Stale-while-revalidate：有設定 hard TTL 時，超過 soft TTL 的項目仍立即返回，
+      並在背景更新；超過 hard TTL 才阻塞等待上游
+    
+    每次經過快取都會以 set_cache_status 記錄命中與資料年齡，供 API 回應標示新鮮度。
+    快取值會被多個請求共用，呼叫端不可修改回傳的資料。
+    
+    Args:
+        ttl_setting: Settings 中該方法快取秒數 (soft TTL) 的欄位名稱 (0 表示不快取)
+        hard_ttl_setting: Settings 中該方法 hard TTL 的欄位名稱 (0 或不提供表示不使用過時資料)
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            ttl = getattr(self.settings, ttl_setting)
+            use_cache = self.cache is not None and ttl > 0
+            coalesce = self.settings.saf_singleflight_enabled
+            if not use_cache and not coalesce:
+                return await func(self, *args, **kwargs)
+            
+            hard_ttl = getattr(self.settings, hard_ttl_setting) if hard_ttl_setting else 0
+            grace = max(hard_ttl - ttl, 0)
+            
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self")
+            key = make_cache_key(func.__name__, arguments)
+            
+            async def fetch():
+                value = await func(self, *args, **kwargs)
+                if use_cache:
+                    self.cache.set(key, value, ttl, grace=grace)
+                return value
+            
+            def load():
+                if coalesce:
+                    return _inflight_calls.do(key, fetch)
+                return fetch()
+            
+            if use_cache:
+                entry = self.cache.get(key)
+                if entry is not None:
+                    stale = entry.is_stale()
+                    set_cache_status(hit=True, age=entry.age(), stale=stale)
+                    if stale:
+                        self.logger.debug(f"Cache stale, refreshing in background: {func.__name__}")
+                        self._schedule_refresh(func.__name__, load)
+                    else:
+                        self.logger.debug(f"Cache hit: {func.__name__}")
+                    return entry.value
+            
+            value = await load()
+            if use_cache:
+                set_cache_status(hit=False)
+            return value
+        
+        return wrapper
+    
+    return decorator
 
 
 class SAFClient(LoggerMixin):
@@ -26,26 +117,74 @@ class SAFClient(LoggerMixin):
         >>> projects = await client.get_all_projects(auth["id"], auth["name"])
     """
     
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        pool: Optional[SAFConnectionPool] = None,
+        cache: Optional[TTLCache] = None
+    ):
         """
         初始化 SAF Client
         
         Args:
             settings: 設定物件，如果不提供則使用預設設定
+            pool: 共用連線池，如果不提供則每次呼叫建立一次性的連線
+            cache: 共用回應快取，如果不提供則讀取呼叫一律直接查詢 SAF
         """
         self.settings = settings or get_settings()
+        self.pool = pool
+        self.cache = cache
         
         # httpx 客戶端設定 - 繞過 proxy
-        self._client_kwargs = {
-            "trust_env": False,  # 不使用系統 proxy
-            "timeout": 30.0,
-            "verify": True,  # SSL 驗證
-        }
+        self._client_kwargs = dict(BASE_CLIENT_KWARGS)
     
-    def _get_client(self) -> httpx.AsyncClient:
-        """取得 httpx 非同步客戶端"""
+    def _get_client(self, target: str = API_TARGET):
+        """
+        取得 httpx 非同步客戶端
+        
+        有共用連線池時借用該主機的長期連線 (離開 async with 不會關閉)，
+        否則建立一次性的客戶端
+        
+        Args:
+            target: 上游目標 ("login" 或 "api")
+        """
+        if self.pool is not None:
+            return self.pool.borrow(target)
         return httpx.AsyncClient(**self._client_kwargs)
     
+    def _schedule_refresh(self, name: str, load: Callable[[], Awaitable[Any]]) -> None:
+        """
+        在背景更新過時的快取項目
+        
+        更新經過 single-flight，同一 key 同時只會有一個背景更新；
+        失敗時只記錄警告，保留原本的過時項目直到 hard TTL
+        
+        Args:
+            name: 方法名稱 (用於日誌)
+            load: 執行上游查詢並寫入快取的函數
+        """
+        async def refresh():
+            try:
+                await load()
+            except Exception as e:
+                self.logger.warning(f"Background refresh of {name} failed: {e}")
+        
+        task = asyncio.ensure_future(refresh())
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
+    
+    async def _post(self, target: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        對 SAF 發送 POST 請求
+        
+        Args:
+            target: 上游目標 ("login" 或 "api")
+            url: 完整 URL
+            **kwargs: 傳給 httpx 的參數 (headers, json, data...)
+        """
+        async with self._get_client(target) as client:
+            return await client.post(url, **kwargs)
+    
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def login(self, username: str, password: str) -> Dict[str, Any]:
@@ -67,27 +206,27 @@ class SAFClient(LoggerMixin):
         self.logger.debug(f"Logging in to SAF: {url}")
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    data={
-                        "username": username,
-                        "password": password,
-                    },
+            response = await self._post(
+                LOGIN_TARGET,
+                url,
+                data={
+                    "username": username,
+                    "password": password,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                self.logger.info(f"Login successful for user: {data.get('name')}")
+                return data
+            elif response.status_code == 401:
+                raise SAFAuthenticationError("Invalid username or password")
+            else:
+                raise SAFAPIError(
+                    f"Login failed with status code: {response.status_code}",
+                    status_code=response.status_code
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    self.logger.info(f"Login successful for user: {data.get('name')}")
-                    return data
-                elif response.status_code == 401:
-                    raise SAFAuthenticationError("Invalid username or password")
-                else:
-                    raise SAFAPIError(
-                        f"Login failed with status code: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -95,6 +234,7 @@ class SAFClient(LoggerMixin):
             self.logger.error(f"Timeout error: {e}")
             raise SAFConnectionError(f"Connection timeout: {e}")
     
+    @_read_through("saf_cache_ttl_projects")
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def get_all_projects(
@@ -131,27 +271,27 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "page": page,
-                        "size": size,
-                    },
+            response = await self._post(
+                API_TARGET,
+                url,
+                headers=headers,
+                json={
+                    "page": page,
+                    "size": size,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                total = data.get("total", 0)
+                self.logger.info(f"Retrieved {total} projects")
+                return data
+            else:
+                raise SAFAPIError(
+                    f"Failed to get projects: {response.status_code}",
+                    status_code=response.status_code
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    total = data.get("total", 0)
-                    self.logger.info(f"Retrieved {total} projects")
-                    return data
-                else:
-                    raise SAFAPIError(
-                        f"Failed to get projects: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -180,6 +320,61 @@ class SAFClient(LoggerMixin):
             self.settings.saf_password
         )
 
+    async def iter_all_projects(
+        self,
+        user_id: int,
+        username: str,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        自動分頁取得所有專案
+        
+        先查詢第 1 頁取得 total，再以 saf_pagination_concurrency 限制的並行數
+        同時查詢其餘頁面；各頁依頁碼順序產出，呼叫端可邊收邊處理。
+        提早結束迭代時會取消尚未完成的查詢。
+        
+        Args:
+            user_id: 使用者 ID (從登入取得)
+            username: 使用者名稱 (從登入取得)
+            page_size: 每頁筆數，預設使用 saf_pagination_page_size
+            
+        Yields:
+            各頁的 SAF 回應 (與 get_all_projects 格式相同)
+            
+        Raises:
+            SAFAPIError: API 呼叫失敗
+            SAFConnectionError: 連線失敗
+        
+        Example:
+            >>> async for page in client.iter_all_projects(user_id, username):
+            ...     for project in page.get("data", []):
+            ...         print(project["projectName"])
+        """
+        size = page_size or self.settings.saf_pagination_page_size
+        first_page = await self.get_all_projects(user_id, username, page=1, size=size)
+        
+        total_pages = math.ceil(first_page.get("total", 0) / size)
+        semaphore = asyncio.Semaphore(self.settings.saf_pagination_concurrency)
+        
+        async def fetch_page(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_all_projects(user_id, username, page=page, size=size)
+        
+        # 第 1 頁交給呼叫端處理的同時，其餘頁面已開始查詢
+        tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, total_pages + 1)]
+        if tasks:
+            self.logger.debug(f"Fetching {len(tasks)} more project pages (size={size})")
+        
+        try:
+            yield first_page
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            # 取回所有結果，避免未處理的例外警告
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def search_test_status(
@@ -226,29 +421,29 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    f"{url}?page={page}&size={size}",
-                    headers=headers,
-                    json={
-                        "userId": user_id,
-                        "q": query,
-                        "sort": sort or {},
-                    },
+            response = await self._post(
+                API_TARGET,
+                f"{url}?page={page}&size={size}",
+                headers=headers,
+                json={
+                    "userId": user_id,
+                    "q": query,
+                    "sort": sort or {},
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                items_count = len(data.get("items", []))
+                total = data.get("total", 0)
+                self.logger.info(f"Retrieved {items_count} test status items (total: {total})")
+                return data
+            else:
+                raise SAFAPIError(
+                    f"Failed to search test status: {response.status_code}",
+                    status_code=response.status_code
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    items_count = len(data.get("items", []))
-                    total = data.get("total", 0)
-                    self.logger.info(f"Retrieved {items_count} test status items (total: {total})")
-                    return data
-                else:
-                    raise SAFAPIError(
-                        f"Failed to search test status: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -256,6 +451,62 @@ class SAFClient(LoggerMixin):
             self.logger.error(f"Timeout error: {e}")
             raise SAFConnectionError(f"Connection timeout: {e}")
 
+    async def iter_test_status(
+        self,
+        user_id: int,
+        username: str,
+        query: str,
+        sort: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐頁取得所有符合條件的測試狀態
+        
+        產出目前頁面的同時預先查詢下一頁 (read-ahead)，
+        記憶體中最多只保留兩頁資料，適合匯出大量結果。
+        提早結束迭代時會取消預先查詢中的頁面。
+        
+        Args:
+            user_id: 使用者 ID (從登入取得)
+            username: 使用者名稱 (從登入取得)
+            query: 查詢條件，格式: 欄位名 = "值"
+            sort: 排序條件
+            page_size: 每頁筆數，預設使用 saf_pagination_page_size
+            
+        Yields:
+            各頁的 SAF 回應 (與 search_test_status 格式相同)
+            
+        Raises:
+            SAFAPIError: API 呼叫失敗
+            SAFConnectionError: 連線失敗
+        """
+        size = page_size or self.settings.saf_pagination_page_size
+        
+        def fetch_page(page: int) -> "asyncio.Future[Dict[str, Any]]":
+            return asyncio.ensure_future(self.search_test_status(
+                user_id, username, query, page=page, size=size, sort=sort
+            ))
+        
+        page = 1
+        pending: Optional["asyncio.Future[Dict[str, Any]]"] = fetch_page(page)
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                
+                total_pages = math.ceil(data.get("total", 0) / size)
+                if data.get("items") and page < total_pages:
+                    # 呼叫端處理本頁時，下一頁已在查詢中
+                    page += 1
+                    pending = fetch_page(page)
+                
+                yield data
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+    
+    @_read_through("saf_cache_ttl_firmwares")
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def get_fws_by_project_id(
@@ -296,32 +547,32 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "projectId": project_id,
-                    },
+            response = await self._post(
+                API_TARGET,
+                url,
+                headers=headers,
+                json={
+                    "projectId": project_id,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                fws_count = len(data.get("fws", []))
+                self.logger.info(f"Retrieved {fws_count} firmwares for project: {project_id}")
+                return data
+            elif response.status_code == 404:
+                raise SAFAPIError(
+                    f"Project not found: {project_id}",
+                    status_code=404,
+                    error_code="PROJECT_NOT_FOUND"
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    fws_count = len(data.get("fws", []))
-                    self.logger.info(f"Retrieved {fws_count} firmwares for project: {project_id}")
-                    return data
-                elif response.status_code == 404:
-                    raise SAFAPIError(
-                        f"Project not found: {project_id}",
-                        status_code=404,
-                        error_code="PROJECT_NOT_FOUND"
-                    )
-                else:
-                    raise SAFAPIError(
-                        f"Failed to get FWs by project ID: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            else:
+                raise SAFAPIError(
+                    f"Failed to get FWs by project ID: {response.status_code}",
+                    status_code=response.status_code
+                )
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -329,6 +580,7 @@ class SAFClient(LoggerMixin):
             self.logger.error(f"Timeout error: {e}")
             raise SAFConnectionError(f"Connection timeout: {e}")
 
+    @_read_through("saf_cache_ttl_test_summary", "saf_cache_hard_ttl_test_summary")
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def get_project_test_summary(
@@ -363,32 +615,32 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "projectId": "",
-                        "projectUid": project_uid,
-                    },
+            response = await self._post(
+                API_TARGET,
+                url,
+                headers=headers,
+                json={
+                    "projectId": "",
+                    "projectUid": project_uid,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                self.logger.info(f"Retrieved test summary for project: {project_uid}")
+                return data
+            elif response.status_code == 404:
+                raise SAFAPIError(
+                    f"Project not found: {project_uid}",
+                    status_code=404,
+                    error_code="PROJECT_NOT_FOUND"
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    self.logger.info(f"Retrieved test summary for project: {project_uid}")
-                    return data
-                elif response.status_code == 404:
-                    raise SAFAPIError(
-                        f"Project not found: {project_uid}",
-                        status_code=404,
-                        error_code="PROJECT_NOT_FOUND"
-                    )
-                else:
-                    raise SAFAPIError(
-                        f"Failed to get project test summary: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            else:
+                raise SAFAPIError(
+                    f"Failed to get project test summary: {response.status_code}",
+                    status_code=response.status_code
+                )
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -396,6 +648,7 @@ class SAFClient(LoggerMixin):
             self.logger.error(f"Timeout error: {e}")
             raise SAFConnectionError(f"Connection timeout: {e}")
 
+    @_read_through("saf_cache_ttl_known_issues")
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def list_known_issues(
@@ -434,28 +687,28 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "projectId": project_id or [],
-                        "rootId": root_id or [],
-                        "showDisable": show_disable,
-                    },
+            response = await self._post(
+                API_TARGET,
+                url,
+                headers=headers,
+                json={
+                    "projectId": project_id or [],
+                    "rootId": root_id or [],
+                    "showDisable": show_disable,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                items_count = len(data.get("items", []))
+                self.logger.info(f"Retrieved {items_count} known issues")
+                return data
+            else:
+                raise SAFAPIError(
+                    f"Failed to get known issues: {response.status_code}",
+                    status_code=response.status_code
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    items_count = len(data.get("items", []))
-                    self.logger.info(f"Retrieved {items_count} known issues")
-                    return data
-                else:
-                    raise SAFAPIError(
-                        f"Failed to get known issues: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -463,6 +716,7 @@ class SAFClient(LoggerMixin):
             self.logger.error(f"Timeout error: {e}")
             raise SAFConnectionError(f"Connection timeout: {e}")
 
+    @_read_through("saf_cache_ttl_dashboard")
     @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
     @log_execution
     async def get_project_dashboard(
@@ -497,31 +751,31 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "projectId": project_id,
-                    },
+            response = await self._post(
+                API_TARGET,
+                url,
+                headers=headers,
+                json={
+                    "projectId": project_id,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                self.logger.info(f"Retrieved dashboard for project: {project_id}")
+                return data
+            elif response.status_code == 404:
+                raise SAFAPIError(
+                    f"Project not found: {project_id}",
+                    status_code=404,
+                    error_code="PROJECT_NOT_FOUND"
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    self.logger.info(f"Retrieved dashboard for project: {project_id}")
-                    return data
-                elif response.status_code == 404:
-                    raise SAFAPIError(
-                        f"Project not found: {project_id}",
-                        status_code=404,
-                        error_code="PROJECT_NOT_FOUND"
-                    )
-                else:
-                    raise SAFAPIError(
-                        f"Failed to get project dashboard: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            else:
+                raise SAFAPIError(
+                    f"Failed to get project dashboard: {response.status_code}",
+                    status_code=response.status_code
+                )
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
@@ -529,8 +783,7 @@ class SAFClient(LoggerMixin):
             self.logger.error(f"Timeout error: {e}")
             raise SAFConnectionError(f"Connection timeout: {e}")
 
-    @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
-    @log_execution
+    @_read_through("saf_cache_ttl_test_jobs", "saf_cache_hard_ttl_test_jobs")
     async def list_all_test_jobs(
         self,
         user_id: int,
@@ -572,6 +825,48 @@ class SAFClient(LoggerMixin):
             SAFAPIError: API 呼叫失敗
             SAFConnectionError: 連線失敗
         """
+        return await self._fetch_test_jobs(user_id, username, project_ids, test_tool_key)
+    
+    @_read_through("saf_cache_ttl_test_jobs", "saf_cache_hard_ttl_test_jobs")
+    async def get_test_job_table(
+        self,
+        user_id: int,
+        username: str,
+        project_ids: List[str],
+        test_tool_key: str = ""
+    ) -> JobTable:
+        """
+        取得專案的所有測試工作 (欄式表)
+        
+        與 list_all_test_jobs 查詢相同的資料，但快取的是字典編碼的欄式表，
+        原始 dict 在建表後即釋放，適合數十萬筆的大型專案
+        
+        Args:
+            user_id: 使用者 ID (從登入取得)
+            username: 使用者名稱 (從登入取得)
+            project_ids: 專案 ID 列表
+            test_tool_key: 測試工具 Key (可選)
+            
+        Returns:
+            測試工作欄式表 (呼叫端不可修改)
+            
+        Raises:
+            SAFAPIError: API 呼叫失敗
+            SAFConnectionError: 連線失敗
+        """
+        data = await self._fetch_test_jobs(user_id, username, project_ids, test_tool_key)
+        return await asyncio.to_thread(JobTable.from_jobs, data.get("testJobs", []))
+    
+    @retry(max_attempts=3, delay=1.0, exceptions=(httpx.ConnectError, httpx.TimeoutException))
+    @log_execution
+    async def _fetch_test_jobs(
+        self,
+        user_id: int,
+        username: str,
+        project_ids: List[str],
+        test_tool_key: str = ""
+    ) -> Dict[str, Any]:
+        """呼叫 ListAllTestJobs (不經過快取)"""
         url = f"{self.settings.saf_api_base_url}/record/ListAllTestJobs"
         self.logger.debug(f"Getting all test jobs from: {url}")
         
@@ -583,27 +878,27 @@ class SAFClient(LoggerMixin):
         }
         
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "projectIds": project_ids,
-                        "testToolKey": test_tool_key,
-                    },
+            response = await self._post(
+                API_TARGET,
+                url,
+                headers=headers,
+                json={
+                    "projectIds": project_ids,
+                    "testToolKey": test_tool_key,
+                },
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                jobs_count = len(data.get("testJobs", []))
+                self.logger.info(f"Retrieved {jobs_count} test jobs")
+                return data
+            else:
+                raise SAFAPIError(
+                    f"Failed to get test jobs: {response.status_code}",
+                    status_code=response.status_code
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    jobs_count = len(data.get("testJobs", []))
-                    self.logger.info(f"Retrieved {jobs_count} test jobs")
-                    return data
-                else:
-                    raise SAFAPIError(
-                        f"Failed to get test jobs: {response.status_code}",
-                        status_code=response.status_code
-                    )
-                    
+            
         except httpx.ConnectError as e:
             self.logger.error(f"Connection error: {e}")
             raise SAFConnectionError(f"Failed to connect to SAF: {e}")
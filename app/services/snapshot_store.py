@@ -0,0 +1,668 @@
+"""
+SAF 本地快照
+
+定期將 SAF 的專案、Firmware、Known Issues、測試工作與測試狀態同步到內嵌的 SQLite 資料庫，
+讓路由可以 `source=snapshot` 直接以本地資料回應；測試狀態另建立記憶體內的倒排索引
+
+同步為增量：有 updatedAt 的資料以 updatedAt 判斷是否變更，其餘以內容雜湊比對，
+只寫入新增、變更的列並刪除上游已不存在的列
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import Settings
+from app.services.cache_warmer import is_active_project
+from app.services.connection_pool import get_connection_pool
+from app.services.saf_client import SAFClient
+from app.services.test_status_index import TestStatusIndex, get_test_status_index
+from lib.exceptions import SAFAPIError, SAFConnectionError
+from lib.logger import LoggerMixin, get_logger
+from lib.utils import timestamp_to_datetime
+
+logger = get_logger(__name__)
+
+# 資料集名稱
+PROJECTS = "projects"
+FIRMWARES = "firmwares"
+KNOWN_ISSUES = "known_issues"
+TEST_JOBS = "test_jobs"
+TEST_STATUS = "test_status"
+
+# 不分範圍的資料集使用的 scope
+ALL_SCOPE = "*"
+
+# 各資料集額外的索引欄位: {資料集: [(欄位名稱, SQL 型別, 取值函數), ...]}
+_EXTRA_COLUMNS: Dict[str, List[Tuple[str, str, Callable[[Dict[str, Any]], Any]]]] = {
+    PROJECTS: [
+        ("project_id", "TEXT", lambda item: item.get("projectId")),
+        ("customer", "TEXT", lambda item: item.get("customer")),
+        ("controller", "TEXT", lambda item: item.get("controller")),
+    ],
+    FIRMWARES: [
+        ("fw", "TEXT", lambda item: item.get("fw")),
+    ],
+    KNOWN_ISSUES: [
+        ("project_id", "TEXT", lambda item: item.get("projectId")),
+        ("root_id", "TEXT", lambda item: item.get("rootId")),
+        ("is_enable", "INTEGER", lambda item: int(bool(item.get("isEnable", True)))),
+    ],
+    TEST_JOBS: [
+        ("fw", "TEXT", lambda item: item.get("fw")),
+        ("test_status", "TEXT", lambda item: item.get("testStatus")),
+    ],
+    # 測試狀態的查詢由記憶體內的倒排索引負責，不需額外欄位
+    TEST_STATUS: [],
+}
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_projects_project_id ON projects (project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_customer ON projects (customer)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_controller ON projects (controller)",
+    "CREATE INDEX IF NOT EXISTS idx_firmwares_key ON firmwares (key)",
+    "CREATE INDEX IF NOT EXISTS idx_known_issues_project_id ON known_issues (project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_known_issues_root_id ON known_issues (root_id)",
+    "CREATE INDEX IF NOT EXISTS idx_test_jobs_fw ON test_jobs (scope, fw)",
+    "CREATE INDEX IF NOT EXISTS idx_test_jobs_status ON test_jobs (test_status)",
+]
+
+
+def _content_hash(item: Dict[str, Any]) -> str:
+    """計算資料內容的雜湊 (dict 依 key 排序)"""
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _updated_at(item: Dict[str, Any]) -> Optional[int]:
+    """
+    取得 SAF updatedAt 的 epoch 秒數 (沒有時返回 None)
+
+    含 children 的資料取自身與所有 children 中最新的時間，children 變更也會被視為變更
+    """
+    updated = timestamp_to_datetime(item.get("updatedAt"))
+    latest = int(updated.timestamp()) if updated else None
+
+    for child in item.get("children") or []:
+        child_updated = _updated_at(child)
+        if child_updated is not None and (latest is None or child_updated > latest):
+            latest = child_updated
+
+    return latest
+
+
+class SnapshotStore:
+    """
+    SQLite 快照儲存
+
+    每個資料集一張表，共同欄位為 scope (同步範圍，例如 project_id)、key、position (上游順序)、
+    updated_at、content_hash 與 payload (SAF 原始 JSON)，另加各資料集的索引欄位。
+    所有方法皆為同步呼叫，async 程式碼請透過 asyncio.to_thread 使用。
+
+    Example:
+        >>> store = SnapshotStore("data/snapshot.db")
+        >>> store.sync_rows("projects", "*", items, key=lambda item: item["projectUid"])
+        >>> store.list_projects(page=1, size=50)
+    """
+
+    def __init__(self, path: str):
+        """
+        開啟 (或建立) 快照資料庫
+
+        Args:
+            path: SQLite 檔案路徑 (":memory:" 表示記憶體資料庫)
+        """
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """建立資料表與索引"""
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for dataset, extra_columns in _EXTRA_COLUMNS.items():
+                extra = "".join(f", {name} {sql_type}" for name, sql_type, _ in extra_columns)
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {dataset} ("
+                    f"scope TEXT NOT NULL, key TEXT NOT NULL, position INTEGER NOT NULL, "
+                    f"updated_at INTEGER, content_hash TEXT NOT NULL, payload TEXT NOT NULL{extra}, "
+                    f"PRIMARY KEY (scope, key))"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "dataset TEXT NOT NULL, scope TEXT NOT NULL, watermark INTEGER, "
+                "row_count INTEGER NOT NULL, synced_at REAL NOT NULL, "
+                "PRIMARY KEY (dataset, scope))"
+            )
+            for statement in _INDEXES:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        """關閉資料庫連線"""
+        with self._lock:
+            self._conn.close()
+
+    # ========== 同步 ==========
+
+    def sync_rows(
+        self,
+        dataset: str,
+        scope: str,
+        items: Sequence[Dict[str, Any]],
+        key: Callable[[Dict[str, Any]], str]
+    ) -> Dict[str, int]:
+        """
+        以上游的完整結果增量更新一個同步範圍
+
+        - 有 updatedAt 且不比已儲存的新：視為未變更 (不計算雜湊)
+        - 其餘以內容雜湊比對，只寫入新增或變更的列
+        - 已儲存但不在 items 中的列會被刪除
+
+        Args:
+            dataset: 資料集名稱
+            scope: 同步範圍 (例如 project_id；不分範圍時為 ALL_SCOPE)
+            items: 該範圍在上游的所有資料 (依上游順序)
+            key: 取得每筆資料唯一 key 的函數
+
+        Returns:
+            {"inserted", "updated", "deleted", "unchanged"} 列數
+        """
+        extra_columns = _EXTRA_COLUMNS[dataset]
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        watermark: Optional[int] = None
+
+        with self._lock, self._conn:
+            existing = {
+                row["key"]: row for row in self._conn.execute(
+                    f"SELECT key, position, updated_at, content_hash FROM {dataset} WHERE scope = ?",
+                    (scope,)
+                )
+            }
+
+            upserts = []
+            reorders = []
+            seen = set()
+            for position, item in enumerate(items):
+                item_key = str(key(item))
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+
+                updated_at = _updated_at(item)
+                if updated_at is not None:
+                    watermark = max(watermark or updated_at, updated_at)
+
+                row = existing.get(item_key)
+                if row is not None and updated_at is not None and row["updated_at"] is not None:
+                    # 有 updatedAt 時不需計算雜湊
+                    changed = updated_at > row["updated_at"]
+                    content_hash = _content_hash(item) if changed else row["content_hash"]
+                else:
+                    content_hash = _content_hash(item)
+                    changed = row is None or row["content_hash"] != content_hash
+
+                if not changed:
+                    counts["unchanged"] += 1
+                    if row["position"] != position:
+                        reorders.append((position, scope, item_key))
+                    continue
+
+                counts["updated" if row is not None else "inserted"] += 1
+                upserts.append((
+                    scope, item_key, position, updated_at, content_hash,
+                    json.dumps(item, ensure_ascii=False),
+                    *(extract(item) for _, _, extract in extra_columns),
+                ))
+
+            columns = ["scope", "key", "position", "updated_at", "content_hash", "payload"]
+            columns += [name for name, _, _ in extra_columns]
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {dataset} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                upserts
+            )
+            self._conn.executemany(
+                f"UPDATE {dataset} SET position = ? WHERE scope = ? AND key = ?",
+                reorders
+            )
+
+            deleted = [(scope, item_key) for item_key in existing if item_key not in seen]
+            self._conn.executemany(f"DELETE FROM {dataset} WHERE scope = ? AND key = ?", deleted)
+            counts["deleted"] = len(deleted)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (dataset, scope, watermark, row_count, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (dataset, scope, watermark, len(seen), time.time())
+            )
+
+        return counts
+
+    def synced_at(self, dataset: str, scope: str = ALL_SCOPE) -> Optional[float]:
+        """
+        取得同步範圍最後一次同步的時間
+
+        Returns:
+            epoch 秒數；從未同步時返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM sync_state WHERE dataset = ? AND scope = ?",
+                (dataset, scope)
+            ).fetchone()
+        return row["synced_at"] if row else None
+
+    def oldest_sync(self, dataset: str, scopes: Sequence[str]) -> Optional[float]:
+        """
+        取得多個同步範圍中最舊的同步時間
+
+        Returns:
+            epoch 秒數；任一範圍從未同步時返回 None
+        """
+        synced = [self.synced_at(dataset, scope) for scope in scopes]
+        if not synced or any(value is None for value in synced):
+            return None
+        return min(synced)
+
+    def retain_scopes(self, dataset: str, scopes: Sequence[str]) -> int:
+        """
+        刪除不在 scopes 中的同步範圍 (例如已停用的專案)
+
+        Returns:
+            刪除的列數
+        """
+        keep = set(scopes)
+        with self._lock, self._conn:
+            stale = [
+                row["scope"] for row in self._conn.execute(
+                    "SELECT scope FROM sync_state WHERE dataset = ?", (dataset,)
+                ) if row["scope"] not in keep
+            ]
+            deleted = 0
+            for scope in stale:
+                deleted += self._conn.execute(f"DELETE FROM {dataset} WHERE scope = ?", (scope,)).rowcount
+                self._conn.execute("DELETE FROM sync_state WHERE dataset = ? AND scope = ?", (dataset, scope))
+        return deleted
+
+    def _select_payloads(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        """執行查詢並解析 payload 欄位"""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    # ========== 查詢 ==========
+
+    def list_projects(self, page: int = 1, size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        取得專案列表 (與 get_all_projects 格式相同)
+
+        Args:
+            page: 頁碼
+            size: 每頁筆數，None 表示全部
+
+        Returns:
+            {"page", "size", "total", "data"}；從未同步時返回 None
+        """
+        if self.synced_at(PROJECTS) is None:
+            return None
+
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM projects WHERE scope = ?", (ALL_SCOPE,)
+            ).fetchone()[0]
+
+        if size is None:
+            data = self._select_payloads(
+                "SELECT payload FROM projects WHERE scope = ? ORDER BY position", (ALL_SCOPE,)
+            )
+        else:
+            data = self._select_payloads(
+                "SELECT payload FROM projects WHERE scope = ? ORDER BY position LIMIT ? OFFSET ?",
+                (ALL_SCOPE, size, (page - 1) * size)
+            )
+
+        return {"page": page, "size": size if size is not None else len(data), "total": total, "data": data}
+
+    def get_firmwares(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """
+        取得專案的 Firmware 列表 (與 get_fws_by_project_id 格式相同)
+
+        Returns:
+            {"fws": [...]}；該專案從未同步時返回 None
+        """
+        if self.synced_at(FIRMWARES, project_id) is None:
+            return None
+        fws = self._select_payloads(
+            "SELECT payload FROM firmwares WHERE scope = ? ORDER BY position", (project_id,)
+        )
+        return {"fws": fws}
+
+    def list_known_issues(
+        self,
+        project_id: Optional[List[str]] = None,
+        root_id: Optional[List[str]] = None,
+        show_disable: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        取得 Known Issues 列表 (與 list_known_issues 格式相同)
+
+        Returns:
+            {"items": [...]}；從未同步時返回 None
+        """
+        if self.synced_at(KNOWN_ISSUES) is None:
+            return None
+
+        conditions = ["scope = ?"]
+        params: List[Any] = [ALL_SCOPE]
+        if project_id:
+            conditions.append(f"project_id IN ({', '.join('?' for _ in project_id)})")
+            params.extend(project_id)
+        if root_id:
+            conditions.append(f"root_id IN ({', '.join('?' for _ in root_id)})")
+            params.extend(root_id)
+        if not show_disable:
+            conditions.append("is_enable = 1")
+
+        items = self._select_payloads(
+            f"SELECT payload FROM known_issues WHERE {' AND '.join(conditions)} ORDER BY position",
+            params
+        )
+        return {"items": items}
+
+    def list_test_jobs(
+        self,
+        project_ids: List[str],
+        test_tool_key: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        取得專案的測試工作列表 (與 list_all_test_jobs 格式相同)
+
+        Returns:
+            {"testJobs": [...]}；任一專案從未同步時返回 None
+        """
+        if self.oldest_sync(TEST_JOBS, project_ids) is None:
+            return None
+
+        jobs: List[Dict[str, Any]] = []
+        for project_id in project_ids:
+            jobs.extend(self._select_payloads(
+                "SELECT payload FROM test_jobs WHERE scope = ? ORDER BY position", (project_id,)
+            ))
+
+        if test_tool_key:
+            jobs = [job for job in jobs if test_tool_key in (job.get("testToolKeyList") or [])]
+
+        return {"testJobs": jobs}
+
+    def all_payloads(self, dataset: str) -> List[Dict[str, Any]]:
+        """取得資料集的所有資料 (依同步範圍與上游順序)"""
+        return self._select_payloads(f"SELECT payload FROM {dataset} ORDER BY scope, position", ())
+
+    def stats(self) -> Dict[str, Any]:
+        """取得快照統計資訊 (各資料集的列數、同步範圍數與最後同步時間)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dataset, COUNT(*) AS scopes, SUM(row_count) AS row_count, "
+                "MAX(synced_at) AS synced_at FROM sync_state GROUP BY dataset"
+            ).fetchall()
+
+        return {
+            row["dataset"]: {
+                "scopes": row["scopes"],
+                "rows": row["row_count"],
+                "age_seconds": round(time.time() - row["synced_at"], 1),
+            }
+            for row in rows
+        }
+
+
+class SnapshotSyncer(LoggerMixin):
+    """
+    快照同步背景工作
+
+    每個週期以服務帳號 (login_with_config) 登入：
+    1. 自動分頁取得所有專案 (listAllProjectsDetails)
+    2. 取得所有 Known Issues (ListAllKnownIssue)
+    3. 對每個啟用中的專案取得 Firmware 列表與測試工作 (ListFWsByProjectId / ListAllTestJobs)
+    4. 依專案名稱取得所有測試狀態 (status) 並重建倒排索引 (saf_snapshot_test_status)
+
+    同步使用不經過回應快取的 SAFClient，確保寫入的是上游最新資料。
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        client: SAFClient,
+        store: SnapshotStore,
+        index: Optional[TestStatusIndex] = None
+    ):
+        """
+        初始化同步工作
+
+        Args:
+            settings: 設定物件
+            client: 不使用回應快取的 SAF Client
+            store: 快照儲存
+            index: 測試狀態倒排索引，預設使用應用程式層級的索引
+        """
+        self.settings = settings
+        self.client = client
+        self.store = store
+        self.index = index if index is not None else get_test_status_index()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stats: Dict[str, Any] = {"cycles": 0, "failed": 0, "last_cycle_seconds": None}
+
+    @property
+    def is_running(self) -> bool:
+        """背景工作是否執行中"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """啟動背景同步工作"""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        self.logger.info(f"Snapshot sync started (interval={self.settings.saf_snapshot_sync_interval}s)")
+
+    async def stop(self) -> None:
+        """停止背景同步工作"""
+        if self._task is None:
+            return
+
+        task, self._task = self._task, None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self.logger.info("Snapshot sync stopped")
+
+    async def _run(self) -> None:
+        """依排程重複同步"""
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["failed"] += 1
+                self.logger.warning(f"Snapshot sync cycle failed: {e}")
+            await asyncio.sleep(self.settings.saf_snapshot_sync_interval)
+
+    async def _sync(
+        self,
+        dataset: str,
+        scope: str,
+        items: List[Dict[str, Any]],
+        key: Callable[[Dict[str, Any]], str]
+    ) -> Dict[str, int]:
+        """在執行緒中寫入 SQLite"""
+        return await asyncio.to_thread(self.store.sync_rows, dataset, scope, items, key)
+
+    async def _sync_project(self, user_id: int, username: str, project_id: str) -> None:
+        """同步單一專案的 Firmware 列表與測試工作 (失敗只記錄，不中斷週期)"""
+        try:
+            fws = await self.client.get_fws_by_project_id(user_id, username, project_id=project_id)
+            await self._sync(
+                FIRMWARES, project_id, fws.get("fws", []),
+                key=lambda fw: fw.get("projectUid") or f"{fw.get('fw')}:{fw.get('subVersion')}"
+            )
+
+            jobs = await self.client.list_all_test_jobs(user_id, username, project_ids=[project_id])
+            await self._sync(TEST_JOBS, project_id, jobs.get("testJobs", []), key=lambda job: job["testJobId"])
+        except (SAFAPIError, SAFConnectionError) as e:
+            self.logger.debug(f"Failed to sync project {project_id}: {e}")
+
+    async def _sync_test_status(self, user_id: int, username: str, project_name: str) -> None:
+        """同步單一專案名稱的所有測試狀態 (失敗只記錄，不中斷週期)"""
+        escaped = project_name.replace('"', '\\"')
+        items: List[Dict[str, Any]] = []
+        try:
+            async for page in self.client.iter_test_status(user_id, username, query=f'projectName = "{escaped}"'):
+                items.extend(page.get("items", []))
+            await self._sync(TEST_STATUS, project_name, items, key=lambda item: item["testJobId"])
+        except (SAFAPIError, SAFConnectionError) as e:
+            self.logger.debug(f"Failed to sync test status of {project_name}: {e}")
+
+    async def rebuild_index(self) -> int:
+        """由快照中的測試狀態重建倒排索引 (在執行緒中進行)"""
+        items = await asyncio.to_thread(self.store.all_payloads, TEST_STATUS)
+        return await asyncio.to_thread(self.index.rebuild, items)
+
+    async def run_once(self) -> Dict[str, Dict[str, int]]:
+        """
+        執行一次同步週期
+
+        Returns:
+            專案與 Known Issues 的變更列數
+        """
+        started = time.monotonic()
+        auth = await self.client.login_with_config()
+        user_id, username = auth["id"], auth["name"]
+
+        projects: List[Dict[str, Any]] = []
+        async for page in self.client.iter_all_projects(user_id, username):
+            projects.extend(page.get("data", []))
+
+        changes = {
+            PROJECTS: await self._sync(
+                PROJECTS, ALL_SCOPE, projects,
+                key=lambda project: project.get("projectUid") or project.get("key")
+            )
+        }
+
+        issues = await self.client.list_known_issues(user_id, username)
+        changes[KNOWN_ISSUES] = await self._sync(
+            KNOWN_ISSUES, ALL_SCOPE, issues.get("items", []), key=lambda issue: issue["id"]
+        )
+
+        active = [project for project in projects if is_active_project(project)]
+        project_ids = list(dict.fromkeys(
+            project["projectId"] for project in active if project.get("projectId")
+        ))
+        project_names = list(dict.fromkeys(
+            project["projectName"] for project in active if project.get("projectName")
+        )) if self.settings.saf_snapshot_test_status else []
+        semaphore = asyncio.Semaphore(self.settings.saf_snapshot_sync_concurrency)
+
+        async def sync_one(sync: Callable[..., Awaitable[None]], scope: str) -> None:
+            async with semaphore:
+                await sync(user_id, username, scope)
+
+        await asyncio.gather(
+            *(sync_one(self._sync_project, project_id) for project_id in project_ids),
+            *(sync_one(self._sync_test_status, name) for name in project_names),
+        )
+
+        # 移除已停用專案的資料
+        for dataset, scopes in ((FIRMWARES, project_ids), (TEST_JOBS, project_ids), (TEST_STATUS, project_names)):
+            await asyncio.to_thread(self.store.retain_scopes, dataset, scopes)
+        if self.settings.saf_snapshot_test_status:
+            await self.rebuild_index()
+
+        elapsed = time.monotonic() - started
+        self._stats["cycles"] += 1
+        self._stats["last_cycle_seconds"] = round(elapsed, 3)
+        self.logger.info(
+            f"Snapshot sync finished in {elapsed:.1f}s: projects={changes[PROJECTS]}, "
+            f"known_issues={changes[KNOWN_ISSUES]}, project_scopes={len(project_ids)}, "
+            f"test_status_rows={len(self.index)}"
+        )
+        return changes
+
+    def stats(self) -> Dict[str, Any]:
+        """取得同步統計資訊"""
+        return {"running": self.is_running, **self._stats}
+
+
+# 應用程式層級的快照儲存與同步工作 (由 lifespan 管理)
+_store: Optional[SnapshotStore] = None
+_syncer: Optional[SnapshotSyncer] = None
+
+
+async def init_snapshot_store(settings: Settings) -> Optional[SnapshotStore]:
+    """
+    開啟快照資料庫並啟動背景同步
+
+    需在 init_connection_pool 之後呼叫；未設定 SAF 帳密時只開啟資料庫 (提供既有快照)，不進行同步
+
+    Args:
+        settings: 設定物件
+
+    Returns:
+        快照儲存；設定停用時返回 None
+    """
+    global _store, _syncer
+
+    if not settings.saf_snapshot_enabled:
+        return None
+
+    if _store is None:
+        _store = await asyncio.to_thread(SnapshotStore, settings.saf_snapshot_path)
+        logger.info(f"Snapshot store opened: {settings.saf_snapshot_path}")
+
+        # 以既有快照建立倒排索引，重新啟動後即可回答查詢
+        if settings.saf_snapshot_test_status:
+            items = await asyncio.to_thread(_store.all_payloads, TEST_STATUS)
+            rows = await asyncio.to_thread(get_test_status_index().rebuild, items)
+            logger.info(f"Test status index built from snapshot: {rows} rows")
+
+    if _syncer is None:
+        if settings.has_credentials:
+            client = SAFClient(settings, pool=get_connection_pool())
+            _syncer = SnapshotSyncer(settings, client, _store)
+            _syncer.start()
+        else:
+            logger.warning("Snapshot sync disabled: SAF_USERNAME / SAF_PASSWORD are not configured")
+
+    return _store
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """取得快照儲存 (未啟用時返回 None)"""
+    return _store
+
+
+def get_snapshot_syncer() -> Optional[SnapshotSyncer]:
+    """取得快照同步工作 (未啟動時返回 None)"""
+    return _syncer
+
+
+async def close_snapshot_store() -> None:
+    """停止同步並關閉快照資料庫"""
+    global _store, _syncer
+
+    if _syncer is not None:
+        syncer, _syncer = _syncer, None
+        await syncer.stop()
+
+    if _store is not None:
+        store, _store = _store, None
+        await asyncio.to_thread(store.close)
@@ -0,0 +1,183 @@
+"""
+測試狀態倒排索引
+
+以快照同步的測試狀態資料 (SAF 原始格式) 建立記憶體內的倒排索引，
+讓 `/test-status/search?source=snapshot` 以 posting list 交集/聯集在本地回答等值查詢
+
+索引欄位使用 `_transform_test_status_item` 產生的 snake_case 名稱，
+查詢語法與欄位別名見 app.services.test_status_query
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.test_status_query import QUERY_FIELDS, Condition, Node, Or, compile_query, normalize_value
+
+# 建立 posting list 的欄位 (其餘可查詢欄位以逐列比對評估)
+INDEXED_FIELDS: Dict[str, str] = {
+    field: raw for field, raw in QUERY_FIELDS.items()
+    if field not in ("duration", "log_path", "is_notification")
+}
+
+
+class _IndexState:
+    """一次建立的索引內容 (建立後不再修改，僅延遲建立 AND 用的 set)"""
+
+    __slots__ = ("rows", "postings", "members")
+
+    def __init__(self, rows: List[Dict[str, Any]], postings: Dict[str, Dict[str, List[int]]]):
+        self.rows = rows
+        self.postings = postings
+        self.members: Dict[Tuple[str, str], frozenset] = {}
+
+    def lookup(self, field: str, value: str) -> List[int]:
+        """取得欄位值的 posting list (遞增排序的 row id)"""
+        return self.postings.get(field, {}).get(value, [])
+
+    def _condition(self, node: Condition) -> List[int]:
+        """等值條件：有索引的欄位使用 posting list，其餘逐列比對"""
+        if node.field in self.postings:
+            return self.lookup(node.field, node.value)
+        return [row_id for row_id, row in enumerate(self.rows) if node.matches(row)]
+
+    def _member_set(self, node: Node, row_ids: List[int]) -> frozenset:
+        """取得結果的 set (有索引的等值條件會快取，供 AND 檢查成員)"""
+        if not isinstance(node, Condition) or node.field not in self.postings:
+            return frozenset(row_ids)
+        key = (node.field, node.value)
+        members = self.members.get(key)
+        if members is None:
+            members = self.members[key] = frozenset(row_ids)
+        return members
+
+    def evaluate(self, node: Node) -> List[int]:
+        """
+        評估語法樹，取得符合的 row id (依上游順序)
+
+        AND 從最短的結果出發：先以 set 取交集，再依最短列表的順序過濾；OR 合併後排序
+        """
+        if isinstance(node, Condition):
+            return self._condition(node)
+
+        results = sorted(((self.evaluate(child), child) for child in node.children), key=lambda pair: len(pair[0]))
+        if isinstance(node, Or):
+            return sorted(set().union(*(row_ids for row_ids, _ in results)))
+
+        smallest = results[0][0]
+        if not smallest:
+            return []
+        others = [self._member_set(child, row_ids) for row_ids, child in results[1:]]
+        keep = others[0].intersection(smallest, *others[1:])
+        return [row_id for row_id in smallest if row_id in keep]
+
+
+class TestStatusIndex:
+    """
+    測試狀態倒排索引
+
+    每列依載入順序給予 row id；每個欄位值對應一個遞增排序的 row id 列表 (posting list)。
+    查詢經 compile_query 編譯後在本地評估整個語法樹 (不下推給 SAF)，結果維持上游順序。rebuild 建好新索引後一次替換，可在執行緒中重建而不需鎖。
+
+    Example:
+        >>> index = TestStatusIndex()
+        >>> index.rebuild(items)
+        >>> index.search('testStatus = "PASS"', page=1, size=50)
+    """
+
+    __test__ = False
+
+    def __init__(self):
+        self._state = _IndexState([], {})
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._state.rows)
+
+    def rebuild(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        以新的資料重建索引 (相同 testJobId 只保留第一筆)
+
+        Args:
+            items: SAF 原始格式的測試狀態資料
+
+        Returns:
+            索引的列數
+        """
+        rows: List[Dict[str, Any]] = []
+        postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        seen = set()
+
+        for item in items:
+            job_id = item.get("testJobId")
+            if job_id is not None:
+                if job_id in seen:
+                    continue
+                seen.add(job_id)
+
+            row_id = len(rows)
+            rows.append(item)
+            for field, raw in INDEXED_FIELDS.items():
+                value = normalize_value(item.get(raw))
+                if value:
+                    postings[field].setdefault(value, []).append(row_id)
+
+        # 一次替換，進行中的查詢仍使用舊索引
+        self._state = _IndexState(rows, postings)
+        self.built_at = time.time()
+        return len(rows)
+
+    def lookup(self, field: str, value: str) -> List[int]:
+        """取得欄位值的 posting list (遞增排序的 row id)"""
+        return self._state.lookup(field, value)
+
+    def match(self, root: Node) -> List[int]:
+        """
+        取得符合語法樹的 row id (依上游順序)
+
+        Args:
+            root: 已編譯查詢的語法樹 (QueryPlan.root)
+        """
+        return self._state.evaluate(root)
+
+    def search(self, query: str, page: int = 1, size: int = 50) -> Dict[str, Any]:
+        """
+        以查詢語法搜尋 (與 search_test_status 格式相同)
+
+        Args:
+            query: 查詢條件
+            page: 頁碼
+            size: 每頁筆數
+
+        Returns:
+            {"items": [...], "total": int, "page": int, "size": int}
+
+        Raises:
+            ValidationError: 查詢語法錯誤或欄位不可查詢
+        """
+        state = self._state
+        row_ids = state.evaluate(compile_query(query).root)
+        start = (page - 1) * size
+        return {
+            "items": [state.rows[row_id] for row_id in row_ids[start:start + size]],
+            "total": len(row_ids),
+            "page": page,
+            "size": size,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """取得索引統計資訊"""
+        state = self._state
+        return {
+            "rows": len(state.rows),
+            "terms": sum(len(values) for values in state.postings.values()),
+            "age_seconds": round(time.time() - self.built_at, 1) if self.built_at else None,
+        }
+
+
+# 應用程式層級的測試狀態索引 (由快照同步重建)
+_index = TestStatusIndex()
+
+
+def get_test_status_index() -> TestStatusIndex:
+    """取得應用程式層級的測試狀態索引"""
+    return _index
@@ -0,0 +1,350 @@
+"""
+測試狀態查詢編譯器
+
+將 `欄位 = "值"` 查詢語法 (以 AND / OR 連接，可用括號) 編譯為語法樹並驗證欄位，
+再由規劃器決定哪些條件下推 (pushdown) 給 SAF、哪些在本地評估；
+編譯結果依正規化後的查詢文字快取，重複的儀表板查詢不需重新解析
+"""
+
+import functools
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.models.schemas import TestStatusItem
+from lib.exceptions import ValidationError
+
+# 可查詢欄位: {TestStatusItem 欄位: SAF 原始欄位}
+# (不含 all_status 等列表欄位與 SAF timestamp 欄位)
+QUERY_FIELDS: Dict[str, str] = {
+    "test_job_id": "testJobId",
+    "is_notification": "isNotification",
+    "test_item": "testItem",
+    "test_category_name": "testCategoryName",
+    "test_plan_name": "testPlanName",
+    "test_status": "testStatus",
+    "sample_id": "sampleId",
+    "capacity": "capacity",
+    "platform": "platform",
+    "position": "position",
+    "mainboard_manufacturer": "mainboardManufacturer",
+    "mainboard_model": "mainboardModel",
+    "project_name": "projectName",
+    "new_project_name": "newProjectName",
+    "product_category": "productCategory",
+    "customer": "customer",
+    "flash": "flash",
+    "controller": "projectController",
+    "sub_version": "projectSubVersion",
+    "fw": "fw",
+    "root_id": "rootId",
+    "task_id": "taskId",
+    "duration": "duration",
+    "user": "user",
+    "log_path": "logPath",
+    "driver": "driver",
+    "filesystem": "filesystem",
+    "slot": "slot",
+    "aspm": "aspm",
+    "os_name": "osName",
+}
+
+# 查詢欄位別名: camelCase (SAF 原始欄位) 與 snake_case 都對應到 TestStatusItem 欄位
+FIELD_ALIASES: Dict[str, str] = {
+    **{field: field for field in QUERY_FIELDS if field in TestStatusItem.model_fields},
+    **{raw: field for field, raw in QUERY_FIELDS.items() if field in TestStatusItem.model_fields},
+}
+
+# SAF 已知支援的查詢欄位: {TestStatusItem 欄位: SAF 查詢語法的欄位名稱}，依選擇性由高到低排列
+PUSHDOWN_FIELDS: Dict[str, str] = {
+    "sample_id": "sampleId",
+    "new_project_name": "new_project_name",
+    "project_name": "projectName",
+    "test_status": "testStatus",
+}
+
+# 編譯結果快取的最大項目數
+PLAN_CACHE_SIZE = 512
+
+_TOKEN_PATTERN = re.compile(r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*")|(?P<op>[=()])|(?P<word>\w+))')
+
+
+def normalize_value(value: Any) -> str:
+    """將 SAF 欄位值轉為可比較的字串 (bool 為 true/false，None 為空字串)"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _quote(value: str) -> str:
+    """以雙引號包住值並跳脫內部的雙引號"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class Condition:
+    """等值條件節點: 欄位 = "值" """
+
+    __slots__ = ("field", "value", "raw")
+
+    def __init__(self, field: str, value: str):
+        self.field = field
+        self.value = value
+        self.raw = QUERY_FIELDS[field]
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        """SAF 原始資料是否符合條件"""
+        return normalize_value(item.get(self.raw)) == self.value
+
+    def render(self) -> str:
+        """輸出 SAF 查詢語法"""
+        return f"{PUSHDOWN_FIELDS.get(self.field, self.raw)} = {_quote(self.value)}"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Condition) and (self.field, self.value) == (other.field, other.value)
+
+    def __hash__(self) -> int:
+        return hash((self.field, self.value))
+
+    def __repr__(self) -> str:
+        return f"Condition({self.field!r}, {self.value!r})"
+
+
+class And:
+    """AND 節點 (所有子節點皆符合)"""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: Sequence["Node"]):
+        self.children: Tuple["Node", ...] = tuple(children)
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        return all(child.matches(item) for child in self.children)
+
+    def render(self) -> str:
+        return " AND ".join(
+            f"({child.render()})" if isinstance(child, Or) else child.render()
+            for child in self.children
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, And) and self.children == other.children
+
+    def __hash__(self) -> int:
+        return hash(("AND", self.children))
+
+    def __repr__(self) -> str:
+        return f"And({list(self.children)!r})"
+
+
+class Or:
+    """OR 節點 (任一子節點符合)"""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: Sequence["Node"]):
+        self.children: Tuple["Node", ...] = tuple(children)
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        return any(child.matches(item) for child in self.children)
+
+    def render(self) -> str:
+        return " OR ".join(child.render() for child in self.children)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Or) and self.children == other.children
+
+    def __hash__(self) -> int:
+        return hash(("OR", self.children))
+
+    def __repr__(self) -> str:
+        return f"Or({list(self.children)!r})"
+
+
+Node = Any  # Condition | And | Or
+
+
+def _combine(node_type: type, children: List[Node]) -> Node:
+    """建立 AND / OR 節點並攤平同類型的子節點"""
+    flat: List[Node] = []
+    for child in children:
+        flat.extend(child.children if isinstance(child, node_type) else [child])
+    return flat[0] if len(flat) == 1 else node_type(flat)
+
+
+class _Parser:
+    """
+    遞迴下降解析器
+
+    文法 (AND 優先於 OR，關鍵字不分大小寫):
+        expr   := term (OR term)*
+        term   := factor (AND factor)*
+        factor := "(" expr ")" | field "=" string
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[Tuple[str, str, int]] = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN_PATTERN.match(text, position)
+            if match is None:
+                if text[position:].strip():
+                    raise ValidationError(f"Unexpected character at position {position}: {text[position]!r}")
+                break
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind), match.start(kind)))
+            position = match.end()
+        self.index = 0
+
+    def _peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _error(self, expected: str) -> ValidationError:
+        token = self._peek()
+        if token is None:
+            return ValidationError(f"Unexpected end of query, expected {expected}")
+        return ValidationError(f"Expected {expected} at position {token[2]}, got {token[1]!r}")
+
+    def _keyword(self, keyword: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == "word" and token[1].upper() == keyword:
+            self.index += 1
+            return True
+        return False
+
+    def _op(self, op: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == "op" and token[1] == op:
+            self.index += 1
+            return True
+        return False
+
+    def parse(self) -> Node:
+        node = self._expr()
+        if self._peek() is not None:
+            raise self._error("AND/OR")
+        return node
+
+    def _expr(self) -> Node:
+        children = [self._term()]
+        while self._keyword("OR"):
+            children.append(self._term())
+        return _combine(Or, children)
+
+    def _term(self) -> Node:
+        children = [self._factor()]
+        while self._keyword("AND"):
+            children.append(self._factor())
+        return _combine(And, children)
+
+    def _factor(self) -> Node:
+        if self._op("("):
+            node = self._expr()
+            if not self._op(")"):
+                raise self._error("')'")
+            return node
+
+        token = self._peek()
+        if token is None or token[0] != "word" or token[1].upper() in ("AND", "OR"):
+            raise self._error("field name")
+        self.index += 1
+
+        field = FIELD_ALIASES.get(token[1])
+        if field is None:
+            raise ValidationError(f"Unknown query field: {token[1]}", field=token[1])
+        if not self._op("="):
+            raise self._error("'='")
+
+        value = self._peek()
+        if value is None or value[0] != "string":
+            raise self._error("quoted value")
+        self.index += 1
+        return Condition(field, re.sub(r"\\(.)", r"\1", value[1][1:-1]))
+
+
+class QueryPlan:
+    """
+    查詢計畫
+
+    - root: 完整的語法樹
+    - text: 正規化後的查詢文字
+    - remote: 下推給 SAF 的查詢文字
+    - residual: SAF 結果需再於本地評估的條件 (None 表示 SAF 結果即為答案)
+
+    計畫會被多個請求共用，建立後不可修改。
+    """
+
+    __slots__ = ("root", "text", "remote", "residual")
+
+    def __init__(self, root: Node, remote: str, residual: Optional[Node] = None):
+        self.root = root
+        self.text = root.render()
+        self.remote = remote
+        self.residual = residual
+
+    def __repr__(self) -> str:
+        return f"QueryPlan(remote={self.remote!r}, residual={self.residual!r})"
+
+
+def plan_query(root: Node) -> QueryPlan:
+    """
+    決定各條件由 SAF 或本地評估
+
+    最上層以 AND 連接的條件中，選擇一個 SAF 已知支援且選擇性最高的等值條件下推，
+    其餘條件在本地過濾 SAF 的結果；沒有可下推的條件時 (例如最上層為 OR)
+    維持原本的行為，將整個查詢交給 SAF
+
+    Args:
+        root: 語法樹
+
+    Returns:
+        查詢計畫
+    """
+    conjuncts = list(root.children) if isinstance(root, And) else [root]
+    pushable = [
+        node for node in conjuncts
+        if isinstance(node, Condition) and node.field in PUSHDOWN_FIELDS
+    ]
+    if not pushable:
+        return QueryPlan(root, remote=root.render())
+
+    ranking = list(PUSHDOWN_FIELDS)
+    pushed = min(pushable, key=lambda node: ranking.index(node.field))
+    rest = [node for node in conjuncts if node is not pushed]
+    residual = _combine(And, rest) if rest else None
+    return QueryPlan(root, remote=pushed.render(), residual=residual)
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile(text: str) -> QueryPlan:
+    return plan_query(_Parser(text).parse())
+
+
+def compile_query(query: str) -> QueryPlan:
+    """
+    編譯查詢並產生計畫 (依去除首尾空白後的文字快取)
+
+    Args:
+        query: 查詢條件，例如 `projectName = "Springsteen" AND fw = "GB10YCFS"`
+
+    Returns:
+        查詢計畫
+
+    Raises:
+        ValidationError: 語法錯誤或欄位不是 TestStatusItem 的可查詢欄位
+
+    Example:
+        >>> plan = compile_query('fw = "FW1" AND testStatus = "PASS"')
+        >>> plan.remote
+        'testStatus = "PASS"'
+        >>> plan.residual
+        Condition('fw', 'FW1')
+    """
+    return _compile(query.strip())
+
+
+def plan_cache_stats() -> Dict[str, int]:
+    """取得查詢計畫快取的統計資訊"""
+    info = _compile.cache_info()
+    return {"entries": info.currsize, "hits": info.hits, "misses": info.misses}
@@ -0,0 +1,237 @@
+"""
+快取模組
+
+提供可替換後端的 TTL 快取，預設後端為有容量上限的記憶體 LRU
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+
+class CacheEntry:
+    """
+    快取項目
+
+    記錄快取值、寫入時間與存活秒數 (時間皆使用 time.monotonic)。
+    超過 ttl 後項目變為過時 (stale)，在 grace 秒內仍可供 stale-while-revalidate 使用，
+    超過 ttl + grace 後才視為過期
+    """
+
+    __slots__ = ("value", "stored_at", "ttl", "grace")
+
+    def __init__(
+        self,
+        value: Any,
+        ttl: float,
+        stored_at: Optional[float] = None,
+        grace: float = 0.0
+    ):
+        self.value = value
+        self.ttl = ttl
+        self.grace = grace
+        self.stored_at = time.monotonic() if stored_at is None else stored_at
+
+    @property
+    def expires_at(self) -> float:
+        """到期時間 (含 grace)"""
+        return self.stored_at + self.ttl + self.grace
+
+    def age(self, now: Optional[float] = None) -> float:
+        """項目已存在的秒數"""
+        return (time.monotonic() if now is None else now) - self.stored_at
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        """是否已超過 ttl (過時但可能仍在 grace 內)"""
+        return self.age(now) >= self.ttl
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """是否已過期"""
+        return (time.monotonic() if now is None else now) >= self.expires_at
+
+
+class CacheBackend(ABC):
+    """
+    快取後端介面
+
+    實作此介面即可替換快取儲存位置 (例如改用 Redis)
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """取得快取項目，不存在時返回 None"""
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """寫入快取項目"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """刪除快取項目"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清除所有快取項目"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """目前的快取項目數"""
+
+
+class MemoryLRUBackend(CacheBackend):
+    """
+    記憶體 LRU 快取後端
+
+    超過 max_entries 時淘汰最久未使用的項目
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TTLCache:
+    """
+    TTL 快取
+
+    每個項目各自帶有存活秒數，過期的項目視為不存在
+
+    Example:
+        >>> cache = TTLCache(MemoryLRUBackend(max_entries=100))
+        >>> cache.set("key", {"a": 1}, ttl=60)
+        >>> cache.get("key").value
+        {'a': 1}
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        初始化快取
+
+        Args:
+            backend: 快取後端，預設為 MemoryLRUBackend
+        """
+        self.backend = backend or MemoryLRUBackend()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        取得未過期的快取項目
+
+        Args:
+            key: 快取 key
+
+        Returns:
+            快取項目；不存在或已過期時返回 None
+        """
+        entry = self.backend.get(key)
+        if entry is None or entry.is_expired():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float, grace: float = 0.0) -> CacheEntry:
+        """
+        寫入快取
+
+        Args:
+            key: 快取 key
+            value: 快取值
+            ttl: 新鮮 (fresh) 秒數
+            grace: 過時後仍可使用的額外秒數 (stale-while-revalidate)
+
+        Returns:
+            寫入的快取項目
+        """
+        entry = CacheEntry(value, ttl, grace=grace)
+        self.backend.set(key, entry)
+        return entry
+
+    def delete(self, key: str) -> None:
+        """刪除快取項目"""
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        """清除所有快取項目並重設統計"""
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """取得快取統計資訊"""
+        return {
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def make_cache_key(namespace: str, *parts: Any) -> str:
+    """
+    產生快取 key
+
+    以 JSON 序列化參數 (dict 依 key 排序)，相同參數一定得到相同 key
+
+    Args:
+        namespace: 命名空間 (通常為方法名稱)
+        *parts: 組成 key 的參數
+
+    Example:
+        >>> make_cache_key("get_projects", {"user_id": 1, "page": 2})
+        'get_projects:[{"page": 2, "user_id": 1}]'
+    """
+    return f"{namespace}:{json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)}"
+
+
+# 目前 context 最近一次快取查詢的狀態 (供 API 回應標示資料新鮮度)
+_cache_status: ContextVar[Optional[Dict[str, Any]]] = ContextVar("cache_status", default=None)
+
+
+def set_cache_status(hit: bool, age: float = 0.0, stale: bool = False) -> None:
+    """
+    記錄目前 context 最近一次快取查詢的狀態
+
+    Args:
+        hit: 是否命中快取
+        age: 資料已存在的秒數
+        stale: 是否為過時資料 (背景更新中)
+    """
+    _cache_status.set({"hit": hit, "age": round(age, 3), "stale": stale})
+
+
+def get_cache_status() -> Optional[Dict[str, Any]]:
+    """
+    取得目前 context 最近一次快取查詢的狀態
+
+    Returns:
+        {"hit": bool, "age": float, "stale": bool}；未經過快取時返回 None
+    """
+    return _cache_status.get()
@@ -0,0 +1,71 @@
+"""
+Single-flight 請求合併模組
+
+相同 key 的並行呼叫只會執行一次，所有等待者共用同一個進行中的結果
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """進行中的呼叫與其等待者數量"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Single-flight 群組
+
+    - 第一個呼叫者啟動實際的呼叫 (獨立的 Task)，後續相同 key 的呼叫者等待同一個 Task
+    - 呼叫失敗時，例外會傳遞給所有等待者
+    - 單一等待者被取消不影響其他等待者；所有等待者都取消時才取消實際的呼叫
+    - 呼叫結束後立即移除，不會快取結果
+
+    Example:
+        >>> group = SingleFlight()
+        >>> result = await group.do("key", lambda: fetch_data())
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+
+    def __len__(self) -> int:
+        """目前進行中的呼叫數"""
+        return len(self._calls)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        """呼叫結束後移除 (避免移除到同 key 的新呼叫)"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        執行或加入相同 key 的呼叫
+
+        Args:
+            key: 呼叫識別 key
+            func: 產生實際呼叫 coroutine 的函數 (只有第一個呼叫者會執行)
+
+        Returns:
+            呼叫結果
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # 已無人等待結果，取消實際的呼叫
+                call.task.cancel()
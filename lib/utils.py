@@ -12,7 +12,8 @@ def format_response(
     success: bool,
     data: Any = None,
     message: Optional[str] = None,
-    error_code: Optional[str] = None
+    error_code: Optional[str] = None,
+    cache: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     統一 API 回應格式
@@ -22,6 +23,7 @@ def format_response(
         data: 回應資料
         message: 訊息 (通常用於錯誤訊息)
         error_code: 錯誤代碼
+        cache: 快取狀態 (hit/age/stale)，資料來自 SAF 回應快取時提供
         
     Returns:
         格式化的回應字典
@@ -40,6 +42,9 @@ def format_response(
     if error_code:
         response["error_code"] = error_code
     
+    if cache:
+        response["cache"] = cache
+    
     return response
 
 
@@ -0,0 +1,129 @@
+"""
+HTTP/1.1 與 HTTP/2 上游傳輸效能比較
+
+啟動一個本機支援 h2c (HTTP/2 prior knowledge) 的 SAF 替身伺服器，
+以相同的並行數呼叫 SAFClient.get_project_test_summary，比較兩種傳輸模式的
+總耗時、吞吐量與使用的連線數
+
+需要額外安裝: pip install "httpx[http2]" hypercorn
+
+使用方式:
+    python -m scripts.benchmarks.bench_http2 --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from app.config import Settings
+from app.services.connection_pool import SAFConnectionPool
+from app.services.saf_client import SAFClient
+from lib.logger import setup_logging
+
+SUMMARY_PAYLOAD = json.dumps({
+    "projectId": "bench-project",
+    "projectName": "Bench Project",
+    "fws": [{"projectUid": "bench-uid", "fwName": "BENCHFW", "plans": []}],
+}).encode()
+
+
+async def stand_in_saf(scope, receive, send):
+    """模擬 SAF listOneProjectSummary 的最小 ASGI 應用 (含固定上游延遲)"""
+    if scope["type"] != "http":
+        return
+
+    # 讀完請求 body
+    more_body = True
+    while more_body:
+        message = await receive()
+        more_body = message.get("more_body", False)
+
+    await asyncio.sleep(STAND_IN_LATENCY)
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": SUMMARY_PAYLOAD})
+
+
+STAND_IN_LATENCY = 0.02
+
+
+async def run_mode(port: int, http2: bool, args: argparse.Namespace) -> dict:
+    """以指定傳輸模式執行一輪壓測"""
+    settings = Settings(
+        saf_base_url="http://127.0.0.1",
+        saf_api_port=port,
+        saf_http2_enabled=http2,
+        saf_http2_prior_knowledge=http2,
+        saf_http2_max_concurrent_streams=args.max_streams,
+        saf_pool_max_connections=args.max_connections,
+        saf_pool_max_keepalive_connections=args.max_connections,
+        _env_file=None,
+    )
+    pool = SAFConnectionPool(settings)
+    await pool.start()
+    client = SAFClient(settings, pool=pool)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one_call():
+        async with semaphore:
+            await client.get_project_test_summary(1, "bench", "bench-uid")
+
+    try:
+        # 暖機: 建立連線
+        await asyncio.gather(*(one_call() for _ in range(args.concurrency)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_call() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        stats = pool.stats()["targets"]["api"]
+    finally:
+        await pool.close()
+
+    return {
+        "mode": "HTTP/2" if http2 else "HTTP/1.1",
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(args.requests / elapsed, 1),
+        "connections": stats["connections"],
+        "requests_by_protocol": stats["requests_by_protocol"],
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    global STAND_IN_LATENCY
+    STAND_IN_LATENCY = args.latency_ms / 1000
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{args.port}"]
+    config.accesslog = None
+    config.errorlog = None
+    config.h2_max_concurrent_streams = args.max_streams
+    config.keep_alive_max_requests = 10**9  # 避免替身伺服器中途送出 GOAWAY
+    shutdown = asyncio.Event()
+    server = asyncio.create_task(serve(stand_in_saf, config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+
+    try:
+        for http2 in (False, True):
+            print(json.dumps(await run_mode(args.port, http2, args), ensure_ascii=False))
+    finally:
+        shutdown.set()
+        await server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=18004)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--max-connections", type=int, default=20)
+    parser.add_argument("--max-streams", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    setup_logging("WARNING")
+    asyncio.run(main(parser.parse_args()))
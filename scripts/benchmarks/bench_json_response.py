@@ -0,0 +1,114 @@
+"""
+JSON 回應序列化效能比較
+
+以同一份大型回應資料 (類似 /projects/test-jobs 與測試明細)，比較兩種回應路徑每 MB 輸出的 CPU 時間:
+- validated: 路由回傳 format_response dict，FastAPI 以 response_model=APIResponse 驗證後
+  由標準函式庫 json 序列化 (原本的行為)
+- fast: 路由回傳 api_response (略過 response_model 驗證，以 orjson 序列化)
+
+兩個路由掛在同一個 FastAPI 應用上，透過 ASGI 在行程內呼叫，不經網路
+
+使用方式:
+    python -m scripts.benchmarks.bench_json_response --rows 50000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.models.schemas import APIResponse
+from app.responses import api_response, orjson
+from app.services.job_table import JobTable
+from lib.utils import format_response
+
+STATUSES = ["Pass", "Fail", "Ongoing", "Cancel"]
+
+
+def build_payload(rows: int) -> dict:
+    """建立類似 /projects/test-jobs 的回應資料"""
+    table = JobTable.from_jobs(
+        {
+            "testJobId": f"{i:032x}",
+            "fw": f"FW{i % 12}",
+            "testPlanName": f"Client_PCIe_Plan_{i % 40}",
+            "testCategoryName": f"Category_{i % 25}",
+            "rootId": f"STC-{i % 3000}",
+            "testItemName": f"NVMe_Validation_Tool_{i % 500}",
+            "testStatus": STATUSES[i % len(STATUSES)],
+            "sampleId": f"SSD-Y-{i % 800}",
+            "capacity": ["512GB", "1024GB", "2048GB"][i % 3],
+            "platform": f"PC-SSD-{i % 200}",
+            "testToolKeyList": ["snvt2", "iometer"][: 1 + i % 2],
+        }
+        for i in range(rows)
+    )
+    return {"test_jobs": table.rows(), "total": len(table), "status_counts": table.count_by("test_status")}
+
+
+def build_app(payload: dict) -> FastAPI:
+    """建立比較用的應用程式"""
+    app = FastAPI()
+    cache = {"hit": True, "age": 1.5, "stale": False}
+
+    @app.get("/validated", response_model=APIResponse, response_class=JSONResponse)
+    async def validated():
+        return format_response(success=True, data=payload, cache=cache)
+
+    @app.get("/fast", response_model=APIResponse)
+    async def fast():
+        return api_response(success=True, data=payload, cache=cache)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, rounds: int) -> dict:
+    """呼叫路由 rounds 次，返回每次的 CPU 時間、牆鐘時間與輸出大小"""
+    await client.get(path)  # 暖機
+    cpu = wall = 0.0
+    size = 0
+    for _ in range(rounds):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        response = await client.get(path)
+        cpu += time.process_time() - cpu_start
+        wall += time.perf_counter() - wall_start
+        size = len(response.content)
+    megabytes = size / (1 << 20)
+    return {
+        "mb": megabytes,
+        "cpu_ms": cpu / rounds * 1000,
+        "wall_ms": wall / rounds * 1000,
+        "cpu_ms_per_mb": cpu / rounds * 1000 / megabytes,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    payload = build_payload(args.rows)
+    app = build_app(payload)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        validated_body = (await client.get("/validated")).json()
+        fast_body = (await client.get("/fast")).json()
+        validated_body.pop("timestamp"), fast_body.pop("timestamp")
+        assert validated_body == fast_body, "Responses differ"
+
+        print(f"rows={args.rows} rounds={args.rounds} orjson={'yes' if orjson is not None else 'no'}")
+        results = {}
+        for path in ("/validated", "/fast"):
+            results[path] = result = await measure(client, path, args.rounds)
+            print(
+                f"{path:<11} size={result['mb']:.2f} MB  cpu={result['cpu_ms']:.1f} ms  "
+                f"wall={result['wall_ms']:.1f} ms  cpu/MB={result['cpu_ms_per_mb']:.1f} ms"
+            )
+        speedup = results["/validated"]["cpu_ms_per_mb"] / results["/fast"]["cpu_ms_per_mb"]
+        print(f"CPU per MB: {speedup:.1f}x less with api_response")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="測試工作筆數")
+    parser.add_argument("--rounds", type=int, default=5, help="每個路由的呼叫次數")
+    asyncio.run(main(parser.parse_args()))
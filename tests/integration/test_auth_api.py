@@ -3,8 +3,11 @@
 """
 
 import pytest
+from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 
+from app.main import app
+
 from tests.fixtures.mock_responses import LOGIN_SUCCESS_RESPONSE
 
 
@@ -20,6 +23,16 @@ class TestHealthEndpoint:
         assert data["status"] == "healthy"
         assert "version" in data
         assert "timestamp" in data
+    
+    def test_health_check_includes_pool_stats(self, override_settings):
+        """測試 lifespan 啟動連線池後回報上游統計"""
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.get("/health")
+        
+        assert response.status_code == 200
+        pool_stats = response.json()["upstream"]["pool"]
+        assert set(pool_stats["targets"]) == {"login", "api"}
+        assert "requests_by_protocol" in pool_stats["targets"]["api"]
 
 
 class TestRootEndpoint:
@@ -2,6 +2,8 @@
 測試專案 API
 """
 
+import json
+
 import pytest
 from unittest.mock import patch, AsyncMock
 
@@ -11,9 +13,22 @@ from tests.fixtures.mock_responses import (
     PROJECT_TEST_SUMMARY_RESPONSE,
     EMPTY_PROJECT_TEST_SUMMARY_RESPONSE
 )
+from app.services.activity import get_request_activity
+from app.services.job_table import JobTable
+from app.services.snapshot_store import ALL_SCOPE, PROJECTS, TEST_JOBS, SnapshotStore
+from app.services.test_status_index import TestStatusIndex
+from lib.cache import set_cache_status
 from lib.exceptions import SAFAPIError, SAFConnectionError
 
 
+def _pages(*pages):
+    """建立模擬 SAFClient.iter_all_projects 的 async generator 函數"""
+    async def iter_all_projects(*args, **kwargs):
+        for page in pages:
+            yield page
+    return iter_all_projects
+
+
 class TestProjectsEndpoint:
     """測試專案端點"""
     
@@ -75,6 +90,25 @@ class TestProjectsEndpoint:
         call_kwargs = mock_instance.get_all_projects.call_args[1]
         assert call_kwargs["page"] == 2
         assert call_kwargs["size"] == 20
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_get_projects_all_pages(self, mock_client_class, client, auth_headers):
+        """測試 all=true 合併所有頁面"""
+        second_page = {**PROJECTS_RESPONSE, "page": 2, "data": PROJECTS_RESPONSE["data"][:1]}
+        mock_instance = AsyncMock()
+        mock_instance.iter_all_projects = _pages(PROJECTS_RESPONSE, second_page)
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects?all=true",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] == 642
+        assert len(data["data"]) == len(PROJECTS_RESPONSE["data"]) + 1
+        mock_instance.get_all_projects.assert_not_called()
 
 
 class TestProjectsSummaryEndpoint:
@@ -84,7 +118,7 @@ class TestProjectsSummaryEndpoint:
     def test_get_summary_success(self, mock_client_class, client, auth_headers):
         """測試取得專案摘要成功"""
         mock_instance = AsyncMock()
-        mock_instance.get_all_projects.return_value = PROJECTS_RESPONSE
+        mock_instance.iter_all_projects = _pages(PROJECTS_RESPONSE)
         mock_client_class.return_value = mock_instance
         
         response = client.get(
@@ -99,11 +133,33 @@ class TestProjectsSummaryEndpoint:
         assert "by_customer" in data["data"]
         assert "by_controller" in data["data"]
     
+    @patch("app.routers.projects.SAFClient")
+    def test_get_summary_counts_every_page(self, mock_client_class, client, auth_headers):
+        """測試摘要統計包含所有頁面的專案"""
+        project = {"customer": "ADATA", "controller": "SM2268XT2"}
+        mock_instance = AsyncMock()
+        mock_instance.iter_all_projects = _pages(
+            {"page": 1, "size": 2, "total": 3, "data": [project, project]},
+            {"page": 2, "size": 2, "total": 3, "data": [project]},
+        )
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects/summary",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] == 3
+        assert data["by_customer"] == {"ADATA": 3}
+        assert data["by_controller"] == {"SM2268XT2": 3}
+    
     @patch("app.routers.projects.SAFClient")
     def test_get_summary_empty(self, mock_client_class, client, auth_headers):
         """測試空專案列表的摘要"""
         mock_instance = AsyncMock()
-        mock_instance.get_all_projects.return_value = EMPTY_PROJECTS_RESPONSE
+        mock_instance.iter_all_projects = _pages(EMPTY_PROJECTS_RESPONSE)
         mock_client_class.return_value = mock_instance
         
         response = client.get(
@@ -164,6 +220,39 @@ class TestProjectTestSummaryEndpoint:
         assert "overall_total" in summary
         assert "overall_pass_rate" in summary
     
+    @patch("app.routers.projects.SAFClient")
+    def test_get_test_summary_reports_cache_staleness(self, mock_client_class, client, auth_headers):
+        """測試回應標示快取資料的年齡與是否過時"""
+        async def stale_summary(*args, **kwargs):
+            set_cache_status(hit=True, age=90.0, stale=True)
+            return PROJECT_TEST_SUMMARY_RESPONSE
+        
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.side_effect = stale_summary
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects/test-project-uid-001/test-summary",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["cache"] == {"hit": True, "age": 90.0, "stale": True, "source": None}
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_get_test_summary_records_activity(self, mock_client_class, client, auth_headers):
+        """測試請求會記錄專案的請求頻率 (供快取預熱排序)"""
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.return_value = PROJECT_TEST_SUMMARY_RESPONSE
+        mock_client_class.return_value = mock_instance
+        activity = get_request_activity()
+        before = activity.frequency("activity-uid")
+        
+        client.get("/api/v1/projects/activity-uid/test-summary", headers=auth_headers)
+        
+        assert activity.frequency("activity-uid") > before
+        assert activity.in_flight == 0
+    
     @patch("app.routers.projects.SAFClient")
     def test_get_test_summary_empty_project(self, mock_client_class, client, auth_headers):
         """測試空專案的測試摘要"""
@@ -220,3 +309,457 @@ class TestProjectTestSummaryEndpoint:
         )
         
         assert response.status_code == 503
+
+
+class TestTestStatusSearchEndpoint:
+    """測試測試狀態搜尋的查詢編譯與下推"""
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_pushdown_single_condition(self, mock_client_class, client, auth_headers):
+        """測試 SAF 支援的單一條件以正規化文字下推"""
+        mock_instance = AsyncMock()
+        mock_instance.search_test_status.return_value = {
+            "items": [{"testJobId": "job-1", "testStatus": "PASS"}],
+            "total": 1,
+        }
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search",
+            json={"query": '  testStatus="PASS" '},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["total"] == 1
+        assert mock_instance.search_test_status.call_args.kwargs["query"] == 'testStatus = "PASS"'
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_residual_filtered_locally(self, mock_client_class, client, auth_headers):
+        """測試其餘條件在本地過濾所有頁面後分頁"""
+        queries = []
+        
+        async def iter_test_status(*args, query, **kwargs):
+            queries.append(query)
+            yield {"items": [
+                {"testJobId": "job-1", "projectName": "Springsteen", "fw": "FW1"},
+                {"testJobId": "job-2", "projectName": "Springsteen", "fw": "FW2"},
+            ]}
+            yield {"items": [
+                {"testJobId": "job-3", "projectName": "Springsteen", "fw": "FW1"},
+                {"testJobId": "job-4", "projectName": "Springsteen", "fw": "FW1"},
+            ]}
+        
+        mock_instance = AsyncMock()
+        mock_instance.iter_test_status = iter_test_status
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search",
+            json={"query": 'fw = "FW1" AND projectName = "Springsteen"', "page": 2, "size": 2},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] == 3
+        assert [item["test_job_id"] for item in data["items"]] == ["job-4"]
+        assert queries == ['projectName = "Springsteen"']
+        mock_instance.search_test_status.assert_not_called()
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_invalid_query_rejected_locally(self, mock_client_class, client, auth_headers):
+        """測試不合法的查詢返回 400 且不呼叫 SAF"""
+        mock_instance = AsyncMock()
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search",
+            json={"query": 'projectNmae = "Springsteen"'},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 400
+        detail = response.json()["detail"]
+        assert detail["error_code"] == "INVALID_QUERY"
+        assert "projectNmae" in detail["message"]
+        mock_instance.search_test_status.assert_not_called()
+
+
+class TestTestStatusStreamEndpoint:
+    """測試測試狀態串流匯出端點"""
+    
+    @staticmethod
+    def _status_page(page, job_ids, total):
+        return {
+            "page": page,
+            "size": 2,
+            "total": total,
+            "items": [{"testJobId": job_id, "testStatus": "PASS"} for job_id in job_ids],
+        }
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_stream_all_pages(self, mock_client_class, client, auth_headers):
+        """測試所有頁面以 NDJSON 逐行輸出"""
+        async def iter_test_status(*args, **kwargs):
+            yield self._status_page(1, ["job-1", "job-2"], 3)
+            yield self._status_page(2, ["job-3"], 3)
+        
+        mock_instance = AsyncMock()
+        mock_instance.iter_test_status = iter_test_status
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search/stream",
+            json={"query": 'testStatus = "PASS"'},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["x-total-count"] == "3"
+        
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["test_job_id"] for row in rows] == ["job-1", "job-2", "job-3"]
+        assert rows[0]["test_status"] == "PASS"
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_stream_residual_filter(self, mock_client_class, client, auth_headers):
+        """測試本地過濾的條件套用到串流，且不提供總筆數"""
+        async def iter_test_status(*args, **kwargs):
+            yield {"total": 2, "items": [
+                {"testJobId": "job-1", "testStatus": "PASS", "fw": "FW1"},
+                {"testJobId": "job-2", "testStatus": "PASS", "fw": "FW2"},
+            ]}
+        
+        mock_instance = AsyncMock()
+        mock_instance.iter_test_status = iter_test_status
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search/stream",
+            json={"query": 'testStatus = "PASS" AND fw = "FW2"'},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert "x-total-count" not in response.headers
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["test_job_id"] for row in rows] == ["job-2"]
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_stream_first_page_error(self, mock_client_class, client, auth_headers):
+        """測試第 1 頁失敗時回應 HTTP 錯誤"""
+        async def iter_test_status(*args, **kwargs):
+            raise SAFConnectionError("Connection failed")
+            yield  # pragma: no cover
+        
+        mock_instance = AsyncMock()
+        mock_instance.iter_test_status = iter_test_status
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search/stream",
+            json={"query": 'testStatus = "PASS"'},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 503
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_stream_error_after_first_page(self, mock_client_class, client, auth_headers):
+        """測試串流中途失敗時最後一行為錯誤回應"""
+        async def iter_test_status(*args, **kwargs):
+            yield self._status_page(1, ["job-1", "job-2"], 4)
+            raise SAFAPIError("Failed to search test status: 500", status_code=500)
+        
+        mock_instance = AsyncMock()
+        mock_instance.iter_test_status = iter_test_status
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-status/search/stream",
+            json={"query": 'testStatus = "PASS"'},
+            headers=auth_headers
+        )
+        
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 3
+        assert rows[-1]["success"] is False
+        assert rows[-1]["error_code"] == "SAF_API_ERROR"
+
+
+class TestBatchTestSummariesEndpoint:
+    """測試批次測試摘要端點"""
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_batch_mixed_results(self, mock_client_class, client, auth_headers):
+        """測試成功與失敗的專案各自返回"""
+        async def get_summary(user_id, username, project_uid):
+            if project_uid == "missing":
+                raise SAFAPIError("Project not found", status_code=404, error_code="PROJECT_NOT_FOUND")
+            if project_uid == "offline":
+                raise SAFConnectionError("Connection failed")
+            return PROJECT_TEST_SUMMARY_RESPONSE
+        
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.side_effect = get_summary
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-summaries:batch",
+            json={"project_uids": ["test-project-uid-001", "missing", "offline", "missing"]},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        results = data["results"]
+        
+        assert data["succeeded"] == 1
+        assert data["failed"] == 2
+        assert list(results) == ["test-project-uid-001", "missing", "offline"]
+        assert results["test-project-uid-001"]["data"]["summary"]["project_uid"] == "test-project-uid-001"
+        assert results["missing"]["error_code"] == "PROJECT_NOT_FOUND"
+        assert results["offline"]["error_code"] == "CONNECTION_ERROR"
+        assert mock_instance.get_project_test_summary.call_count == 3
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_batch_views_share_upstream_payload(self, mock_client_class, client, auth_headers):
+        """測試多個檢視只查詢一次上游"""
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.return_value = PROJECT_TEST_SUMMARY_RESPONSE
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-summaries:batch",
+            json={"project_uids": ["test-project-uid-001"], "views": ["summary", "details"]},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        views = response.json()["data"]["results"]["test-project-uid-001"]["data"]
+        assert set(views) == {"summary", "details"}
+        assert mock_instance.get_project_test_summary.call_count == 1
+    
+    def test_batch_rejects_unknown_view(self, client, auth_headers):
+        """測試未知的檢視名稱"""
+        response = client.post(
+            "/api/v1/projects/test-summaries:batch",
+            json={"project_uids": ["uid-1"], "views": ["unknown"]},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 422
+
+
+class TestProjectViewsEndpoint:
+    """測試專案多檢視端點"""
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_views_single_upstream_call(self, mock_client_class, client, auth_headers):
+        """測試多個檢視只查詢一次上游"""
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.return_value = PROJECT_TEST_SUMMARY_RESPONSE
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects/test-project-uid-001/views?include=summary,details",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert set(data) == {"summary", "details"}
+        assert data["summary"]["project_uid"] == "test-project-uid-001"
+        assert mock_instance.get_project_test_summary.call_count == 1
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_views_field_projection(self, mock_client_class, client, auth_headers):
+        """測試各檢視的欄位投影"""
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.return_value = PROJECT_TEST_SUMMARY_RESPONSE
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects/test-project-uid-001/views",
+            params={
+                "include": "summary,details",
+                "fields": "summary.project_uid,summary.summary.overall_total",
+            },
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert set(data["summary"]) == {"project_uid", "summary"}
+        assert set(data["summary"]["summary"]) == {"overall_total"}
+        # 未指定欄位的檢視返回完整內容
+        assert "project_uid" in data["details"]
+    
+    def test_views_unknown_view(self, client, auth_headers):
+        """測試未知的檢視名稱"""
+        response = client.get(
+            "/api/v1/projects/test-project-uid-001/views?include=summary,bogus",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "INVALID_VIEW"
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_views_project_not_found(self, mock_client_class, client, auth_headers):
+        """測試專案不存在"""
+        mock_instance = AsyncMock()
+        mock_instance.get_project_test_summary.side_effect = SAFAPIError(
+            "Project not found",
+            status_code=404,
+            error_code="PROJECT_NOT_FOUND"
+        )
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects/missing/views?include=full",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 404
+
+
+class TestTestJobsEndpoint:
+    """測試測試工作端點"""
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_list_test_jobs_from_table(self, mock_client_class, client, auth_headers):
+        """測試以欄式表回應測試工作與各狀態筆數"""
+        mock_instance = AsyncMock()
+        mock_instance.get_test_job_table.return_value = JobTable.from_jobs([
+            {"testJobId": "j1", "testStatus": "Pass", "testToolKeyList": ["tool-a"]},
+            {"testJobId": "j2", "testStatus": "Fail"},
+            {"testJobId": "j3", "testStatus": "Pass"},
+        ])
+        mock_client_class.return_value = mock_instance
+        
+        response = client.post(
+            "/api/v1/projects/test-jobs",
+            headers=auth_headers,
+            json={"project_ids": ["proj-1"]}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] == 3
+        assert data["status_counts"] == {"Pass": 2, "Fail": 1}
+        assert data["test_jobs"][0]["test_tool_key_list"] == ["tool-a"]
+        assert data["test_jobs"][1]["test_status"] == "Fail"
+
+
+class TestSnapshotSource:
+    """測試 source=snapshot 以本地快照回應"""
+    
+    @pytest.fixture
+    def snapshot_store(self):
+        """已同步專案與測試工作的記憶體快照"""
+        store = SnapshotStore(":memory:")
+        store.sync_rows(PROJECTS, ALL_SCOPE, PROJECTS_RESPONSE["data"], key=lambda p: p["projectUid"])
+        store.sync_rows(TEST_JOBS, "proj-1", [{"testJobId": "j1", "fw": "FW1"}], key=lambda job: job["testJobId"])
+        with patch("app.routers.projects.get_snapshot_store", return_value=store):
+            yield store
+        store.close()
+    
+    @patch("app.routers.projects.SAFClient")
+    def test_get_projects_from_snapshot(self, mock_client_class, client, auth_headers, snapshot_store):
+        """測試專案列表由快照回應，不呼叫 SAF"""
+        mock_instance = AsyncMock()
+        mock_client_class.return_value = mock_instance
+        
+        response = client.get(
+            "/api/v1/projects?source=snapshot&size=1",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["data"]["total"] == len(PROJECTS_RESPONSE["data"])
+        assert len(body["data"]["data"]) == 1
+        assert body["cache"]["source"] == "snapshot"
+        mock_instance.get_all_projects.assert_not_called()
+    
+    def test_test_jobs_from_snapshot(self, client, auth_headers, snapshot_store):
+        """測試測試工作由快照回應"""
+        response = client.post(
+            "/api/v1/projects/test-jobs?source=snapshot",
+            headers=auth_headers,
+            json={"project_ids": ["proj-1"]}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["cache"]["source"] == "snapshot"
+    
+    def test_snapshot_not_synced(self, client, auth_headers, snapshot_store):
+        """測試尚未同步的範圍返回 404"""
+        response = client.get(
+            "/api/v1/projects/proj-1/firmwares?source=snapshot",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 404
+        assert response.json()["detail"]["error_code"] == "SNAPSHOT_NOT_FOUND"
+    
+    def test_snapshot_disabled(self, client, auth_headers):
+        """測試未啟用快照時返回 503"""
+        with patch("app.routers.projects.get_snapshot_store", return_value=None):
+            response = client.get(
+                "/api/v1/projects?source=snapshot",
+                headers=auth_headers
+            )
+        
+        assert response.status_code == 503
+        assert response.json()["detail"]["error_code"] == "SNAPSHOT_UNAVAILABLE"
+    
+    def test_search_test_status_from_index(self, client, auth_headers, snapshot_store):
+        """測試測試狀態搜尋由倒排索引回應並轉換為 snake_case"""
+        index = TestStatusIndex()
+        index.rebuild([
+            {"testJobId": "j1", "projectName": "Springsteen", "testStatus": "PASS"},
+            {"testJobId": "j2", "projectName": "Springsteen", "testStatus": "FAIL"},
+        ])
+        
+        with patch("app.routers.projects.get_test_status_index", return_value=index):
+            response = client.post(
+                "/api/v1/projects/test-status/search?source=snapshot",
+                headers=auth_headers,
+                json={"query": 'projectName = "Springsteen" AND testStatus = "FAIL"'}
+            )
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["data"]["total"] == 1
+        assert body["data"]["items"][0]["test_job_id"] == "j2"
+        assert body["cache"]["source"] == "snapshot"
+    
+    def test_search_test_status_invalid_query(self, client, auth_headers, snapshot_store):
+        """測試索引不支援的查詢返回 400"""
+        index = TestStatusIndex()
+        index.rebuild([])
+        
+        with patch("app.routers.projects.get_test_status_index", return_value=index):
+            response = client.post(
+                "/api/v1/projects/test-status/search?source=snapshot",
+                headers=auth_headers,
+                json={"query": 'unknown = "x"'}
+            )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "INVALID_QUERY"
+    
+    def test_search_test_status_index_not_built(self, client, auth_headers, snapshot_store):
+        """測試索引尚未建立時返回 404"""
+        with patch("app.routers.projects.get_test_status_index", return_value=TestStatusIndex()):
+            response = client.post(
+                "/api/v1/projects/test-status/search?source=snapshot",
+                headers=auth_headers,
+                json={"query": 'testStatus = "PASS"'}
+            )
+        
+        assert response.status_code == 404
@@ -0,0 +1,115 @@
+"""
+測試快取模組
+"""
+
+import pytest
+
+from lib.cache import (
+    CacheEntry,
+    MemoryLRUBackend,
+    TTLCache,
+    get_cache_status,
+    make_cache_key,
+    set_cache_status,
+)
+
+
+class TestCacheEntry:
+    """測試快取項目"""
+    
+    def test_expiry(self):
+        """測試到期判斷"""
+        entry = CacheEntry("value", ttl=10, stored_at=100.0)
+        
+        assert entry.expires_at == 110.0
+        assert entry.is_expired(now=105.0) is False
+        assert entry.is_expired(now=110.0) is True
+        assert entry.age(now=104.0) == 4.0
+    
+    def test_stale_within_grace(self):
+        """測試超過 ttl 後在 grace 內為過時但未過期"""
+        entry = CacheEntry("value", ttl=10, stored_at=100.0, grace=50)
+        
+        assert entry.expires_at == 160.0
+        assert entry.is_stale(now=105.0) is False
+        assert entry.is_stale(now=115.0) is True
+        assert entry.is_expired(now=115.0) is False
+        assert entry.is_expired(now=160.0) is True
+
+
+class TestMemoryLRUBackend:
+    """測試記憶體 LRU 後端"""
+    
+    def test_evicts_least_recently_used(self):
+        """測試超過容量時淘汰最久未使用的項目"""
+        backend = MemoryLRUBackend(max_entries=2)
+        backend.set("a", CacheEntry(1, ttl=60))
+        backend.set("b", CacheEntry(2, ttl=60))
+        
+        # 存取 a 使 b 成為最久未使用
+        backend.get("a")
+        backend.set("c", CacheEntry(3, ttl=60))
+        
+        assert len(backend) == 2
+        assert backend.get("b") is None
+        assert backend.get("a").value == 1
+        assert backend.get("c").value == 3
+    
+    def test_invalid_capacity(self):
+        """測試容量必須大於 0"""
+        with pytest.raises(ValueError):
+            MemoryLRUBackend(max_entries=0)
+
+
+class TestTTLCache:
+    """測試 TTL 快取"""
+    
+    def test_hit_and_miss(self):
+        """測試命中與未命中統計"""
+        cache = TTLCache()
+        cache.set("key", {"a": 1}, ttl=60)
+        
+        assert cache.get("key").value == {"a": 1}
+        assert cache.get("missing") is None
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    
+    def test_expired_entry_is_miss(self):
+        """測試過期項目視為不存在"""
+        cache = TTLCache()
+        cache.set("key", "value", ttl=0)
+        
+        assert cache.get("key") is None
+    
+    def test_clear(self):
+        """測試清除"""
+        cache = TTLCache()
+        cache.set("key", "value", ttl=60)
+        cache.clear()
+        
+        assert cache.get("key") is None
+        assert len(cache.backend) == 0
+
+
+class TestMakeCacheKey:
+    """測試快取 key 產生"""
+    
+    def test_key_is_order_independent(self):
+        """測試 dict 參數順序不影響 key"""
+        key1 = make_cache_key("method", {"a": 1, "b": 2})
+        key2 = make_cache_key("method", {"b": 2, "a": 1})
+        assert key1 == key2
+    
+    def test_key_differs_by_namespace_and_args(self):
+        """測試不同方法或參數得到不同 key"""
+        assert make_cache_key("m1", {"a": 1}) != make_cache_key("m2", {"a": 1})
+        assert make_cache_key("m1", {"a": 1}) != make_cache_key("m1", {"a": 2})
+
+
+class TestCacheStatus:
+    """測試快取狀態 context"""
+    
+    def test_set_and_get(self):
+        """測試記錄的狀態會四捨五入資料年齡"""
+        set_cache_status(hit=True, age=12.34567, stale=True)
+        
+        assert get_cache_status() == {"hit": True, "age": 12.346, "stale": True}
@@ -0,0 +1,155 @@
+"""
+測試快取預熱與請求活動追蹤
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.activity import RequestActivity
+from app.services.cache_warmer import CacheWarmer
+from lib.exceptions import SAFAPIError
+
+
+class TestRequestActivity:
+    """測試請求活動追蹤"""
+
+    def test_in_flight(self):
+        """測試進行中請求數"""
+        activity = RequestActivity()
+
+        activity.begin(now=0.0)
+        activity.begin(now=0.0)
+        activity.end()
+
+        assert activity.in_flight == 1
+
+    def test_frequency_decays(self):
+        """測試請求頻率每經過 half_life 衰減一半"""
+        activity = RequestActivity(half_life=10.0)
+
+        activity.begin(["uid-1"], now=0.0)
+        activity.begin(["uid-1"], now=0.0)
+
+        assert activity.frequency("uid-1", now=0.0) == 2.0
+        assert activity.frequency("uid-1", now=10.0) == pytest.approx(1.0)
+        assert activity.frequency("unknown", now=10.0) == 0.0
+
+    def test_prune_keeps_most_frequent(self):
+        """測試超過上限時保留頻率最高的 key"""
+        activity = RequestActivity(max_keys=4)
+        for _ in range(3):
+            activity.begin(["hot"], now=0.0)
+        for key in ("a", "b", "c", "d"):
+            activity.begin([key], now=0.0)
+
+        assert activity.stats()["tracked_keys"] <= 4
+        assert activity.frequency("hot", now=0.0) == 3.0
+
+
+def _catalog():
+    """模擬 iter_all_projects：一個啟用中專案 (含 children) 與一個停用專案"""
+    async def iter_all_projects(user_id, username):
+        yield {
+            "total": 2,
+            "data": [
+                {
+                    "projectId": "proj-1",
+                    "projectUid": "uid-1",
+                    "visible": True,
+                    "status": 0,
+                    "children": [
+                        {"projectId": "proj-1", "projectUid": "uid-1-fw", "visible": True, "status": 0},
+                    ],
+                },
+                {"projectId": "proj-2", "projectUid": "uid-2", "visible": False, "status": 0},
+            ],
+        }
+    return iter_all_projects
+
+
+class TestCacheWarmer:
+    """測試快取預熱"""
+
+    @pytest.fixture
+    def mock_client(self):
+        """模擬 SAF Client"""
+        client = AsyncMock()
+        client.login_with_config.return_value = {"id": 150, "name": "svc"}
+        client.iter_all_projects = _catalog()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_warms_active_projects(self, test_settings, mock_client):
+        """測試預熱啟用中專案的儀表板與測試摘要 (不重複)"""
+        warmer = CacheWarmer(test_settings, mock_client, RequestActivity())
+
+        count = await warmer.run_once()
+
+        assert count == 3
+        mock_client.get_project_dashboard.assert_awaited_once_with(150, "svc", project_id="proj-1")
+        warmed_uids = {
+            call.kwargs["project_uid"] for call in mock_client.get_project_test_summary.await_args_list
+        }
+        assert warmed_uids == {"uid-1", "uid-1-fw"}
+        assert warmer.stats()["warmed"] == 3
+        assert warmer.stats()["cycles"] == 1
+
+    @pytest.mark.asyncio
+    async def test_priority_by_request_frequency(self, test_settings, mock_client):
+        """測試依近期請求頻率排序並限制預熱數量"""
+        test_settings.saf_warmer_max_targets = 1
+        test_settings.saf_warmer_concurrency = 1
+        activity = RequestActivity()
+        activity.begin(["uid-1-fw"])
+        activity.end()
+        warmer = CacheWarmer(test_settings, mock_client, activity)
+
+        await warmer.run_once()
+
+        mock_client.get_project_dashboard.assert_not_awaited()
+        mock_client.get_project_test_summary.assert_awaited_once_with(150, "svc", project_uid="uid-1-fw")
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self, test_settings, mock_client):
+        """測試單一項目失敗不中斷預熱"""
+        mock_client.get_project_dashboard.side_effect = SAFAPIError("boom", status_code=500)
+        warmer = CacheWarmer(test_settings, mock_client, RequestActivity())
+
+        await warmer.run_once()
+
+        assert warmer.stats()["failed"] == 1
+        assert warmer.stats()["warmed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_backs_off_when_busy(self, test_settings, mock_client):
+        """測試互動請求過多時退避"""
+        test_settings.saf_warmer_busy_threshold = 1
+        activity = RequestActivity()
+        activity.begin()
+        warmer = CacheWarmer(test_settings, mock_client, activity)
+
+        async def quiet_down(delay):
+            activity.end()
+
+        with patch("app.services.cache_warmer.asyncio.sleep", side_effect=quiet_down) as mock_sleep:
+            await warmer.run_once()
+
+        assert mock_sleep.await_count >= 1
+        assert warmer.stats()["backoffs"] >= 1
+        assert warmer.stats()["warmed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, test_settings, mock_client):
+        """測試啟動與停止背景工作"""
+        test_settings.saf_warmer_initial_delay = 0
+        warmer = CacheWarmer(test_settings, mock_client, RequestActivity())
+
+        warmer.start()
+        assert warmer.is_running
+        await asyncio.sleep(0.01)
+        await warmer.stop()
+
+        assert not warmer.is_running
+        mock_client.login_with_config.assert_awaited()
@@ -0,0 +1,151 @@
+"""
+測試 SAF 共用連線池
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.config import Settings
+from app.services import connection_pool
+from app.services.connection_pool import (
+    SAFConnectionPool,
+    close_connection_pool,
+    get_connection_pool,
+    init_connection_pool,
+)
+
+
+class TestSAFConnectionPool:
+    """測試 SAFConnectionPool"""
+    
+    @pytest.fixture
+    def pool_settings(self):
+        """連線池測試用設定"""
+        return Settings(
+            saf_pool_max_connections=5,
+            saf_pool_max_keepalive_connections=2,
+            saf_pool_keepalive_expiry=10.0,
+            _env_file=None
+        )
+    
+    @pytest.mark.asyncio
+    async def test_start_creates_client_per_target(self, pool_settings):
+        """測試啟動後每個上游主機各有一個客戶端"""
+        pool = SAFConnectionPool(pool_settings)
+        await pool.start()
+        
+        try:
+            assert pool.is_started
+            assert pool.get("login") is not pool.get("api")
+        finally:
+            await pool.close()
+        
+        assert not pool.is_started
+    
+    @pytest.mark.asyncio
+    async def test_limits_follow_settings(self, pool_settings):
+        """測試連線數限制來自設定"""
+        pool = SAFConnectionPool(pool_settings)
+        limits = pool._build_limits()
+        
+        assert limits.max_connections == 5
+        assert limits.max_keepalive_connections == 2
+        assert limits.keepalive_expiry == 10.0
+    
+    @pytest.mark.asyncio
+    async def test_borrow_does_not_close_client(self, pool_settings):
+        """測試借用結束後客戶端仍可使用"""
+        pool = SAFConnectionPool(pool_settings)
+        await pool.start()
+        
+        try:
+            async with pool.borrow("api") as client:
+                pass
+            assert not client.is_closed
+        finally:
+            await pool.close()
+        
+        assert client.is_closed
+    
+    def test_get_before_start_raises(self, pool_settings):
+        """測試未啟動時取得客戶端會失敗"""
+        pool = SAFConnectionPool(pool_settings)
+        
+        with pytest.raises(RuntimeError):
+            pool.get("api")
+
+
+class TestConnectionPoolLifecycle:
+    """測試應用程式層級連線池的建立與關閉"""
+    
+    @pytest.mark.asyncio
+    async def test_init_and_close(self):
+        """測試建立後可取得，關閉後移除"""
+        settings = Settings(_env_file=None)
+        
+        pool = await init_connection_pool(settings)
+        try:
+            assert pool is not None
+            assert get_connection_pool() is pool
+        finally:
+            await close_connection_pool()
+        
+        assert get_connection_pool() is None
+    
+    @pytest.mark.asyncio
+    async def test_disabled_pool(self):
+        """測試停用連線池時不建立"""
+        settings = Settings(saf_pool_enabled=False, _env_file=None)
+        
+        assert await init_connection_pool(settings) is None
+        assert connection_pool._pool is None
+
+
+class TestHTTP2Mode:
+    """測試 HTTP/2 傳輸模式"""
+    
+    def test_http2_disabled_by_default(self):
+        """測試預設使用 HTTP/1.1"""
+        pool = SAFConnectionPool(Settings(_env_file=None))
+        assert pool.http2 is False
+    
+    def test_fallback_without_h2_package(self, monkeypatch):
+        """測試未安裝 h2 時退回 HTTP/1.1"""
+        monkeypatch.setattr(connection_pool, "HTTP2_AVAILABLE", False)
+        pool = SAFConnectionPool(Settings(saf_http2_enabled=True, _env_file=None))
+        assert pool.http2 is False
+    
+    @pytest.mark.asyncio
+    async def test_stream_limit_caps_concurrent_borrows(self, monkeypatch):
+        """測試同時借用數不超過 max_concurrent_streams"""
+        monkeypatch.setattr(connection_pool, "HTTP2_AVAILABLE", True)
+        monkeypatch.setattr(SAFConnectionPool, "_build_client", lambda self, target: AsyncMock())
+        settings = Settings(
+            saf_http2_enabled=True,
+            saf_http2_max_concurrent_streams=2,
+            _env_file=None
+        )
+        pool = SAFConnectionPool(settings)
+        await pool.start()
+        
+        release = asyncio.Event()
+        
+        async def hold():
+            async with pool.borrow("api"):
+                await release.wait()
+        
+        tasks = [asyncio.create_task(hold()) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        
+        assert pool.stats()["targets"]["api"]["in_flight"] == 2
+        
+        release.set()
+        await asyncio.gather(*tasks)
+        
+        stats = pool.stats()
+        assert stats["http2"] is True
+        assert stats["max_concurrent_streams"] == 2
+        assert stats["targets"]["api"]["in_flight"] == 0
+        assert stats["targets"]["api"]["peak_in_flight"] == 2
@@ -0,0 +1,111 @@
+"""
+測試全域錯誤處理中介軟體
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middlewares.error_handler import ErrorHandlerMiddleware
+from lib.exceptions import InternalAPIException
+
+
+@pytest.fixture
+def app():
+    """掛上錯誤處理中介軟體的測試應用"""
+    app = FastAPI()
+    app.add_middleware(ErrorHandlerMiddleware)
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/internal")
+    async def internal():
+        raise InternalAPIException("boom", code="SAF_API_ERROR")
+
+    @app.get("/unexpected")
+    async def unexpected():
+        raise RuntimeError("boom")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/stream-error")
+    async def stream_error():
+        async def chunks():
+            yield "first\n"
+            raise RuntimeError("boom")
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+async def _call(app, path):
+    """直接以 ASGI 呼叫應用，返回送出的所有訊息"""
+    messages = []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+class TestErrorHandlerMiddleware:
+    """測試錯誤處理中介軟體"""
+
+    def test_passes_through(self, app):
+        """測試正常回應不受影響"""
+        response = TestClient(app).get("/ok")
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True}
+
+    def test_internal_api_exception(self, app):
+        """測試 InternalAPIException 轉為統一錯誤格式"""
+        response = TestClient(app).get("/internal")
+
+        assert response.status_code == 500
+        body = response.json()
+        assert body["success"] is False
+        assert body["message"] == "boom"
+        assert body["error_code"] == "SAF_API_ERROR"
+
+    def test_unexpected_exception(self, app):
+        """測試未預期的例外不洩漏內部訊息"""
+        response = TestClient(app).get("/unexpected")
+
+        assert response.status_code == 500
+        assert response.json()["message"] == "An unexpected error occurred"
+        assert response.json()["error_code"] == "INTERNAL_ERROR"
+
+    def test_streaming_is_not_buffered(self, app):
+        """測試串流回應逐段轉送"""
+        messages = asyncio.run(_call(app, "/stream"))
+
+        bodies = [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+        assert bodies == [b"chunk-0\n", b"chunk-1\n", b"chunk-2\n"]
+
+    def test_error_after_response_started_is_raised(self, app):
+        """測試回應開始後的例外不會再送出錯誤回應"""
+        messages = []
+        with pytest.raises(RuntimeError):
+            messages = asyncio.run(_call(app, "/stream-error"))
+
+        assert not any(m.get("status") == 500 for m in messages)
@@ -0,0 +1,115 @@
+"""
+測試測試工作欄式表
+"""
+
+from app.services.job_table import DictionaryColumn, JobTable
+
+
+def _job(job_id, status="Pass", platform="NB-1", tools=None, **extra):
+    """建立 SAF 原始格式的測試工作"""
+    return {
+        "testJobId": job_id,
+        "fw": "FW1",
+        "testPlanName": "Plan A",
+        "testCategoryName": "Category",
+        "rootId": "root-1",
+        "testItemName": "Item",
+        "testStatus": status,
+        "sampleId": "SSD-1",
+        "capacity": "1TB",
+        "platform": platform,
+        "testToolKeyList": tools if tools is not None else ["tool-a"],
+        **extra,
+    }
+
+
+class TestDictionaryColumn:
+    """測試字典編碼欄位"""
+
+    def test_interns_repeated_values(self):
+        """測試重複值共用同一個代碼"""
+        column = DictionaryColumn()
+        for value in ["Pass", "Fail", "Pass", "Pass"]:
+            column.append(value)
+
+        assert column.values == ["Pass", "Fail"]
+        assert list(column.codes) == [0, 1, 0, 0]
+        assert column.count() == {"Pass": 3, "Fail": 1}
+        assert column.rows_equal(0) == [0, 2, 3]
+
+    def test_widens_codes(self):
+        """測試不重複值超過 256 與 65536 時加寬代碼 array"""
+        column = DictionaryColumn()
+        for value in range(70000):
+            column.append(value)
+        column.append(257)
+
+        assert column.codes.typecode == "I"
+        assert column[256] == 256
+        assert column[69999] == 69999
+        assert column.rows_equal(257) == [257, 70000]
+        assert column.count()[257] == 2
+
+
+class TestJobTable:
+    """測試欄式表"""
+
+    def test_rows_match_response_format(self):
+        """測試輸出格式與 /projects/test-jobs 的 test_jobs 相同"""
+        table = JobTable.from_jobs([_job("j1", tools=["tool-a", "tool-b"]), {"testJobId": "j2"}])
+
+        assert len(table) == 2
+        assert table.rows() == [
+            {
+                "test_job_id": "j1",
+                "fw": "FW1",
+                "test_plan_name": "Plan A",
+                "test_category_name": "Category",
+                "root_id": "root-1",
+                "test_item_name": "Item",
+                "test_status": "Pass",
+                "sample_id": "SSD-1",
+                "capacity": "1TB",
+                "platform": "NB-1",
+                "test_tool_key_list": ["tool-a", "tool-b"],
+            },
+            {
+                "test_job_id": "j2",
+                "fw": "",
+                "test_plan_name": "",
+                "test_category_name": "",
+                "root_id": "",
+                "test_item_name": "",
+                "test_status": "",
+                "sample_id": "",
+                "capacity": "",
+                "platform": "",
+                "test_tool_key_list": [],
+            },
+        ]
+        assert table.row(1) == table.rows()[1]
+
+    def test_filters_and_counts(self):
+        """測試以整數代碼篩選與計數"""
+        table = JobTable.from_jobs([
+            _job("j1", status="Pass", platform="NB-1", tools=["tool-a"]),
+            _job("j2", status="Fail", platform="NB-2", tools=["tool-b"]),
+            _job("j3", status="Pass", platform="NB-2", tools=["tool-a", "tool-b"]),
+        ])
+
+        assert table.count_by("test_status") == {"Pass": 2, "Fail": 1}
+        assert table.where("platform", "NB-2") == [1, 2]
+        assert table.where("platform", "unknown") == []
+        assert table.with_tool_key("tool-b") == [1, 2]
+        assert [row["test_job_id"] for row in table.rows(table.where("test_status", "Pass"))] == ["j1", "j3"]
+
+    def test_stats(self):
+        """測試大小資訊"""
+        table = JobTable.from_jobs(_job(f"j{i}", status=["Pass", "Fail"][i % 2]) for i in range(1000))
+
+        stats = table.stats()
+
+        assert stats["rows"] == 1000
+        assert stats["distinct"]["test_status"] == 2
+        # 1 byte 代碼 x 9 欄 + tool key 代碼與 offsets
+        assert stats["array_bytes"] < 1000 * 20
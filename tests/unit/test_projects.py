@@ -10,6 +10,8 @@ from app.routers.projects import (
     _parse_percentage_string,
     _parse_fraction_string,
     _transform_firmware_summary,
+    _build_projection,
+    _project,
 )
 
 
@@ -829,4 +831,47 @@ class TestTransformFullSummary:
         assert result["project_id"] == "empty-proj"
         assert result["total_firmwares"] == 0
         assert result["firmwares"] == []
-        assert result["aggregated_stats"]["total_passed"] == 0
\ No newline at end of file
+        assert result["aggregated_stats"]["total_passed"] == 0
+
+
+class TestFieldProjection:
+    """測試檢視欄位投影"""
+    
+    def test_build_projection(self):
+        """測試依檢視建立投影樹"""
+        projections = _build_projection([
+            "summary.summary.overall_total",
+            "summary.project_uid",
+            "firmware.overview",
+        ])
+        
+        assert projections == {
+            "summary": {"summary": {"overall_total": {}}, "project_uid": {}},
+            "firmware": {"overview": {}},
+        }
+    
+    def test_project_nested_fields(self):
+        """測試只保留指定的巢狀欄位並略過不存在的欄位"""
+        data = {
+            "project_uid": "uid-1",
+            "project_name": "Test",
+            "summary": {"overall_total": 10, "overall_pass_rate": 80.0},
+        }
+        
+        result = _project(data, {"summary": {"overall_total": {}}, "missing": {}})
+        
+        assert result == {"summary": {"overall_total": 10}}
+    
+    def test_project_list_elements(self):
+        """測試列表中的每個元素各自套用投影"""
+        data = {"categories": [{"name": "A", "total": 1}, {"name": "B", "total": 2}]}
+        
+        result = _project(data, {"categories": {"name": {}}})
+        
+        assert result == {"categories": [{"name": "A"}, {"name": "B"}]}
+    
+    def test_empty_projection_keeps_everything(self):
+        """測試空投影返回完整資料"""
+        data = {"a": 1, "b": {"c": 2}}
+        
+        assert _project(data, {}) is data
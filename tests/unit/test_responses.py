@@ -0,0 +1,66 @@
+"""
+測試快速 JSON 回應
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.models.schemas import APIResponse
+from app.responses import api_response, dumps
+from lib.utils import format_response
+
+
+def _validated(**kwargs):
+    """以 response_model 驗證後的 JSON 輸出 (原本的路徑)"""
+    return json.loads(APIResponse.model_validate(format_response(**kwargs)).model_dump_json())
+
+
+class TestDumps:
+    """測試序列化"""
+
+    def test_matches_pydantic_types(self):
+        """測試 datetime、set、Decimal 與非字串 key 的輸出與 pydantic 一致"""
+        data = {
+            "at": datetime(2025, 12, 17, 3, 40, tzinfo=timezone.utc),
+            "tags": {"a"},
+            "amount": Decimal("1.5"),
+            "counts": {1: 2},
+        }
+
+        assert json.loads(dumps(data)) == {
+            "at": "2025-12-17T03:40:00Z",
+            "tags": ["a"],
+            "amount": "1.5",
+            "counts": {"1": 2},
+        }
+
+    def test_large_int_falls_back(self):
+        """測試 orjson 無法處理的整數退回標準函式庫 json"""
+        assert dumps({"n": 1 << 70}) == b'{"n":1180591620717411303424}'
+
+
+class TestAPIResponse:
+    """測試略過驗證的 API 回應"""
+
+    def test_same_body_as_response_model(self):
+        """測試輸出與經 APIResponse 驗證後相同"""
+        kwargs = {"success": True, "data": {"items": [{"id": 1}], "total": 1}, "cache": {"hit": True, "age": 1.5}}
+
+        body = json.loads(api_response(**kwargs).body)
+        expected = _validated(**kwargs)
+
+        assert list(body) == list(expected)
+        assert body.pop("timestamp").endswith("Z")
+        expected.pop("timestamp")
+        assert body == expected
+        assert body["cache"] == {"hit": True, "age": 1.5, "stale": False, "source": None}
+        assert body["error_code"] is None
+
+    def test_without_cache(self):
+        """測試沒有快取狀態時 cache 為 null"""
+        response = api_response(success=True, data=[], status_code=201)
+
+        assert response.status_code == 201
+        assert response.media_type == "application/json"
+        assert json.loads(response.body)["cache"] is None
@@ -2,12 +2,16 @@
 測試 SAF Client
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
 
+from app.services.connection_pool import SAFConnectionPool
 from app.services.saf_client import SAFClient
 from app.config import Settings
+from lib.cache import TTLCache, get_cache_status
 from lib.exceptions import SAFAuthenticationError, SAFConnectionError, SAFAPIError
 
 
@@ -223,3 +227,441 @@ class TestSAFClient:
             
             assert "fws" in result
             assert len(result["fws"]) == 0
+
+
+class TestSAFClientPooled:
+    """測試 SAF Client 使用共用連線池"""
+    
+    @pytest.mark.asyncio
+    async def test_pooled_client_reuses_shared_client(
+        self, test_settings, mock_fws_by_project_id_response
+    ):
+        """測試多次呼叫共用同一個客戶端且不會關閉它"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_fws_by_project_id_response
+        
+        shared_client = AsyncMock()
+        shared_client.post.return_value = mock_response
+        
+        pool = SAFConnectionPool(test_settings)
+        pool._clients = {"login": AsyncMock(), "api": shared_client}
+        client = SAFClient(test_settings, pool=pool)
+        
+        for _ in range(3):
+            result = await client.get_fws_by_project_id(
+                user_id=150,
+                username="test_user",
+                project_id="proj-001"
+            )
+            assert len(result["fws"]) == 3
+        
+        assert shared_client.post.call_count == 3
+        shared_client.aclose.assert_not_called()
+        shared_client.__aexit__.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_login_uses_login_target(self, test_settings, mock_saf_login_response):
+        """測試登入使用登入 Port 的共用客戶端"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_saf_login_response
+        
+        login_client = AsyncMock()
+        login_client.post.return_value = mock_response
+        api_client = AsyncMock()
+        
+        pool = SAFConnectionPool(test_settings)
+        pool._clients = {"login": login_client, "api": api_client}
+        client = SAFClient(test_settings, pool=pool)
+        
+        result = await client.login("test_user", "test_pass")
+        
+        assert result["id"] == 150
+        login_client.post.assert_called_once()
+        api_client.post.assert_not_called()
+
+
+class TestSAFClientPagination:
+    """測試 SAF Client 自動分頁"""
+    
+    @staticmethod
+    def _fake_pages(total, tracker=None):
+        """依 page/size 產生專案頁面的 get_all_projects 替身"""
+        async def get_all_projects(user_id, username, page=1, size=50):
+            if tracker is not None:
+                tracker["active"] += 1
+                tracker["peak"] = max(tracker["peak"], tracker["active"])
+            await asyncio.sleep(0.01)
+            if tracker is not None:
+                tracker["active"] -= 1
+            start = (page - 1) * size
+            items = [{"projectUid": f"p{i}"} for i in range(start, min(start + size, total))]
+            return {"page": page, "size": size, "total": total, "data": items}
+        return get_all_projects
+    
+    @pytest.mark.asyncio
+    async def test_yields_every_page_in_order(self, test_settings):
+        """測試依序產出所有頁面"""
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, 'get_all_projects', side_effect=self._fake_pages(25)) as mock_get:
+            pages = [page async for page in client.iter_all_projects(150, "test_user", page_size=10)]
+        
+        assert [page["page"] for page in pages] == [1, 2, 3]
+        assert [p["projectUid"] for page in pages for p in page["data"]] == [f"p{i}" for i in range(25)]
+        assert mock_get.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_single_page(self, test_settings):
+        """測試只有一頁時不再查詢"""
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, 'get_all_projects', side_effect=self._fake_pages(5)) as mock_get:
+            pages = [page async for page in client.iter_all_projects(150, "test_user", page_size=10)]
+        
+        assert len(pages) == 1
+        assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, test_settings):
+        """測試並行查詢數不超過設定"""
+        test_settings.saf_pagination_concurrency = 3
+        tracker = {"active": 0, "peak": 0}
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, 'get_all_projects', side_effect=self._fake_pages(100, tracker)):
+            pages = [page async for page in client.iter_all_projects(150, "test_user", page_size=10)]
+        
+        assert len(pages) == 10
+        assert tracker["peak"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_early_exit_cancels_pending_pages(self, test_settings):
+        """測試提早結束時取消尚未完成的查詢"""
+        test_settings.saf_pagination_concurrency = 1
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, 'get_all_projects', side_effect=self._fake_pages(100)) as mock_get:
+            pages = client.iter_all_projects(150, "test_user", page_size=10)
+            first = await pages.__anext__()
+            await pages.aclose()
+        
+        assert first["page"] == 1
+        assert mock_get.call_count < 10
+
+
+class TestSAFClientTestStatusExport:
+    """測試 SAF Client 逐頁取得測試狀態"""
+    
+    @staticmethod
+    def _fake_search(total, calls):
+        """依 page/size 產生測試狀態頁面的 search_test_status 替身"""
+        async def search_test_status(user_id, username, query, page=1, size=50, sort=None):
+            calls.append(page)
+            await asyncio.sleep(0)
+            start = (page - 1) * size
+            items = [{"testJobId": f"job-{i}"} for i in range(start, min(start + size, total))]
+            return {"page": page, "size": size, "total": total, "items": items}
+        return search_test_status
+    
+    @pytest.mark.asyncio
+    async def test_yields_every_page(self, test_settings):
+        """測試依序取得所有頁面"""
+        calls = []
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, 'search_test_status', side_effect=self._fake_search(25, calls)):
+            pages = [page async for page in client.iter_test_status(150, "test_user", "q", page_size=10)]
+        
+        assert calls == [1, 2, 3]
+        assert sum(len(page["items"]) for page in pages) == 25
+    
+    @pytest.mark.asyncio
+    async def test_prefetches_next_page(self, test_settings):
+        """測試產出目前頁面時已開始查詢下一頁"""
+        calls = []
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, 'search_test_status', side_effect=self._fake_search(25, calls)):
+            pages = client.iter_test_status(150, "test_user", "q", page_size=10)
+            await pages.__anext__()
+            await asyncio.sleep(0)
+            
+            assert calls == [1, 2]
+            await pages.aclose()
+        
+        # 只預先查詢一頁
+        assert calls == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_stops_on_empty_page(self, test_settings):
+        """測試頁面為空時停止 (避免 total 不一致造成無限查詢)"""
+        client = SAFClient(test_settings)
+        empty = {"page": 1, "size": 10, "total": 50, "items": []}
+        
+        with patch.object(client, 'search_test_status', return_value=empty) as mock_search:
+            pages = [page async for page in client.iter_test_status(150, "test_user", "q", page_size=10)]
+        
+        assert len(pages) == 1
+        assert mock_search.call_count == 1
+
+
+class TestSAFClientCache:
+    """測試 SAF Client 回應快取"""
+    
+    @pytest.fixture
+    def mock_http_client(self, mock_project_test_summary_response):
+        """回傳固定測試摘要的 httpx 客戶端"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_project_test_summary_response
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.__aexit__.return_value = None
+        return mock_client
+    
+    @pytest.mark.asyncio
+    async def test_repeated_call_uses_cache(self, test_settings, mock_http_client):
+        """測試相同參數的第二次呼叫不會查詢 SAF"""
+        client = SAFClient(test_settings, cache=TTLCache())
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            first = await client.get_project_test_summary(150, "test_user", "uid-1")
+            second = await client.get_project_test_summary(150, "test_user", "uid-1")
+        
+        assert first is second
+        assert mock_http_client.post.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_key_includes_caller_identity(self, test_settings, mock_http_client):
+        """測試不同使用者不共用快取"""
+        client = SAFClient(test_settings, cache=TTLCache())
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            await client.get_project_test_summary(150, "test_user", "uid-1")
+            await client.get_project_test_summary(151, "other_user", "uid-1")
+            await client.get_project_test_summary(150, "test_user", "uid-2")
+        
+        assert mock_http_client.post.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self, test_settings, mock_http_client):
+        """測試 TTL 為 0 時不快取"""
+        test_settings.saf_cache_ttl_test_summary = 0
+        client = SAFClient(test_settings, cache=TTLCache())
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            await client.get_project_test_summary(150, "test_user", "uid-1")
+            await client.get_project_test_summary(150, "test_user", "uid-1")
+        
+        assert mock_http_client.post.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, test_settings):
+        """測試錯誤回應不會被快取"""
+        not_found = MagicMock()
+        not_found.status_code = 404
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = not_found
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.__aexit__.return_value = None
+        
+        cache = TTLCache()
+        client = SAFClient(test_settings, cache=cache)
+        
+        with patch.object(client, '_get_client', return_value=mock_client):
+            for _ in range(2):
+                with pytest.raises(SAFAPIError):
+                    await client.get_project_test_summary(150, "test_user", "missing")
+        
+        assert mock_client.post.call_count == 2
+        assert len(cache.backend) == 0
+    
+    @pytest.mark.asyncio
+    async def test_test_job_table_is_cached(self, test_settings):
+        """測試測試工作欄式表建立一次後由快取共用"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"testJobs": [
+            {"testJobId": "j1", "testStatus": "Pass"},
+            {"testJobId": "j2", "testStatus": "Fail"},
+        ]}
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.__aexit__.return_value = None
+        
+        client = SAFClient(test_settings, cache=TTLCache())
+        
+        with patch.object(client, '_get_client', return_value=mock_client):
+            first = await client.get_test_job_table(150, "test_user", ["proj-1"])
+            second = await client.get_test_job_table(150, "test_user", ["proj-1"])
+        
+        assert first is second
+        assert first.count_by("test_status") == {"Pass": 1, "Fail": 1}
+        assert mock_client.post.call_count == 1
+
+
+class TestSAFClientStaleWhileRevalidate:
+    """測試 SAF Client 的 stale-while-revalidate 模式"""
+    
+    @pytest.fixture
+    def mock_http_client(self, mock_project_test_summary_response):
+        """回傳固定測試摘要的 httpx 客戶端"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_project_test_summary_response
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.__aexit__.return_value = None
+        return mock_client
+    
+    @staticmethod
+    def _age_entries(cache, seconds):
+        """將所有快取項目的寫入時間往前移"""
+        for entry in cache.backend._entries.values():
+            entry.stored_at -= seconds
+    
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(self, test_settings, mock_http_client):
+        """測試超過 soft TTL 時立即返回舊資料並於背景更新"""
+        test_settings.saf_cache_ttl_test_summary = 60
+        test_settings.saf_cache_hard_ttl_test_summary = 600
+        cache = TTLCache()
+        client = SAFClient(test_settings, cache=cache)
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            first = await client.get_project_test_summary(150, "test_user", "uid-1")
+            assert get_cache_status() == {"hit": False, "age": 0.0, "stale": False}
+            
+            self._age_entries(cache, 120)
+            second = await client.get_project_test_summary(150, "test_user", "uid-1")
+            status = get_cache_status()
+            
+            assert second is first
+            assert status["hit"] is True
+            assert status["stale"] is True
+            assert status["age"] >= 120
+            
+            # 等待背景更新完成
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+        
+        assert mock_http_client.post.call_count == 2
+        
+        # 背景更新已寫入新的項目
+        await client.get_project_test_summary(150, "test_user", "uid-1")
+        assert mock_http_client.post.call_count == 2
+        assert get_cache_status()["stale"] is False
+    
+    @pytest.mark.asyncio
+    async def test_past_hard_ttl_blocks(self, test_settings, mock_http_client):
+        """測試超過 hard TTL 時等待上游查詢"""
+        test_settings.saf_cache_ttl_test_summary = 60
+        test_settings.saf_cache_hard_ttl_test_summary = 600
+        cache = TTLCache()
+        client = SAFClient(test_settings, cache=cache)
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            await client.get_project_test_summary(150, "test_user", "uid-1")
+            self._age_entries(cache, 601)
+            await client.get_project_test_summary(150, "test_user", "uid-1")
+        
+        assert mock_http_client.post.call_count == 2
+        assert get_cache_status()["hit"] is False
+    
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self, test_settings, mock_http_client):
+        """測試背景更新失敗時保留舊資料"""
+        test_settings.saf_cache_hard_ttl_test_summary = 600
+        cache = TTLCache()
+        client = SAFClient(test_settings, cache=cache)
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            first = await client.get_project_test_summary(150, "test_user", "uid-1")
+        
+        self._age_entries(cache, 120)
+        mock_http_client.post.side_effect = httpx.ConnectError("down")
+        
+        with patch.object(client, '_get_client', return_value=mock_http_client):
+            second = await client.get_project_test_summary(150, "test_user", "uid-1")
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            
+            # 背景更新失敗後仍返回舊資料
+            third = await client.get_project_test_summary(150, "test_user", "uid-1")
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+        
+        assert second is first
+        assert third is first
+        assert mock_http_client.post.call_count == 3
+        assert len(cache.backend) == 1
+
+
+class TestSAFClientSingleFlight:
+    """測試 SAF Client 合併相同的並行呼叫"""
+    
+    @pytest.fixture
+    def slow_http_client(self, mock_project_test_summary_response):
+        """延遲回應的 httpx 客戶端"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_project_test_summary_response
+        
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = slow_post
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.__aexit__.return_value = None
+        return mock_client
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_coalesce(self, test_settings, slow_http_client):
+        """測試並行的相同呼叫只查詢 SAF 一次 (不需快取)"""
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, '_get_client', return_value=slow_http_client):
+            results = await asyncio.gather(*(
+                client.get_project_test_summary(150, "test_user", "uid-1")
+                for _ in range(4)
+            ))
+        
+        assert slow_http_client.post.call_count == 1
+        assert all(result is results[0] for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_different_users_are_not_coalesced(self, test_settings, slow_http_client):
+        """測試不同使用者的呼叫不合併"""
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, '_get_client', return_value=slow_http_client):
+            await asyncio.gather(
+                client.get_project_test_summary(150, "test_user", "uid-1"),
+                client.get_project_test_summary(151, "other_user", "uid-1"),
+            )
+        
+        assert slow_http_client.post.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_disabled_singleflight(self, test_settings, slow_http_client):
+        """測試停用時每個呼叫各自查詢"""
+        test_settings.saf_singleflight_enabled = False
+        client = SAFClient(test_settings)
+        
+        with patch.object(client, '_get_client', return_value=slow_http_client):
+            await asyncio.gather(*(
+                client.get_project_test_summary(150, "test_user", "uid-1")
+                for _ in range(3)
+            ))
+        
+        assert slow_http_client.post.call_count == 3
@@ -0,0 +1,122 @@
+"""
+測試 Single-flight 請求合併
+"""
+
+import asyncio
+
+import pytest
+
+from lib.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """測試 SingleFlight"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """測試並行的相同 key 只執行一次"""
+        group = SingleFlight()
+        calls = 0
+        
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+        
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+        
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert len(group) == 0
+    
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """測試不同 key 各自執行"""
+        group = SingleFlight()
+        calls = []
+        
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+        
+        results = await asyncio.gather(
+            group.do("a", lambda: fetch("a")),
+            group.do("b", lambda: fetch("b")),
+        )
+        
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+    
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(self):
+        """測試錯誤傳遞給所有等待者"""
+        group = SingleFlight()
+        
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+        
+        results = await asyncio.gather(
+            *(group.do("key", fetch) for _ in range(3)),
+            return_exceptions=True
+        )
+        
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(group) == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """測試單一等待者取消不影響其他等待者"""
+        group = SingleFlight()
+        
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+        
+        first = asyncio.create_task(group.do("key", fetch))
+        second = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0.01)
+        
+        first.cancel()
+        
+        assert await second == "done"
+        assert first.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_all_waiters_cancelled_cancels_call(self):
+        """測試所有等待者取消時取消實際呼叫"""
+        group = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+        
+        async def fetch():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        waiter = asyncio.create_task(group.do("key", fetch))
+        await started.wait()
+        waiter.cancel()
+        
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert len(group) == 0
+    
+    @pytest.mark.asyncio
+    async def test_new_call_after_completion(self):
+        """測試呼叫結束後相同 key 會重新執行 (不快取結果)"""
+        group = SingleFlight()
+        calls = 0
+        
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+        
+        assert await group.do("key", fetch) == 1
+        assert await group.do("key", fetch) == 2
@@ -0,0 +1,237 @@
+"""
+測試本地快照儲存與增量同步
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.snapshot_store import (
+    ALL_SCOPE,
+    FIRMWARES,
+    KNOWN_ISSUES,
+    PROJECTS,
+    TEST_JOBS,
+    TEST_STATUS,
+    SnapshotStore,
+    SnapshotSyncer,
+)
+from app.services.test_status_index import TestStatusIndex
+from lib.exceptions import SAFAPIError
+
+
+def _ts(seconds):
+    """建立 SAF timestamp"""
+    return {"seconds": {"low": seconds}}
+
+
+def _project_key(project):
+    return project["projectUid"]
+
+
+@pytest.fixture
+def store():
+    """記憶體快照資料庫"""
+    snapshot = SnapshotStore(":memory:")
+    yield snapshot
+    snapshot.close()
+
+
+class TestSnapshotStoreSync:
+    """測試增量同步"""
+
+    def test_initial_sync_inserts_all(self, store):
+        """測試第一次同步寫入所有資料"""
+        items = [{"projectUid": "uid-1"}, {"projectUid": "uid-2"}]
+
+        counts = store.sync_rows(PROJECTS, ALL_SCOPE, items, key=_project_key)
+
+        assert counts == {"inserted": 2, "updated": 0, "deleted": 0, "unchanged": 0}
+        assert store.synced_at(PROJECTS) is not None
+
+    def test_hash_diff_only_writes_changes(self, store):
+        """測試沒有 updatedAt 時以內容雜湊比對，並刪除上游已不存在的列"""
+        store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "productName": "A"},
+            {"projectUid": "uid-2", "productName": "B"},
+            {"projectUid": "uid-3", "productName": "C"},
+        ], key=_project_key)
+
+        counts = store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "productName": "A"},
+            {"projectUid": "uid-2", "productName": "B2"},
+            {"projectUid": "uid-4", "productName": "D"},
+        ], key=_project_key)
+
+        assert counts == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        names = [project["productName"] for project in store.list_projects()["data"]]
+        assert names == ["A", "B2", "D"]
+
+    def test_updated_at_watermark(self, store):
+        """測試有 updatedAt 時只有較新的資料被寫入"""
+        store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "productName": "A", "updatedAt": _ts(1000)},
+        ], key=_project_key)
+
+        unchanged = store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "productName": "ignored", "updatedAt": _ts(1000)},
+        ], key=_project_key)
+        updated = store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "productName": "A2", "updatedAt": _ts(2000)},
+        ], key=_project_key)
+
+        assert unchanged["unchanged"] == 1
+        assert updated["updated"] == 1
+        assert store.list_projects()["data"][0]["productName"] == "A2"
+
+    def test_children_update_marks_parent_changed(self, store):
+        """測試 children 的 updatedAt 變新時父專案也會更新"""
+        store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "updatedAt": _ts(1000), "children": [{"projectUid": "c-1", "updatedAt": _ts(1000)}]},
+        ], key=_project_key)
+
+        counts = store.sync_rows(PROJECTS, ALL_SCOPE, [
+            {"projectUid": "uid-1", "updatedAt": _ts(1000), "children": [{"projectUid": "c-1", "updatedAt": _ts(3000)}]},
+        ], key=_project_key)
+
+        assert counts["updated"] == 1
+
+    def test_reorder_keeps_upstream_order(self, store):
+        """測試未變更但順序改變的列依上游順序返回"""
+        first = {"projectUid": "uid-1"}
+        second = {"projectUid": "uid-2"}
+        store.sync_rows(PROJECTS, ALL_SCOPE, [first, second], key=_project_key)
+
+        counts = store.sync_rows(PROJECTS, ALL_SCOPE, [second, first], key=_project_key)
+
+        assert counts["unchanged"] == 2
+        assert [p["projectUid"] for p in store.list_projects()["data"]] == ["uid-2", "uid-1"]
+
+
+class TestSnapshotStoreQueries:
+    """測試快照查詢"""
+
+    def test_unsynced_returns_none(self, store):
+        """測試從未同步的資料集返回 None"""
+        assert store.list_projects() is None
+        assert store.get_firmwares("proj-1") is None
+        assert store.list_known_issues() is None
+        assert store.list_test_jobs(["proj-1"]) is None
+
+    def test_list_projects_paging(self, store):
+        """測試專案列表分頁"""
+        store.sync_rows(
+            PROJECTS, ALL_SCOPE, [{"projectUid": f"uid-{i}"} for i in range(5)], key=_project_key
+        )
+
+        result = store.list_projects(page=2, size=2)
+
+        assert result["total"] == 5
+        assert [p["projectUid"] for p in result["data"]] == ["uid-2", "uid-3"]
+
+    def test_list_known_issues_filters(self, store):
+        """測試 Known Issues 的專案與停用篩選"""
+        store.sync_rows(KNOWN_ISSUES, ALL_SCOPE, [
+            {"id": "1", "projectId": "proj-1", "rootId": "r1", "isEnable": True},
+            {"id": "2", "projectId": "proj-1", "rootId": "r2", "isEnable": False},
+            {"id": "3", "projectId": "proj-2", "rootId": "r1", "isEnable": True},
+        ], key=lambda issue: issue["id"])
+
+        by_project = store.list_known_issues(project_id=["proj-1"])
+        enabled = store.list_known_issues(project_id=["proj-1"], show_disable=False)
+        by_root = store.list_known_issues(root_id=["r1"])
+
+        assert [issue["id"] for issue in by_project["items"]] == ["1", "2"]
+        assert [issue["id"] for issue in enabled["items"]] == ["1"]
+        assert [issue["id"] for issue in by_root["items"]] == ["1", "3"]
+
+    def test_list_test_jobs_requires_all_scopes(self, store):
+        """測試任一專案尚未同步時測試工作返回 None，並依測試工具篩選"""
+        store.sync_rows(TEST_JOBS, "proj-1", [
+            {"testJobId": "j1", "testToolKeyList": ["tool-a"]},
+            {"testJobId": "j2", "testToolKeyList": ["tool-b"]},
+        ], key=lambda job: job["testJobId"])
+
+        assert store.list_test_jobs(["proj-1", "proj-2"]) is None
+        result = store.list_test_jobs(["proj-1"], test_tool_key="tool-b")
+        assert [job["testJobId"] for job in result["testJobs"]] == ["j2"]
+
+    def test_retain_scopes(self, store):
+        """測試刪除不再需要的同步範圍"""
+        store.sync_rows(TEST_JOBS, "proj-1", [{"testJobId": "j1"}], key=lambda job: job["testJobId"])
+        store.sync_rows(TEST_JOBS, "proj-2", [{"testJobId": "j2"}], key=lambda job: job["testJobId"])
+
+        deleted = store.retain_scopes(TEST_JOBS, ["proj-1"])
+
+        assert deleted == 1
+        assert store.synced_at(TEST_JOBS, "proj-2") is None
+        assert [job["testJobId"] for job in store.all_payloads(TEST_JOBS)] == ["j1"]
+
+    def test_stats(self, store):
+        """測試統計資訊"""
+        store.sync_rows(TEST_JOBS, "proj-1", [{"testJobId": "j1"}], key=lambda job: job["testJobId"])
+        store.sync_rows(TEST_JOBS, "proj-2", [{"testJobId": "j2"}], key=lambda job: job["testJobId"])
+
+        stats = store.stats()
+
+        assert stats[TEST_JOBS]["scopes"] == 2
+        assert stats[TEST_JOBS]["rows"] == 2
+
+
+class TestSnapshotSyncer:
+    """測試快照同步工作"""
+
+    @pytest.fixture
+    def mock_client(self):
+        """模擬 SAF Client"""
+        async def iter_all_projects(user_id, username):
+            yield {"data": [
+                {"projectId": "proj-1", "projectUid": "uid-1", "projectName": "Channel", "visible": True, "status": 0},
+                {"projectId": "proj-2", "projectUid": "uid-2", "projectName": "Hidden", "visible": False, "status": 0},
+            ]}
+
+        async def iter_test_status(user_id, username, query):
+            yield {"items": [
+                {"testJobId": "j1", "projectName": "Channel", "testStatus": "PASS"},
+                {"testJobId": "j2", "projectName": "Channel", "testStatus": "FAIL"},
+            ]}
+
+        client = AsyncMock()
+        client.login_with_config.return_value = {"id": 150, "name": "svc"}
+        client.iter_all_projects = iter_all_projects
+        client.iter_test_status = iter_test_status
+        client.list_known_issues.return_value = {"items": [{"id": "1", "projectId": "proj-1"}]}
+        client.get_fws_by_project_id.return_value = {"fws": [{"projectUid": "uid-1", "fw": "FW1"}]}
+        client.list_all_test_jobs.return_value = {"testJobs": [{"testJobId": "j1", "fw": "FW1"}]}
+        return client
+
+    @pytest.mark.asyncio
+    async def test_run_once_syncs_active_projects(self, test_settings, mock_client, store):
+        """測試同步專案、Known Issues 與啟用中專案的 Firmware / 測試工作 / 測試狀態"""
+        index = TestStatusIndex()
+        syncer = SnapshotSyncer(test_settings, mock_client, store, index)
+
+        changes = await syncer.run_once()
+
+        assert changes[PROJECTS]["inserted"] == 2
+        assert changes[KNOWN_ISSUES]["inserted"] == 1
+        mock_client.get_fws_by_project_id.assert_awaited_once_with(150, "svc", project_id="proj-1")
+        assert store.get_firmwares("proj-1") == {"fws": [{"projectUid": "uid-1", "fw": "FW1"}]}
+        assert store.list_test_jobs(["proj-1"])["testJobs"][0]["testJobId"] == "j1"
+        assert store.synced_at(FIRMWARES, "proj-2") is None
+        assert store.synced_at(TEST_STATUS, "Channel") is not None
+        assert index.search('testStatus = "PASS"')["total"] == 1
+
+        second = await syncer.run_once()
+        assert second[PROJECTS]["unchanged"] == 2
+
+    @pytest.mark.asyncio
+    async def test_project_failure_does_not_stop_cycle(self, test_settings, mock_client, store):
+        """測試單一專案同步失敗不中斷週期"""
+        mock_client.get_fws_by_project_id.side_effect = SAFAPIError("boom", status_code=500)
+        syncer = SnapshotSyncer(test_settings, mock_client, store, TestStatusIndex())
+
+        await syncer.run_once()
+
+        assert store.synced_at(FIRMWARES, "proj-1") is None
+        assert store.list_projects()["total"] == 2
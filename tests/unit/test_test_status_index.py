@@ -0,0 +1,100 @@
+"""
+測試測試狀態倒排索引
+"""
+
+import pytest
+
+from app.services.test_status_index import TestStatusIndex
+
+
+def _item(job_id, project="Springsteen", status="PASS", sample="SSD-1", fw="FW1"):
+    """建立 SAF 原始格式的測試狀態"""
+    return {
+        "testJobId": job_id,
+        "projectName": project,
+        "testStatus": status,
+        "sampleId": sample,
+        "fw": fw,
+    }
+
+
+@pytest.fixture
+def index():
+    """已建立的索引"""
+    test_index = TestStatusIndex()
+    test_index.rebuild([
+        _item("j1"),
+        _item("j2", status="FAIL"),
+        _item("j3", project="Channel"),
+        _item("j4", project="Channel", status="FAIL", sample="SSD-2"),
+        _item("j5", fw="FW2"),
+    ])
+    return test_index
+
+
+class TestTestStatusIndex:
+    """測試倒排索引查詢"""
+
+    def test_equality(self, index):
+        """測試等值查詢保留上游順序"""
+        result = index.search('projectName = "Springsteen"')
+
+        assert [item["testJobId"] for item in result["items"]] == ["j1", "j2", "j5"]
+        assert result["total"] == 3
+
+    def test_and_intersection(self, index):
+        """測試 AND 取交集"""
+        result = index.search('project_name = "Springsteen" AND testStatus = "PASS" AND fw = "FW1"')
+
+        assert [item["testJobId"] for item in result["items"]] == ["j1"]
+
+    def test_or_union(self, index):
+        """測試 OR 取聯集並依上游順序排序"""
+        result = index.search('sampleId = "SSD-2" OR fw = "FW2" OR testStatus = "FAIL"')
+
+        assert [item["testJobId"] for item in result["items"]] == ["j2", "j4", "j5"]
+
+    def test_pagination(self, index):
+        """測試分頁只返回該頁，total 為全部筆數"""
+        result = index.search('testStatus = "PASS"', page=2, size=2)
+
+        assert [item["testJobId"] for item in result["items"]] == ["j5"]
+        assert result["total"] == 3
+        assert result["page"] == 2
+
+    def test_parentheses_and_unindexed_field(self, index):
+        """測試括號分組與沒有 posting list 的欄位 (逐列比對)"""
+        index.rebuild([
+            {"testJobId": "j1", "testStatus": "PASS", "duration": 10},
+            {"testJobId": "j2", "testStatus": "FAIL", "duration": 10},
+            {"testJobId": "j3", "testStatus": "FAIL", "duration": 20},
+        ])
+
+        result = index.search('duration = "10" AND (testStatus = "FAIL" OR testStatus = "QUEUED")')
+
+        assert [item["testJobId"] for item in result["items"]] == ["j2"]
+
+    def test_no_match(self, index):
+        """測試沒有符合的資料"""
+        assert index.search('testStatus = "QUEUED" AND fw = "FW1"')["total"] == 0
+
+    def test_rebuild_replaces_and_dedupes(self, index):
+        """測試重建會替換內容並去除重複的 testJobId"""
+        rows = index.rebuild([_item("j9"), _item("j9", status="FAIL")])
+
+        assert rows == 1
+        assert index.search('testStatus = "FAIL"')["total"] == 0
+        assert index.stats()["rows"] == 1
+
+    def test_large_index_page_one(self):
+        """測試大量資料時以 posting list 取得第一頁"""
+        statuses = ["PASS", "FAIL", "ONGOING", "CANCEL"]
+        large = TestStatusIndex()
+        large.rebuild(
+            _item(f"j{i}", project=f"P{i % 5}", status=statuses[i % 4]) for i in range(100_000)
+        )
+
+        result = large.search('projectName = "P3" AND testStatus = "ONGOING"', size=50)
+
+        assert result["total"] == 5000
+        assert result["items"][0]["testJobId"] == "j18"
@@ -0,0 +1,117 @@
+"""
+測試測試狀態查詢編譯器
+"""
+
+import pytest
+
+from app.models import schemas
+from app.services.test_status_query import (
+    QUERY_FIELDS,
+    And,
+    Condition,
+    Or,
+    compile_query,
+    plan_cache_stats,
+)
+from lib.exceptions import ValidationError
+
+
+class TestParser:
+    """測試語法解析"""
+
+    def test_single_condition_with_alias(self):
+        """測試 camelCase 與 snake_case 欄位對應到同一個欄位"""
+        assert compile_query('projectName = "Springsteen"').root == Condition("project_name", "Springsteen")
+        assert compile_query('project_name = "Springsteen"').root == Condition("project_name", "Springsteen")
+
+    def test_and_binds_tighter_than_or(self):
+        """測試 AND 優先於 OR，關鍵字不分大小寫"""
+        root = compile_query('fw = "FW1" and testStatus = "PASS" OR sampleId = "SSD-2"').root
+
+        assert root == Or([
+            And([Condition("fw", "FW1"), Condition("test_status", "PASS")]),
+            Condition("sample_id", "SSD-2"),
+        ])
+
+    def test_parentheses_are_flattened(self):
+        """測試括號分組並攤平同類型的節點"""
+        root = compile_query('(fw = "A" AND (customer = "B" AND slot = "C")) AND (user = "x" OR user = "y")').root
+
+        assert root == And([
+            Condition("fw", "A"),
+            Condition("customer", "B"),
+            Condition("slot", "C"),
+            Or([Condition("user", "x"), Condition("user", "y")]),
+        ])
+
+    def test_escaped_quote(self):
+        """測試值中的跳脫引號，並在輸出時重新跳脫"""
+        plan = compile_query(r'testItem = "say \"hi\""')
+
+        assert plan.root == Condition("test_item", 'say "hi"')
+        assert plan.text == r'testItem = "say \"hi\""'
+
+    @pytest.mark.parametrize("query", [
+        '',
+        'unknownField = "x"',
+        'all_status = "PASS"',
+        'projectName = Springsteen',
+        'projectName = "a" projectName = "b"',
+        '(projectName = "a"',
+        'projectName = "a" AND',
+        'projectName != "a"',
+        'projectName = "unterminated',
+    ])
+    def test_invalid_queries(self, query):
+        """測試不合法的查詢在本地即被拒絕"""
+        with pytest.raises(ValidationError):
+            compile_query(query)
+
+    def test_query_fields_exist_in_schema(self):
+        """測試可查詢欄位皆為 TestStatusItem 的欄位"""
+        assert set(QUERY_FIELDS) <= set(schemas.TestStatusItem.model_fields)
+
+
+class TestPlanner:
+    """測試下推規劃"""
+
+    def test_single_pushable_condition(self):
+        """測試 SAF 支援的單一條件整個下推"""
+        plan = compile_query('  testStatus   =  "PASS" ')
+
+        assert plan.remote == 'testStatus = "PASS"'
+        assert plan.residual is None
+
+    def test_pushes_most_selective_condition(self):
+        """測試下推選擇性最高的條件，其餘在本地評估"""
+        plan = compile_query('testStatus = "PASS" AND sample_id = "SSD-1" AND fw = "FW1"')
+
+        assert plan.remote == 'sampleId = "SSD-1"'
+        assert plan.residual == And([Condition("test_status", "PASS"), Condition("fw", "FW1")])
+
+    def test_new_project_name_keeps_saf_spelling(self):
+        """測試 new_project_name 以 SAF 查詢語法的名稱下推"""
+        assert compile_query('newProjectName = "X"').remote == 'new_project_name = "X"'
+
+    def test_no_pushable_condition_forwards_whole_query(self):
+        """測試沒有可下推條件 (例如最上層為 OR) 時整個查詢交給 SAF"""
+        plan = compile_query('testStatus = "PASS" OR fw = "FW1"')
+
+        assert plan.remote == 'testStatus = "PASS" OR fw = "FW1"'
+        assert plan.residual is None
+
+    def test_residual_matches_raw_items(self):
+        """測試本地條件以 SAF 原始欄位評估"""
+        plan = compile_query('testStatus = "PASS" AND isNotification = "true" AND duration = "60"')
+
+        assert plan.residual.matches({"isNotification": True, "duration": 60})
+        assert not plan.residual.matches({"isNotification": False, "duration": 60})
+
+    def test_plans_are_cached(self):
+        """測試相同查詢文字重複使用編譯結果"""
+        query = 'controller = "SM2508" AND testStatus = "FAIL"'
+        first = compile_query(query)
+        hits = plan_cache_stats()["hits"]
+
+        assert compile_query(f"  {query}\n") is first
+        assert plan_cache_stats()["hits"] == hits + 1